@@ -0,0 +1,233 @@
+# agents/analysis_templates.py
+"""
+Template Answers for Common Analysis Questions
+
+"How many overdue tasks do I have?", "what's my most productive day?",
+"how's my week going?" — for questions like these the analysis agent only
+calls one tool and turns its dict into two sentences. Here the intent is
+matched with a few patterns, the same plain analysis function is called
+directly and the answer is rendered from a template, with no LLM turn.
+
+Anything open-ended ("why", "should I", "how can I improve"), comparative,
+compound (more than one intent) or qualified beyond what the template
+answers ("high priority", "in my Work folder", "this week", "in March",
+"for gym tasks") returns None and goes to the ReAct agent as before.
+Disable with ANALYSIS_TEMPLATES=false.
+"""
+
+import os
+import re
+from datetime import date
+
+from tools.analysis_tools import (
+    productivity_patterns,
+    weekly_accountability_summary,
+    trend_report,
+    folder_focus_summary,
+    tasks_by_filter,
+)
+
+ANALYSIS_TEMPLATES_ENABLED = os.getenv("ANALYSIS_TEMPLATES", "true").lower() == "true"
+
+# Longer questions are usually compound or carry context a template would ignore
+TEMPLATE_MAX_WORDS = 16
+
+# Questions that need reasoning, advice or comparison stay with the agent
+_OPEN_ENDED = re.compile(
+    r"\b(why|should|could|would|advice|tips?|improve|better|worse|suggest|recommend|compare|versus|vs|"
+    r"explain|help|last (week|month|year)|yesterday|month)\b"
+)
+
+# Each match is cut out of the question before the leftover-word check below,
+# so patterns only consume the intent phrase itself (lookaheads for the rest)
+_INTENT_PATTERNS = {
+    "overdue": [
+        r"\boverdue\b", r"\bpast due\b", r"\bam i behind\b", r"\bbehind on\b", r"\bmissed (any |my )?deadlines?\b",
+    ],
+    "peak_day": [
+        r"\b(most )?productive day\b", r"\b(peak|best) day\b",
+        r"\bwhich day\b(?=.*\b(productive|most|done|finish|complete))",
+    ],
+    "peak_time": [
+        r"\bwhat time\b(?=.*\b(usually|finish|complete|productive|work))", r"\b(peak|best|most productive) (hour|time)\b",
+        r"\btime of (the )?day\b",
+    ],
+    "weekly_summary": [
+        r"\bweekly (summary|review|recap|report)\b", r"\bhow('?s| is| was) my week\b", r"\bmy week (going|been)\b",
+        r"\bhow (did|am) i do(ing)? this week\b",
+    ],
+    "streak": [r"\bstreaks?\b"],
+    "folder_focus": [
+        r"\bwhich folder\b", r"\bmost (active|used) folder\b", r"\bwhere (do|am) i (focus|spend)",
+    ],
+}
+_INTENTS = {name: [re.compile(p) for p in patterns] for name, patterns in _INTENT_PATTERNS.items()}
+
+# Question scaffolding a template can ignore. Any other word left after the intent
+# phrase is a qualifier (priority, folder, "for gym", "this week", "in March", a
+# date) the template would silently drop, so the question goes to the agent.
+_FILLER_WORDS = frozenset("""
+    a am an any anything are at can currently did do does done get give got have how how's i i'm i've is it's
+    many me most my number of on right now show so far tell the there things to tasks task usually typically
+    was were what what's when where which complete completed finish finished productive
+""".split())
+_INTENT_WORDS = {
+    "peak_time": {"work", "day"},
+    "weekly_summary": {"going", "been", "doing", "looking", "look", "like"},
+    "streak": {"current", "longest", "completion"},
+    "folder_focus": {"focus", "spend", "time", "folders"},
+}
+
+NO_HISTORY = "You haven't completed any tasks yet, so there are no patterns to report."
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, straight apostrophes, single spaces, no trailing punctuation"""
+    text = question.lower().replace("’", "'")
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.rstrip(" ?!.")
+
+
+def match_intent(question: str):
+    """The single template intent this question asks for, or None"""
+    text = normalize_question(question)
+    if not text or len(text.split()) > TEMPLATE_MAX_WORDS or _OPEN_ENDED.search(text):
+        return None
+    matched = [name for name, patterns in _INTENTS.items() if any(p.search(text) for p in patterns)]
+    if len(matched) != 1:
+        return None
+
+    intent = matched[0]
+    for pattern in _INTENTS[intent]:
+        text = pattern.sub(" ", text)
+    allowed = _INTENT_WORDS.get(intent, ())
+    if any(word not in _FILLER_WORDS and word not in allowed for word in re.findall(r"[a-z0-9']+", text)):
+        return None
+    return intent
+
+
+# ============================================
+# RENDERING
+# ============================================
+
+def _day(iso: str) -> str:
+    """'2026-01-15' → 'January 15'"""
+    d = date.fromisoformat(iso)
+    return f"{d:%B} {d.day}"
+
+
+def _hour(hour_24: int) -> str:
+    hour_12 = hour_24 % 12 or 12
+    return f"{hour_12} {'AM' if hour_24 < 12 else 'PM'}"
+
+
+def _plural(n: int, word: str) -> str:
+    return f"{n} {word}" if n == 1 else f"{n} {word}s"
+
+
+def _names(items: list) -> str:
+    if len(items) == 1:
+        return items[0]
+    return ", ".join(items[:-1]) + " and " + items[-1]
+
+
+def _overdue_item(task: dict) -> str:
+    due = task.get("due_date")
+    return f"'{task['name']}' (due {_day(due)})" if due else f"'{task['name']}'"
+
+
+def render_overdue(data: dict) -> str:
+    count, tasks = data.get("task_count") or 0, data.get("tasks") or []
+    if not count:
+        return "You have no overdue tasks."
+    if count == 1:
+        return f"You have 1 overdue task: {_overdue_item(tasks[0])}."
+    listed = _names([_overdue_item(t) for t in tasks])
+    if count > len(tasks):
+        return f"You have {count} overdue tasks; the oldest are {listed}."
+    return f"You have {count} overdue tasks: {listed}."
+
+
+def render_peak_day(data: dict) -> str:
+    if not data.get("has_data"):
+        return NO_HISTORY
+    if data["peak_day"] is None:
+        return "No single day stands out yet; your completions are spread evenly across the week."
+    return (f"You get the most done on {data['peak_day']}s, "
+            f"with {_plural(data['peak_day_count'], 'completed task')} on that day so far.")
+
+
+def render_peak_time(data: dict) -> str:
+    if not data.get("has_data"):
+        return NO_HISTORY
+    hour, bucket = data["peak_hour_24"], data["peak_time_of_day"]
+    if hour is None and bucket is None:
+        return "No time of day stands out yet; your completions are spread out."
+    parts = []
+    if hour is not None:
+        parts.append(f"You complete the most tasks around {_hour(hour)} "
+                     f"({_plural(data['peak_hour_count'], 'task')} so far)")
+    if bucket is not None:
+        parts.append(f"the {bucket} is your strongest time of day" if parts
+                     else f"The {bucket} is your strongest time of day")
+    return ", and ".join(parts) + "."
+
+
+def render_weekly_summary(data: dict) -> str:
+    since = _day(data["week_start_local"])
+    created, completed = data["tasks_created"], data["tasks_completed"]
+    if not created and not completed:
+        return f"You haven't created or completed any tasks since {since}."
+    answer = f"Since {since} you've created {_plural(created, 'task')} and completed {completed}."
+    if data["completion_rate"] is not None:
+        answer += f" {data['completion_rate']:g}% of the tasks you created this week are already done."
+    return answer
+
+
+def render_streak(data: dict) -> str:
+    if not data.get("has_data"):
+        return NO_HISTORY
+    streak = data["streaks"]
+    current, longest = streak["current_streak_days"], streak["longest_streak_days"]
+    if not streak["last_completion_day"]:
+        return NO_HISTORY
+    if current:
+        if current >= longest:
+            return f"You're on a {current}-day completion streak, your longest yet."
+        return f"You're on a {current}-day completion streak; your longest was {longest} days."
+    return (f"You don't have an active streak; your last completion was on {_day(streak['last_completion_day'])} "
+            f"and your longest streak is {_plural(longest, 'day')}.")
+
+
+def render_folder_focus(data: dict) -> str:
+    if not data.get("has_data"):
+        return "You don't have any tasks in folders yet."
+    busiest, done_most = data["most_created_folder"], data["most_completed_folder"]
+    answer = f"Your busiest folder is '{busiest}' with {_plural(data['most_created_count'], 'task')}"
+    if done_most is None:
+        return answer + ", but you haven't completed anything yet."
+    if done_most == busiest:
+        return answer + f", and it's also where you've completed the most ({data['most_completed_count']})."
+    return answer + f", but you complete the most in '{done_most}' ({data['most_completed_count']} done)."
+
+
+# intent → (fetch(user_id, user_timezone), render(data))
+TEMPLATES = {
+    "overdue": (lambda uid, tz: tasks_by_filter(uid, tz, overdue_only=True, limit=3), render_overdue),
+    "peak_day": (productivity_patterns, render_peak_day),
+    "peak_time": (productivity_patterns, render_peak_time),
+    "weekly_summary": (weekly_accountability_summary, render_weekly_summary),
+    "streak": (trend_report, render_streak),
+    "folder_focus": (folder_focus_summary, render_folder_focus),
+}
+
+
+def template_answer(question: str, user_id: str, user_timezone: str):
+    """(intent, answer) when the question has a template, else None (use the agent)"""
+    if not ANALYSIS_TEMPLATES_ENABLED:
+        return None
+    intent = match_intent(question)
+    if intent is None:
+        return None
+    fetch, render = TEMPLATES[intent]
+    return intent, render(fetch(user_id, user_timezone))
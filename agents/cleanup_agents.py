@@ -1,17 +1,28 @@
 # backend/agents/cleanup_agent.py
 
 import os
+import numpy as np
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
-import firebase_admin
-from firebase_admin import credentials, firestore
+from utils.firebase_client import get_firestore_db, get_task_repository, get_firebase_client
+from utils.task_repository import TOMBSTONE_RETENTION_DAYS
+from utils.task_snapshot import get_task_snapshot
+
+# RULE 3 threshold: pending tasks created this long ago are stale
+STALE_HOURS = 10 * 24
+
+# RULE 1 (opt-in): overdue tasks are only acted on once they're this many days past due.
+# Off by default — until now rule 1 never fired on this app's ISO due dates, so turning
+# it on starts deleting overdue tasks that previously survived until they went stale.
+CLEANUP_DELETE_OVERDUE = os.getenv("CLEANUP_DELETE_OVERDUE", "false").lower() == "true"
+CLEANUP_OVERDUE_GRACE_DAYS = int(os.getenv("CLEANUP_OVERDUE_GRACE_DAYS", "7"))
 
 class CleanupAgent:
     """
     Autonomous task/folder cleanup agent.
     
     SIMPLIFIED RULES:
-    1. Check due_date first - if passed and incomplete → delete
+    1. (CLEANUP_DELETE_OVERDUE only) due_date passed by CLEANUP_OVERDUE_GRACE_DAYS+ and incomplete → delete
     2. High priority tasks → never auto-delete, generate insight instead
     3. Untouched for 10+ days → delete (unless high priority)
     4. Empty folders untouched for 10+ days → delete
@@ -19,28 +30,10 @@ class CleanupAgent:
     UPDATED: Now works with user-scoped data structure
     """
     
-    def __init__(self, firebase_cred_path=None):
-        """Initialize Firebase connection"""
-        if not firebase_admin._apps:
-            if firebase_cred_path is None:
-                # Try environment variable first, fallback to file
-                if os.getenv('FIREBASE_CREDENTIALS_JSON'):
-                    import json
-                    import tempfile
-                    creds_json = json.loads(os.getenv('FIREBASE_CREDENTIALS_JSON'))
-                temp_creds = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
-                json.dump(creds_json, temp_creds)
-                temp_creds.close()
-                firebase_cred_path = temp_creds.name
-            else:
-                firebase_cred_path = os.path.join(
-                    os.path.dirname(os.path.dirname(__file__)),
-                    "firebase-credentials.json"
-                )
-        cred = credentials.Certificate(firebase_cred_path)
-        firebase_admin.initialize_app(cred)
-        
-        self.db = firestore.client()
+    def __init__(self, firebase_cred_path=None, db=None):
+        """Initialize Firebase connection (shared process-wide client unless db is given)"""
+        self.db = db if db is not None else get_firestore_db(firebase_cred_path)
+        self.tasks = get_task_repository(self.db)
         self.log("✅ Cleanup Agent initialized")
     
     def log(self, message):
@@ -52,10 +45,6 @@ class CleanupAgent:
     # HELPER METHODS: User-scoped references
     # ========================================
     
-    def _get_user_tasks_ref(self, user_id: str):
-        """Get reference to user's tasks collection"""
-        return self.db.collection('users').document(user_id).collection('tasks')
-    
     def _get_user_folders_ref(self, user_id: str):
         """Get reference to user's folders collection"""
         return self.db.collection('users').document(user_id).collection('folders')
@@ -85,71 +74,40 @@ class CleanupAgent:
         self.log(f"   Timezone: {user_timezone}")
         self.log("=" * 60)
         
-        # Get all tasks for this user
-        tasks = self._fetch_tasks(user_id)
-        self.log(f"📋 Fetched {len(tasks)} tasks")
+        # Get all tasks for this user (shared with MonitorAgent inside a task_snapshot_scope)
+        snapshot = get_task_snapshot(user_id, user_timezone, repository=self.tasks)
+        frame = snapshot.frame
+        self.log(f"📋 Fetched {len(snapshot)} tasks")
         
         # Categorize tasks for cleanup
         tasks_to_delete = []
         high_priority_stale_tasks = []
         
-        now = datetime.now(timezone.utc)
-        stale_threshold = now - timedelta(days=10)
+        # Skip completed tasks; can't process without a created timestamp
+        candidates = snapshot.pending & frame.has_created
         
-        for task in tasks:
-            if task.get('completed'):
-                continue  # Skip completed tasks
+        for i in frame.select(candidates):
+            task = snapshot.tasks[i]
+            item = {'index': i, 'task': {'id': task.id, 'name': task.name, 'folder': task.folder}}
             
-            task_name = task['name']
-            is_high_priority = task.get('is_high_priority', False)
-            due_date = task.get('due_date')
-            created_at = task.get('created_at')
+            # RULE 1: Check due_date first (opt-in, after a grace period)
+            if CLEANUP_DELETE_OVERDUE and snapshot.days_overdue[i] >= CLEANUP_OVERDUE_GRACE_DAYS:
+                item['reason'] = f"Overdue by {snapshot.days_overdue[i]} days"
             
-            # Convert timestamps
-            if hasattr(created_at, 'astimezone'):
-                created_at_utc = created_at.replace(tzinfo=timezone.utc)
-            else:
-                continue  # Can't process without timestamp
+            # RULE 2: Check if untouched for 10+ days (no due date or due date is future)
+            elif snapshot.age_hours[i] >= STALE_HOURS:
+                item['reason'] = f"Untouched for {int(snapshot.age_hours[i] // 24)} days"
             
-            # RULE 1: Check due_date first (highest priority check)
-            if due_date:
-                if hasattr(due_date, 'astimezone'):
-                    due_date_utc = due_date.replace(tzinfo=timezone.utc)
-                    
-                    if due_date_utc < now:
-                        # Due date passed!
-                        days_overdue = (now - due_date_utc).days
-                        
-                        if is_high_priority:
-                            # High priority + overdue → ask user
-                            high_priority_stale_tasks.append({
-                                'task': task,
-                                'reason': f"Overdue by {days_overdue} days (high priority)"
-                            })
-                        else:
-                            # Regular task, overdue → delete
-                            tasks_to_delete.append({
-                                'task': task,
-                                'reason': f"Overdue by {days_overdue} days"
-                            })
-                        continue  # Move to next task
+            else:
+                continue
             
-            # RULE 2: Check if untouched for 10+ days (no due date or due date is future)
-            if created_at_utc < stale_threshold:
-                days_old = (now - created_at_utc).days
-                
-                if is_high_priority:
-                    # High priority + stale → ask user
-                    high_priority_stale_tasks.append({
-                        'task': task,
-                        'reason': f"Untouched for {days_old} days (high priority)"
-                    })
-                else:
-                    # Regular task + stale → delete
-                    tasks_to_delete.append({
-                        'task': task,
-                        'reason': f"Untouched for {days_old} days"
-                    })
+            if task.is_high_priority:
+                # High priority → ask user
+                item['reason'] += " (high priority)"
+                high_priority_stale_tasks.append(item)
+            else:
+                # Regular task → delete
+                tasks_to_delete.append(item)
         
         # Execute cleanup
         self.log(f"\n--- Cleanup Summary ---")
@@ -157,22 +115,31 @@ class CleanupAgent:
         self.log(f"⚠️  High priority needing attention: {len(high_priority_stale_tasks)}")
         
         # Auto-delete regular stale tasks
+        remaining = np.ones(len(snapshot), dtype=bool)
         for item in tasks_to_delete:
-            self._delete_task(item['task']['id'], user_id)
-            self.log(f"   ✓ Deleted: {item['task']['name']} ({item['reason']})")
+            if self._delete_task(item['task']['id'], user_id):
+                remaining[item['index']] = False
+                self.log(f"   ✓ Deleted: {item['task']['name']} ({item['reason']})")
         
         # Generate insights for high priority stale tasks (don't auto-delete)
         for item in high_priority_stale_tasks:
             self._generate_high_priority_insight(item, socketio, user_id)
             self.log(f"   ⚠️  Generated alert: {item['task']['name']}")
         
-        # Cleanup empty folders
-        deleted_folders = self._cleanup_empty_folders(user_id)
+        # Cleanup empty folders (task counts per folder from the snapshot, minus deletions)
+        deleted_folders = self._cleanup_empty_folders(user_id, task_counts=frame.folder_counts(remaining))
+
+        # Invalidate the mobile client's cached task list (ETag / data_version)
+        if tasks_to_delete or deleted_folders:
+            self._bump_data_version(user_id)
+        
+        tombstones_pruned = self._prune_tombstones(user_id)
         
         self.log(f"\n--- Final Stats ---")
         self.log(f"Tasks deleted: {len(tasks_to_delete)}")
         self.log(f"High priority alerts: {len(high_priority_stale_tasks)}")
         self.log(f"Folders deleted: {deleted_folders}")
+        self.log(f"Tombstones pruned: {tombstones_pruned}")
         
         self.log(f"\n{'='*60}")
         self.log(f"✅ Cleanup completed!")
@@ -182,33 +149,41 @@ class CleanupAgent:
     # DATA OPERATIONS (UPDATED)
     # ========================================
     
-    def _fetch_tasks(self, user_id: str):
+    def _delete_task(self, task_id: str, user_id: str, task_data: dict = None):
         """
-        Fetch all tasks for specific user
+        Delete a task from Firebase for specific user
         
         CHANGED: Uses user-scoped collection
-        Path: users/{user_id}/tasks
-        """
-        tasks_ref = self._get_user_tasks_ref(user_id)
-        tasks = []
-        
-        for task in tasks_ref.stream():
-            task_data = task.to_dict()
-            task_data['id'] = task.id
-            tasks.append(task_data)
         
-        return tasks
+        Returns True if the task was deleted.
+        """
+        try:
+            # Leaves a tombstone so the mobile delta sync (/tasks/changes) sees the delete
+            self.tasks.delete(user_id, task_id, before=task_data)
+            return True
+        except Exception as e:
+            self.log(f"❌ Error deleting task: {e}")
+            return False
     
-    def _delete_task(self, task_id: str, user_id: str):
+    def _prune_tombstones(self, user_id: str) -> int:
         """
-        Delete a task from Firebase for specific user
-        
-        CHANGED: Uses user-scoped collection
+        Drop delete tombstones older than TOMBSTONE_RETENTION_DAYS
+
+        Sync cursors older than that get a full resync instead of a diff.
         """
         try:
-            self._get_user_tasks_ref(user_id).document(task_id).delete()
+            before = datetime.now(timezone.utc) - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+            return self.tasks.prune_tombstones(user_id, before)
         except Exception as e:
-            self.log(f"❌ Error deleting task: {e}")
+            self.log(f"❌ Error pruning tombstones: {e}")
+            return 0
+    
+    def _bump_data_version(self, user_id: str):
+        """Increment the user's data_version (shared FirebaseClient) so clients refetch their task list"""
+        try:
+            get_firebase_client().bump_data_version(user_id)
+        except Exception as e:
+            self.log(f"❌ Error bumping data version: {e}")
     
     def _generate_high_priority_insight(self, item, socketio, user_id: str):
         """
@@ -264,12 +239,15 @@ class CleanupAgent:
         except Exception as e:
             self.log(f"❌ Error generating insight: {e}")
     
-    def _cleanup_empty_folders(self, user_id: str):
+    def _cleanup_empty_folders(self, user_id: str, task_counts: dict = None):
         """
         Delete folders that have no tasks and weren't touched in 10+ days
         
         CHANGED: Uses user-scoped collections
         Path: users/{user_id}/folders and users/{user_id}/tasks
+        
+        task_counts: {folder: task count} already known to the caller;
+        otherwise each folder is counted in the task store.
         """
         folders = self._get_user_folders_ref(user_id).stream()
         now = datetime.now(timezone.utc)
@@ -282,14 +260,12 @@ class CleanupAgent:
             created_at = folder_data.get('created_at')
             
             # Check if folder has any tasks (for this user)
-            tasks_in_folder = list(
-                self._get_user_tasks_ref(user_id)
-                .where('folder', '==', folder_id)
-                .limit(1)
-                .stream()
-            )
+            if task_counts is not None:
+                task_count = task_counts.get(folder_id, 0)
+            else:
+                task_count = self.tasks.count(user_id, folder=folder_id)
             
-            if not tasks_in_folder:
+            if task_count == 0:
                 # Empty folder
                 if created_at and hasattr(created_at, 'astimezone'):
                     created_at_utc = created_at.replace(tzinfo=timezone.utc)
@@ -1,8 +1,8 @@
 # backend/agents/monitor_agent.py
 
 import os
-import firebase_admin
-from firebase_admin import credentials, firestore
+from utils.firebase_client import get_firestore_db, get_task_repository
+from utils.task_snapshot import get_task_snapshot
 from datetime import datetime, timedelta, timezone
 from collections import Counter
 from openai import OpenAI 
@@ -19,29 +19,10 @@ class MonitorAgent:
     UPDATED: Now works with user-scoped data structure
     """
     
-    def __init__(self, firebase_cred_path=None):
-        """Initialize Firebase connection"""
-        # Initialize Firebase if not already done
-        if not firebase_admin._apps:
-            if firebase_cred_path is None:
-                # Try environment variable first, fallback to file
-                if os.getenv('FIREBASE_CREDENTIALS_JSON'):
-                    import json
-                    import tempfile
-                    creds_json = json.loads(os.getenv('FIREBASE_CREDENTIALS_JSON'))
-                    temp_creds = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
-                    json.dump(creds_json, temp_creds)
-                    temp_creds.close()
-                    firebase_cred_path = temp_creds.name
-                else:
-                    firebase_cred_path = os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)),
-                        "firebase-credentials.json"
-                    )
-            cred = credentials.Certificate(firebase_cred_path)
-            firebase_admin.initialize_app(cred)
-        
-        self.db = firestore.client()
+    def __init__(self, firebase_cred_path=None, db=None):
+        """Initialize Firebase connection (shared process-wide client unless db is given)"""
+        self.db = db if db is not None else get_firestore_db(firebase_cred_path)
+        self.tasks = get_task_repository(self.db)
         self.log("✅ Monitor Agent initialized")
         self.llm_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.notification_manager = None  # Will be set per user in run()
@@ -120,72 +101,47 @@ Provide Title and Body."""
     # DATA FETCHING (UPDATED FOR USER SCOPING)
     # ========================================
     
-    def get_all_tasks(self, user_id: str):
+    def get_all_tasks(self, user_id: str, user_timezone="Asia/Kolkata"):
         """
-        Fetch all tasks for a specific user from Firebase
+        Fetch all tasks for a specific user as a TaskSnapshot
         
         CHANGED: Now queries user-specific collection
         Path: users/{user_id}/tasks
+        
+        The snapshot carries the per-task features every check below reads
+        (age, days until due, staleness, priority). Inside a
+        task_snapshot_scope() it is shared with CleanupAgent, so a monitor +
+        cleanup run fetches the tasks once. Returns None on error.
         """
         try:
-            # NEW: User-specific path
-            tasks_ref = self.db.collection('users').document(user_id).collection('tasks')
-            tasks = tasks_ref.stream()
-            
-            task_list = []
-            for task in tasks:
-                task_data = task.to_dict()
-                task_data['id'] = task.id
-                task_list.append(task_data)
-            
-            self.log(f"📋 Fetched {len(task_list)} tasks for user {user_id}")
-            return task_list
+            snapshot = get_task_snapshot(user_id, user_timezone, repository=self.tasks)
+            self.log(f"📋 Fetched {len(snapshot)} tasks for user {user_id}")
+            return snapshot
         
         except Exception as e:
             self.log(f"❌ Error fetching tasks for user {user_id}: {e}")
-            return []
+            return None
     
     # ========================================
     # INSIGHT GENERATORS (NO CHANGES NEEDED)
     # ========================================
     
-    def check_high_priority_tasks(self, tasks):
+    def check_high_priority_tasks(self, snapshot):
         """Alert on high priority tasks untouched for 24+ hours"""
         insights = []
         now = datetime.now(timezone.utc)
 
         incomplete_priority = []
-        for t in tasks:
-            if not t.get('is_high_priority') or t.get('completed'):
-                continue
-
-            created_at = t.get('created_at')
-            if not created_at:
-                continue
-
-            try:
-                if isinstance(created_at, str):
-                    created_dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                elif hasattr(created_at, 'astimezone'):
-                    created_dt = created_at
-                else:
-                    continue
-
-                if created_dt.tzinfo is None:
-                    created_dt = created_dt.replace(tzinfo=timezone.utc)
-
-                hours_old = (now - created_dt).total_seconds() / 3600
-
-                if hours_old >= 24:
-                    incomplete_priority.append({
-                        "task_name": t['name'],
-                        "task_id": t['id'],
-                        "hours_untouched": round(hours_old, 1),
-                        "days_untouched": round(hours_old / 24, 1),
-                        "folder": t.get('folder', '')
-                    })
-            except Exception:
-                continue
+        for i in snapshot.frame.select(snapshot.high_priority & snapshot.untouched(24)):
+            t = snapshot.tasks[i]
+            hours_old = float(snapshot.age_hours[i])
+            incomplete_priority.append({
+                "task_name": t.name,
+                "task_id": t.id,
+                "hours_untouched": round(hours_old, 1),
+                "days_untouched": round(hours_old / 24, 1),
+                "folder": t.folder or ''
+            })
 
         if incomplete_priority:
             insight = {
@@ -206,8 +162,13 @@ Provide Title and Body."""
 
         return insights
     
-    def check_folder_activity(self, tasks):
-        """Analyze which folder user is most active in"""
+    def check_folder_activity(self, snapshot, stats=None):
+        """
+        Analyze which folder user is most active in
+        
+        Uses the per-folder counters from the task store when given (stats),
+        otherwise counts the snapshot's tasks.
+        """
         insights = []
         now = datetime.now(timezone.utc)
         
@@ -215,11 +176,16 @@ Provide Title and Body."""
         folder_counts = Counter()
         completed_by_folder = Counter()
         
-        for task in tasks:
-            folder = task.get('folder', 'No Folder')
-            folder_counts[folder] += 1
-            if task.get('completed'):
-                completed_by_folder[folder] += 1
+        if stats is not None:
+            for folder, counts in stats['folders'].items():
+                folder_counts[folder] = counts['total']
+                completed_by_folder[folder] = counts['completed']
+        else:
+            for task in snapshot.tasks:
+                folder = task.folder or 'No Folder'
+                folder_counts[folder] += 1
+                if task.completed:
+                    completed_by_folder[folder] += 1
         
         if folder_counts:
             most_active_folder = folder_counts.most_common(1)[0]
@@ -245,38 +211,22 @@ Provide Title and Body."""
         
         return insights
     
-    def check_completion_patterns(self, tasks, user_timezone="Asia/Kolkata"):
+    def check_completion_patterns(self, snapshot, user_timezone="Asia/Kolkata"):
         """Analyze when user completes tasks (in their local timezone)"""
         insights = []
         now = datetime.now(timezone.utc)
         
-        completed_tasks = [t for t in tasks if t.get('completed') and t.get('completed_at')]
+        completed_tasks = snapshot.frame.completed & snapshot.frame.has_completed_at
+        completed_count = int(completed_tasks.sum())
         
-        if len(completed_tasks) < 3:
+        if completed_count < 3:
             self.log("⏭️  Not enough completed tasks for pattern analysis")
             return insights
         
-        # Import timezone helper
-        try:
-            from zoneinfo import ZoneInfo
-            local_tz = ZoneInfo(user_timezone)
-        except ImportError:
-            import pytz
-            local_tz = pytz.timezone(user_timezone)
-        
-        # Extract hours from completed_at (convert to local timezone)
-        hours = []
-        for task in completed_tasks:
-            try:
-                completed_at = task['completed_at']
-                completed_at_local = completed_at.astimezone(local_tz)
-                hours.append(completed_at_local.hour)
-            except Exception as e:
-                self.log(f"⚠️  Error parsing timestamp: {e}")
-                continue
+        # Local completion hours (snapshot is bucketed in the user's timezone)
+        hours = snapshot.completed_hour[completed_tasks].tolist()
         
         if hours:
-            from collections import Counter
             hour_counts = Counter(hours)
             peak_hour = hour_counts.most_common(1)[0][0]
             
@@ -294,7 +244,7 @@ Provide Title and Body."""
                 "data": {
                     "peak_hour": peak_hour,
                     "peak_hour_12": f"{hour_12}:00 {am_pm}",
-                    "completed_count": len(completed_tasks),
+                    "completed_count": completed_count,
                     "timezone": user_timezone
                 },
             }
@@ -303,59 +253,25 @@ Provide Title and Body."""
         
         return insights
     
-    def check_stale_tasks(self, tasks, user_timezone="UTC"):
+    def check_stale_tasks(self, snapshot, user_timezone="UTC"):
         """Detect tasks without due_date sitting incomplete for >7 days.
         Tasks WITH due_date are handled by check_due_date_approaching.
         High-priority stale tasks escalate to 'high' priority."""
         insights = []
         now = datetime.now(timezone.utc)
 
-        try:
-            from zoneinfo import ZoneInfo
-            local_tz = ZoneInfo(user_timezone)
-        except ImportError:
-            import pytz
-            local_tz = pytz.timezone(user_timezone)
-
-        now_local = now.astimezone(local_tz)
-        today_local = now_local.date()
-
         stale_tasks_found = []
 
-        for task in tasks:
-            if task.get('completed'):
-                continue
-
-            # Skip tasks with due_date — handled by check_due_date_approaching
-            due_date_str = task.get('due_date', '')
-            if due_date_str and due_date_str.strip():
-                continue
-
-            created_at = task.get('created_at')
-            if not created_at:
-                continue
-
-            try:
-                if isinstance(created_at, str):
-                    created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                elif hasattr(created_at, 'astimezone'):
-                    pass
-                else:
-                    continue
-
-                created_local = created_at.astimezone(local_tz)
-                age_days = (today_local - created_local.date()).days
-
-                if age_days >= 7:
-                    stale_tasks_found.append({
-                        "task_id": task['id'],
-                        "task_name": task['name'],
-                        "days_old": age_days,
-                        "is_high_priority": task.get('is_high_priority', False),
-                        "folder": task.get('folder', '')
-                    })
-            except Exception:
-                continue
+        # Local calendar days since creation, in the snapshot's (user's) timezone
+        for i in snapshot.frame.select(snapshot.stale(7)):
+            task = snapshot.tasks[i]
+            stale_tasks_found.append({
+                "task_id": task.id,
+                "task_name": task.name,
+                "days_old": int(snapshot.age_days[i]),
+                "is_high_priority": task.is_high_priority,
+                "folder": task.folder or ''
+            })
 
         if stale_tasks_found:
             high_priority_stale = [t for t in stale_tasks_found if t['is_high_priority']]
@@ -391,41 +307,21 @@ Provide Title and Body."""
 
         return insights
     
-    def check_due_date_approaching(self, tasks, user_timezone="UTC"):
+    def check_due_date_approaching(self, snapshot, user_timezone="UTC"):
         """Check for tasks with approaching or past due dates."""
         insights = []
         now = datetime.now(timezone.utc)
 
-        try:
-            from zoneinfo import ZoneInfo
-            local_tz = ZoneInfo(user_timezone)
-        except ImportError:
-            import pytz
-            local_tz = pytz.timezone(user_timezone)
-
-        now_local = now.astimezone(local_tz)
-        today_local = now_local.date()
-
-        for task in tasks:
-            if task.get('completed'):
-                continue
-
-            due_date_str = task.get('due_date', '')
-            if not due_date_str or not due_date_str.strip():
-                continue
-
-            try:
-                due_date = datetime.strptime(due_date_str.strip(), "%Y-%m-%d").date()
-            except ValueError:
-                continue
-
-            days_until = (due_date - today_local).days
+        due_soon = snapshot.pending & snapshot.frame.due_valid & (snapshot.days_until_due <= 1)
+        for i in snapshot.frame.select(due_soon):
+            task = snapshot.tasks[i]
+            days_until = int(snapshot.days_until_due[i])
             task_data = {
-                "task_id": task['id'],
-                "task_name": task['name'],
-                "due_date": due_date_str.strip(),
-                "is_high_priority": task.get('is_high_priority', False),
-                "folder": task.get('folder', '')
+                "task_id": task.id,
+                "task_name": task.name,
+                "due_date": task.due_date,
+                "is_high_priority": task.is_high_priority,
+                "folder": task.folder or ''
             }
 
             if days_until < 0:
@@ -559,10 +455,10 @@ Provide Title and Body."""
         self.log("=" * 60)
         
         # Initialize notification manager for this user
-        self.notification_manager = NotificationManager(user_id)
+        self.notification_manager = NotificationManager(user_id, db=self.db)
         
         # Step 1: Get all tasks for this user
-        tasks = self.get_all_tasks(user_id)
+        tasks = self.get_all_tasks(user_id, user_timezone)
         
         if not tasks:
             self.log("⚠️  No tasks found. Exiting.")
@@ -578,7 +474,7 @@ Provide Title and Body."""
         all_insights.extend(self.check_due_date_approaching(tasks, user_timezone))
 
         self.log("\n--- Checking Folder Activity ---")
-        all_insights.extend(self.check_folder_activity(tasks))
+        all_insights.extend(self.check_folder_activity(tasks, stats=self.tasks.stats(user_id)))
 
         self.log("\n--- Checking Completion Patterns ---")
         all_insights.extend(self.check_completion_patterns(tasks, user_timezone))
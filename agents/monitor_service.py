@@ -5,6 +5,7 @@ from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 from monitor_agent import MonitorAgent
 from cleanup_agents import CleanupAgent
+from utils.task_snapshot import task_snapshot_scope
 
 def run_monitor_check(check_type="scheduled"):
     """Execute monitor analysis"""
@@ -42,6 +43,17 @@ def run_cleanup_check():
         import traceback
         traceback.print_exc()
 
+def run_evening_check():
+    """Evening summary; on Sundays the weekly cleanup runs right after it.
+    
+    Both agents work from one task snapshot (one fetch per user), and the
+    cleanup acts on the same tasks the monitor just reported on.
+    """
+    with task_snapshot_scope():
+        run_monitor_check('evening')
+        if datetime.now().weekday() == 6:
+            run_cleanup_check()
+
 def main():
     """Start the scheduler"""
     print("🚀 Starting Monitor & Cleanup Service...")
@@ -51,7 +63,7 @@ def main():
     print("   - Midday Check: 12:00 PM daily")
     print("   - Evening Summary: 8:00 PM daily")
     print("\n   CLEANUP:")
-    print("   - Weekly Cleanup: Sunday 9:00 PM")
+    print("   - Weekly Cleanup: Sunday 8:00 PM (after the evening summary)")
     print("\nPress Ctrl+C to stop\n")
     
     scheduler = BlockingScheduler()
@@ -72,27 +84,19 @@ def main():
         id='midday_check'
     )
     
-    # Evening summary
+    # Evening summary (+ weekly cleanup on Sunday, sharing the task fetch)
     scheduler.add_job(
-        run_monitor_check,
+        run_evening_check,
         trigger=CronTrigger(hour=20, minute=0),
-        args=['evening'],
         id='evening_summary'
     )
     
-    # Weekly cleanup (Sunday 9 PM)
-    scheduler.add_job(
-        run_cleanup_check,
-        trigger=CronTrigger(day_of_week='sun', hour=21, minute=0),
-        id='weekly_cleanup'
-    )
-    
     print("🔄 Running initial monitor check...")
     run_monitor_check('startup')
     
     print(f"\n✅ Scheduler started")
     print("⏰ Next monitor: 7:00 AM tomorrow")
-    print("🧹 Next cleanup: Sunday 9:00 PM\n")
+    print("🧹 Next cleanup: Sunday 8:00 PM\n")
     
     try:
         scheduler.start()
@@ -2,9 +2,7 @@
 
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-import firebase_admin
-from firebase_admin import credentials, firestore
-import os
+from utils.firebase_client import get_firestore_db
 
 class NotificationManager:
     """
@@ -17,38 +15,18 @@ class NotificationManager:
     It decides: "Should I send this now, later, or not at all?"
     """
     
-    def __init__(self, user_id: str ):
+    def __init__(self, user_id: str, db=None):
         """
         Initialize NotificationManager for a specific user
         
         Args:
             user_id: Firebase UID of the user
+            db: Firestore client (defaults to the shared process-wide client)
         """
         self.user_id = user_id
         
-        # Initialize Firebase if not already done
-        if not firebase_admin._apps:
-            import json
-            import tempfile
-            
-            if os.getenv('FIREBASE_CREDENTIALS_JSON'):
-                # Running on Render - credentials in environment variable
-                creds_json = json.loads(os.getenv('FIREBASE_CREDENTIALS_JSON'))
-                temp_creds = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
-                json.dump(creds_json, temp_creds)
-                temp_creds.close()
-                firebase_cred_path = temp_creds.name
-            else:
-                # Running locally - use file path
-                firebase_cred_path = os.path.join(
-                    os.path.dirname(os.path.dirname(__file__)),
-                    "firebase-credentials.json"
-                )
-            
-            cred = credentials.Certificate(firebase_cred_path)
-            firebase_admin.initialize_app(cred)
-        
-        self.db = firestore.client()
+        # Shared process-wide Firestore client
+        self.db = db if db is not None else get_firestore_db()
         
         # Notification budget - prevents spam
         self.daily_budget = 6  # Max 6 push notifications per day
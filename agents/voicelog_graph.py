@@ -3,6 +3,7 @@ import os
 from typing import TypedDict, Literal, Annotated
 from operator import add
 import uuid
+import hashlib
 import sqlite3
 import re
 import json
@@ -10,6 +11,9 @@ from datetime import datetime, timedelta
 
 from dotenv import load_dotenv
 from utils.timing import LatencyTracker
+from utils.task_snapshot import task_snapshot_scope, request_now
+from utils.task_rollups import get_tz
+from utils.versioned_cache import VersionedCache
 from langchain_openai import ChatOpenAI
 
 # LangSmith imports
@@ -29,6 +33,7 @@ from tools.crud_tools import (
     edit_task, edit_folder_name, get_folder_contents,
     list_all_folders, list_all_tasks, count_completed_tasks,
     search_tasks, mark_task_as_priority,
+    mark_tasks_complete, delete_tasks, move_tasks,
 )
 
 from tools.date_tools import (
@@ -47,7 +52,9 @@ from tools.analysis_tools import (
     get_weekly_accountability_summary,
     get_folder_focus_summary,
     get_tasks_by_filter,
+    get_trend_report,
 )
+from agents.analysis_templates import template_answer, normalize_question
 
 load_dotenv()
 
@@ -171,6 +178,42 @@ def clean_response(text: str) -> str:
 
     return text
 
+# ========================================
+# ANALYSIS ANSWER CACHE
+# ========================================
+# Final analysis answers keyed by user, timezone, normalised question and a
+# time bucket, valid while the user's data_version is unchanged (every
+# mutating FirebaseClient call bumps it). A repeated question costs one
+# version read instead of an agent run.
+
+ANALYSIS_ANSWER_CACHE = VersionedCache(
+    "analysis_answers",
+    max_entries=int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "4096")),
+    ttl_seconds=float(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "21600")),
+)
+
+# Questions about the current moment get an hourly bucket; everything else a daily one
+_NOW_SENSITIVE = re.compile(r"\b(now|today|tonight|this (morning|afternoon|evening)|so far|hours?)\b")
+
+# Follow-ups lean on the conversation ("what about those?"), so they are never cached
+_FOLLOW_UP = re.compile(r"^(and|also|what about|how about|then)\b|\b(it|that one|those|them|these|instead)\b")
+
+
+def analysis_cache_key(user_id: str, question: str, user_timezone: str, prefs_text: str = ""):
+    """
+    Cache key for a standalone analysis question, None for follow-ups
+
+    The stored preferences are part of the agent's prompt, so their hash is
+    part of the key: a preferences change misses instead of serving old wording.
+    """
+    text = normalize_question(question)
+    if not text or _FOLLOW_UP.search(text):
+        return None
+    now_local = request_now(get_tz(user_timezone))
+    bucket = now_local.strftime("%Y-%m-%dT%H") if _NOW_SENSITIVE.search(text) else now_local.date().isoformat()
+    prefs_hash = hashlib.sha1(prefs_text.encode("utf-8")).hexdigest()[:16]
+    return (user_id, user_timezone, text, bucket, prefs_hash)
+
 # ========================================
 # NODES
 # ========================================
@@ -462,6 +505,7 @@ def crud_node(state: VoiceLogState, config):
         edit_task, edit_folder_name, get_folder_contents,
         list_all_folders, list_all_tasks, count_completed_tasks,
         search_tasks, mark_task_as_priority,
+        mark_tasks_complete, delete_tasks, move_tasks,
         get_current_date, get_date_in_days, get_next_weekday,
         parse_relative_date, calculate_days_between, 
         handle_cleanup_action, list_pending_cleanup_actions
@@ -566,6 +610,7 @@ Task Management:
 - create_task, delete_task, edit_task
 - mark_task_complete, mark_task_incomplete
 - move_task, mark_task_as_priority, search_tasks
+- mark_tasks_complete, delete_tasks, move_tasks (several tasks in one call — use these for lists like "laundry, dishes and vacuuming")
 
 Organization:
 - create_folder, delete_folder, edit_folder_name
@@ -699,12 +744,63 @@ def analysis_node(state: VoiceLogState, config):
     print(f"   Command: '{command}'")
     print(f"   History: {len(messages)} messages")
 
+    user_id = config["configurable"]["user_id"]
+
+    namespace = (user_id, "preferences")
+
+    prefs_text = ""
+    if store:
+        prefs = store.search(namespace, query="productivity", limit=5)
+        prefs_text = "\n".join(
+            [p.value.get("pref", "") for p in prefs if isinstance(p.value, dict)]
+        )
+
+    # Same question, same data, same preferences, same day → same answer
+    from utils.firebase_client import get_firebase_client
+
+    cache_key = analysis_cache_key(user_id, command, user_timezone, prefs_text)
+    data_version = get_firebase_client().get_data_version(user_id) if cache_key else None
+    cached = ANALYSIS_ANSWER_CACHE.get(cache_key, data_version) if cache_key else None
+    if cached is not None:
+        print(f"💾 ANSWER CACHE HIT (data v{data_version}): {cached}")
+        tracker.end("Analysis")
+        return {
+            "messages": [
+                {"role": "human", "content": command},
+                {"role": "ai", "content": cached},
+            ],
+            "final_response": cached,
+        }
+
+    # Common single-intent questions: call the analysis function directly and render a template
+    try:
+        with task_snapshot_scope():
+            templated = template_answer(command, user_id, user_timezone)
+    except Exception as e:
+        print(f"⚠️  Template answer failed, using agent: {e}")
+        templated = None
+
+    if templated:
+        intent, response = templated
+        print(f"⚡ TEMPLATE ANSWER ({intent}): {response}")
+        if cache_key:
+            ANALYSIS_ANSWER_CACHE.put(cache_key, data_version, response)
+        tracker.end("Analysis")
+        return {
+            "messages": [
+                {"role": "human", "content": command},
+                {"role": "ai", "content": response},
+            ],
+            "final_response": response,
+        }
+
     tools_list = [
         get_productivity_patterns,
         get_procrastination_report,
         get_weekly_accountability_summary,
         get_folder_focus_summary,
         get_tasks_by_filter,
+        get_trend_report,
         get_current_date,
         get_date_in_days,
         get_next_weekday,
@@ -712,16 +808,6 @@ def analysis_node(state: VoiceLogState, config):
         calculate_days_between
     ]
 
-    user_id = config["configurable"]["user_id"]
-    namespace = (user_id, "preferences")
-
-    prefs_text = ""
-    if store:
-        prefs = store.search(namespace, query="productivity", limit=5)
-        prefs_text = "\n".join(
-            [p.value.get("pref", "") for p in prefs if isinstance(p.value, dict)]
-        )
-
     # Build chat history
     chat_history = []
     for msg in messages[-10:]:
@@ -761,10 +847,13 @@ NEVER guess dates. ALWAYS use tools.
 - Productivity, patterns, "how am I doing" → get_productivity_patterns
 - Avoidance, procrastination → get_procrastination_report
 - Weekly summaries → get_weekly_accountability_summary
+- "Better than last week/month?", trends, streaks → get_trend_report
+  window_days=7 for week-over-week, 30 for month-over-month; start_date/end_date (YYYY-MM-DD) for a specific period.
 - Focus, categories → get_folder_focus_summary
 - Task filtering, "when did I complete", "what did I finish", "when was the due", "what's due soon"? → get_tasks_by_filter
   Supports: completed, is_high_priority, hour, due_before (YYYY-MM-DD), due_after (YYYY-MM-DD), overdue_only (bool).
   Use due_before/due_after for "due this week" queries. Use overdue_only=True for "am I behind?" questions.
+  task_count is the total; when has_more is true, pass next_cursor as cursor (same filters) only if you need more names.
 
 -----RESPONSE STYLE-----:
 - MAXIMUM 2 sentences. Be extremely concise.
@@ -801,7 +890,9 @@ User timezone: {user_timezone}
             invoke_config["callbacks"] = [create_debug_callback(verbose=True)]
             print("🔍 ReAct Debug Mode: ENABLED (ANALYSIS)")
 
-        result = agent_graph.invoke(invoke_config)
+        # Tools called during this run share one task snapshot and one "now"
+        with task_snapshot_scope():
+            result = agent_graph.invoke(invoke_config)
 
         # 🔍 DEBUG: Print ReAct reasoning steps
         print("\n" + "="*80)
@@ -837,6 +928,9 @@ User timezone: {user_timezone}
         # Clean up verbose phrases
         response = clean_response(response)
 
+        if cache_key and response:
+            ANALYSIS_ANSWER_CACHE.put(cache_key, data_version, response)
+
         tracker.end("Analysis")
 
         return {
@@ -1,45 +1,32 @@
 # app.py - Flask REST API backend for VoiceLog AI
 
 import os
-import json
+import hashlib
 import tempfile
 import subprocess
 from datetime import datetime
+from zoneinfo import ZoneInfo
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, g
 from flask_cors import CORS
 from dotenv import load_dotenv
 
 from utils.timing import LatencyTracker
 from auth import verify_token
-from utils.firebase_client import FirebaseClient
+from utils.firebase_client import get_firebase_client
+from utils.firestore_resilience import (
+    FirestoreDeadlineExceeded, start_request_deadline, end_request_deadline, get_resilience_stats,
+)
 from utils.user_profile import get_user_profile
+from utils.versioned_cache import VersionedCache
 
-from agents.voicelog_graph import voicelog_app, _memory_store
+from agents.voicelog_graph import voicelog_app, _memory_store, ANALYSIS_ANSWER_CACHE
+from tools.analysis_tools import (
+    productivity_patterns, procrastination_report, weekly_accountability_summary, completion_heatmap,
+)
 
 load_dotenv()
 
-# ============================================
-# FIREBASE CREDENTIALS FILE (Render-safe)
-# ============================================
-
-firebase_cred_path = None
-
-if os.getenv("FIREBASE_CREDENTIALS_JSON"):
-    print("🔧 Loading Firebase credentials from environment variable...")
-    creds_json = json.loads(os.getenv("FIREBASE_CREDENTIALS_JSON"))
-
-    temp_creds = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json")
-    json.dump(creds_json, temp_creds)
-    temp_creds.close()
-
-    firebase_cred_path = temp_creds.name
-    print(f"✅ Firebase credentials loaded to temp file: {firebase_cred_path}")
-else:
-    firebase_cred_path = os.path.join(os.path.dirname(__file__), "firebase-credentials.json")
-    print(f"🔧 Using local Firebase credentials: {firebase_cred_path}")
-
-
 # ============================================
 # APP SETUP
 # ============================================
@@ -64,11 +51,35 @@ def get_whisper_model():
         print("✅ Whisper model loaded")
     return _whisper_model
 
+# ============================================
+# FIRESTORE REQUEST DEADLINE
+# ============================================
+# Every request gets FIRESTORE_REQUEST_DEADLINE_SECONDS (default 90s) for its
+# Firestore calls, retries included — below gunicorn's 120s worker timeout, so
+# a slow Firestore returns a 503 instead of the worker being killed.
+
+@app.before_request
+def open_firestore_deadline():
+    g.firestore_deadline = start_request_deadline()
+
+
+@app.teardown_request
+def close_firestore_deadline(exc):
+    token = g.pop("firestore_deadline", None)
+    if token is not None:
+        end_request_deadline(token)
+
+
+@app.errorhandler(FirestoreDeadlineExceeded)
+def firestore_deadline_exceeded(e):
+    print(f"⏱️  Firestore deadline exceeded on {request.path}: {e}")
+    return jsonify({"error": "Storage is responding slowly, please try again"}), 503
+
 # ============================================
 # INITIALIZE CLIENTS
 # ============================================
 
-firebase_client = FirebaseClient()
+firebase_client = get_firebase_client()
 user_profile = get_user_profile()
 
 # ============================================
@@ -426,6 +437,9 @@ def health():
         "whisper_loaded": _whisper_model is not None,
         "checkpointer": "SQLite (voicelog_memory.db)",
         "store": "SQLite/PostgreSQL Store (environment-based)",
+        "firestore": get_resilience_stats(),
+        "analytics_cache": ANALYTICS_CACHE.stats(),
+        "analysis_answer_cache": ANALYSIS_ANSWER_CACHE.stats(),
     })
 
 
@@ -451,62 +465,183 @@ def get_folders():
     return jsonify({"folders": folder_list, "success": True})
 
 
-@app.route("/folders/<fid>/tasks")
-@verify_token
-def get_tasks(fid):
-    user_id = request.user_id
-    tasks = (
-        firebase_client.db.collection("users")
-        .document(user_id)
-        .collection("tasks")
-        .where("folder", "==", fid)
-        .stream()
-    )
+def _serialize_task(task):
+    task_data = task.to_dict()
+    return {
+        "id": task.id,
+        "name": task_data["name"],
+        "completed": task_data.get("completed", False),
+        "folder": task_data["folder"],
+        "recurrence": task_data.get("recurrence", "once"),
+        "time": task_data.get("time"),
+        "duration": task_data.get("duration"),
+        "created_at": firebase_client._timestamp_to_iso(task_data.get("created_at")),
+        "completed_at": firebase_client._timestamp_to_iso(task_data.get("completed_at")),
+        "due_date": firebase_client._timestamp_to_iso(task_data.get("due_date")),
+        "is_high_priority": task_data.get("is_high_priority", False),
+    }
+
+
+MAX_TASK_PAGE_SIZE = 500
+
+
+def _task_list_response(user_id, folder=None):
+    """
+    Paginated, conditional task listing shared by /tasks and /folders/<fid>/tasks.
+
+    Query params:
+        limit: page size (1-500, optional — omit for the full list)
+        start_after: next_cursor from the previous page
 
-    task_list = []
-    for task in tasks:
-        task_data = task.to_dict()
-        task_list.append({
-            "id": task.id,
-            "name": task_data["name"],
-            "completed": task_data.get("completed", False),
-            "recurrence": task_data.get("recurrence", "once"),
-            "time": task_data.get("time"),
-            "duration": task_data.get("duration"),
-            "folder": task_data["folder"],
-            "created_at": firebase_client._timestamp_to_iso(task_data.get("created_at")),
-            "completed_at": firebase_client._timestamp_to_iso(task_data.get("completed_at")),
-            "due_date": firebase_client._timestamp_to_iso(task_data.get("due_date")),
-            "is_high_priority": task_data.get("is_high_priority", False),
+    The ETag is derived from the user's data version, so an unchanged list
+    answers If-None-Match with 304 before any Firestore scan or JSON encoding.
+    """
+    limit = request.args.get("limit")
+    start_after = request.args.get("start_after") or None
+
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            return jsonify({"success": False, "error": "limit must be an integer"}), 400
+        if not 1 <= limit <= MAX_TASK_PAGE_SIZE:
+            return jsonify({"success": False, "error": f"limit must be between 1 and {MAX_TASK_PAGE_SIZE}"}), 400
+
+    data_version = firebase_client.get_data_version(user_id)
+    etag_source = f"{user_id}|{data_version}|{folder}|{limit}|{start_after}"
+    etag = hashlib.sha1(etag_source.encode()).hexdigest()
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        tasks, next_cursor = firebase_client.list_tasks_page(
+            user_id, fields="mobile", folder=folder, limit=limit, start_after=start_after,
+        )
+        response = jsonify({
+            "tasks": [_serialize_task(task) for task in tasks],
+            "next_cursor": next_cursor,
+            "success": True,
         })
 
-    return jsonify({"tasks": task_list, "success": True})
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@app.route("/folders/<fid>/tasks")
+@verify_token
+def get_tasks(fid):
+    return _task_list_response(request.user_id, folder=fid)
 
 
 @app.route("/tasks")
 @verify_token
 def all_tasks():
+    return _task_list_response(request.user_id)
+
+
+@app.route("/tasks/changes")
+@verify_token
+def task_changes():
+    """
+    Delta sync: tasks created, updated or deleted since the client's cursor.
+
+    Call without `since` once for a full snapshot, then pass the returned
+    next_cursor on every foreground refresh. full_resync=true means the
+    cursor was too old to diff against: drop local tasks and use this snapshot.
+    """
     user_id = request.user_id
-    tasks = firebase_client.db.collection("users").document(user_id).collection("tasks").stream()
-    task_list = []
-
-    for task in tasks:
-        task_data = task.to_dict()
-        task_list.append({
-            "id": task.id,
-            "name": task_data["name"],
-            "completed": task_data.get("completed", False),
-            "folder": task_data["folder"],
-            "recurrence": task_data.get("recurrence", "once"),
-            "time": task_data.get("time"),
-            "duration": task_data.get("duration"),
-            "created_at": firebase_client._timestamp_to_iso(task_data.get("created_at")),
-            "completed_at": firebase_client._timestamp_to_iso(task_data.get("completed_at")),
-            "due_date": firebase_client._timestamp_to_iso(task_data.get("due_date")),
-            "is_high_priority": task_data.get("is_high_priority", False),
+    since = request.args.get("since") or None
+
+    try:
+        changes = firebase_client.get_task_changes(user_id, since=since)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    return jsonify({
+        "created": [_serialize_task(task) for task in changes["created"]],
+        "updated": [_serialize_task(task) for task in changes["updated"]],
+        "deleted": changes["deleted"],
+        "next_cursor": changes["next_cursor"],
+        "full_resync": changes["full_resync"],
+        "success": True,
+    })
+
+
+# ============================================
+# ANALYTICS ROUTES (DASHBOARD, NO LLM)
+# ============================================
+
+ANALYTICS_CACHE = VersionedCache(
+    "analytics",
+    max_entries=int(os.getenv("ANALYTICS_CACHE_MAX_ENTRIES", "2048")),
+    ttl_seconds=float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "3600")),
+)
+
+
+def _analytics_response(user_id, name, compute):
+    """
+    Structured analytics payload shared by the /analytics/* routes.
+
+    Query params:
+        timezone: IANA timezone (optional — defaults to the profile timezone)
+
+    Payloads are cached per (user, timezone, local date) at the user's data
+    version, and the ETag is derived from the same values, so an unchanged
+    dashboard gets a 304 and a changed one is recomputed once per worker.
+    """
+    tz_name = request.args.get("timezone") or user_profile.get_timezone(user_id)
+    try:
+        tz = ZoneInfo(tz_name)
+    except Exception:
+        return jsonify({"success": False, "error": f"Unknown timezone '{tz_name}'"}), 400
+
+    # Overdue counts, weekly windows and ages are relative to the user's today
+    local_date = datetime.now(tz).date().isoformat()
+    data_version = firebase_client.get_data_version(user_id)
+    etag_source = f"{user_id}|{data_version}|{name}|{tz_name}|{local_date}"
+    etag = hashlib.sha1(etag_source.encode()).hexdigest()
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        data, cached = ANALYTICS_CACHE.get_or_compute(
+            (user_id, name, tz_name, local_date), data_version, lambda: compute(user_id, tz_name),
+        )
+        response = jsonify({
+            "data": data,
+            "data_version": data_version,
+            "cached": cached,
+            "success": True,
         })
 
-    return jsonify({"tasks": task_list, "success": True})
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@app.route("/analytics/productivity")
+@verify_token
+def analytics_productivity():
+    return _analytics_response(request.user_id, "productivity", productivity_patterns)
+
+
+@app.route("/analytics/procrastination")
+@verify_token
+def analytics_procrastination():
+    return _analytics_response(request.user_id, "procrastination", procrastination_report)
+
+
+@app.route("/analytics/weekly")
+@verify_token
+def analytics_weekly():
+    return _analytics_response(request.user_id, "weekly", weekly_accountability_summary)
+
+
+@app.route("/analytics/heatmap")
+@verify_token
+def analytics_heatmap():
+    return _analytics_response(request.user_id, "heatmap", completion_heatmap)
 
 
 # ============================================
@@ -524,6 +659,7 @@ if __name__ == "__main__":
     print("\n📋 Endpoints:")
     print("   POST /transcribe - Whisper speech-to-text (Auth Required)")
     print("   POST /process_command - Main chat (Auth Required)")
+    print("   GET  /analytics/<productivity|procrastination|weekly|heatmap> - Dashboard data (Auth Required)")
     print("   GET  /health - Health check (No Auth)")
     print(f"{'='*60}\n")
 
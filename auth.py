@@ -1,39 +1,8 @@
-import firebase_admin
-from firebase_admin import credentials, auth
+from firebase_admin import auth
 from functools import wraps
 from flask import request, jsonify
-import os
-import json
-import tempfile
-
-# ============================================
-# INITIALIZE FIREBASE ADMIN (ONCE)
-# ============================================
-
-if not firebase_admin._apps:
-    if os.getenv("FIREBASE_CREDENTIALS_JSON"):
-        print("🔧 Loading Firebase credentials from environment variable...")
-        creds_json = json.loads(os.getenv("FIREBASE_CREDENTIALS_JSON"))
-
-        temp_creds = tempfile.NamedTemporaryFile(
-            mode="w", delete=False, suffix=".json"
-        )
-        json.dump(creds_json, temp_creds)
-        temp_creds.close()
-
-        cred = credentials.Certificate(temp_creds.name)
-        print("✅ Firebase credentials loaded from environment")
-    else:
-        cred_path = os.path.join(
-            os.path.dirname(__file__),
-            "firebase-credentials.json"
-        )
-        cred = credentials.Certificate(cred_path)
-        print(f"🔧 Using local Firebase credentials: {cred_path}")
-
-    firebase_admin.initialize_app(cred)
-    print("✅ Firebase Admin initialized for authentication")
 
+from utils.firebase_client import get_firebase_app
 
 # ============================================
 # AUTH DECORATOR (HTTP ONLY)
@@ -62,7 +31,7 @@ def verify_token(f):
 
         try:
             token = auth_header.split("Bearer ")[1]
-            decoded_token = auth.verify_id_token(token)
+            decoded_token = auth.verify_id_token(token, app=get_firebase_app())
 
             request.user_id = decoded_token["uid"]
 
@@ -0,0 +1,126 @@
+# benchmarks/bench_bulk_operations.py
+"""
+Bulk tool benchmark: "complete laundry, dishes and vacuuming" as N single
+tool calls vs one bulk call.
+
+Seeds a user with T tasks in the in-memory Firestore, then completes (and
+moves) K of them both ways:
+
+    per-item — mark_task_complete / move_task once per description (the old path)
+    bulk     — mark_tasks_complete / move_tasks with all K descriptions
+
+and counts the store round trips each needs (document/query reads, get_all
+calls and batch commits) plus wall time. Round trips are what cost latency
+against real Firestore; the in-memory times only show the CPU side.
+
+Usage:
+    python benchmarks/bench_bulk_operations.py              # 1000 tasks, 3 / 10 / 25 items
+    python benchmarks/bench_bulk_operations.py 5000 50      # custom task count and item count
+"""
+
+import sys
+import os
+import time
+from collections import Counter
+
+# Add parent directory (backend/) to path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+os.environ.setdefault("VOICELOG_STORAGE", "memory")
+
+from utils import memory_firestore
+from utils.memory_firestore import MemoryFirestore
+from utils.firebase_client import get_firebase_client, use_firestore_db
+from tools import crud_tools
+
+DEFAULT_TASKS = 1000
+DEFAULT_ITEMS = [3, 10, 25]
+
+CHORES = ["laundry", "dishes", "vacuuming", "groceries", "trash", "recycling", "bathroom", "windows",
+          "garage", "lawn", "plants", "bed sheets", "fridge", "oven", "closet", "pantry", "car wash",
+          "gutters", "mail", "dog walk", "cat litter", "bills", "filters", "mopping", "dusting"]
+
+ROUND_TRIPS = Counter()
+
+
+def _count(cls, name, label):
+    original = getattr(cls, name)
+
+    def counted(*args, **kwargs):
+        ROUND_TRIPS[label] += 1
+        return original(*args, **kwargs)
+    setattr(cls, name, counted)
+
+
+def _instrument():
+    _count(memory_firestore.MemoryDocumentReference, 'get', 'reads')
+    _count(memory_firestore.MemoryQuery, 'stream', 'reads')
+    _count(memory_firestore.MemoryQuery, 'get', 'reads')
+    _count(memory_firestore.MemoryAggregationQuery, 'get', 'reads')
+    _count(MemoryFirestore, 'get_all', 'reads')
+    _count(memory_firestore.MemoryWriteBatch, 'commit', 'commits')
+
+
+def _seed(user_id: str, n_tasks: int):
+    client = get_firebase_client()
+    client.create_folder("Home", "🏠", user_id)
+    client.create_folder("Work", "💼", user_id)
+    for i in range(n_tasks):
+        chore = CHORES[i % len(CHORES)]
+        suffix = "" if i < len(CHORES) else f" round {i // len(CHORES)}"
+        client.tasks.add(user_id, client.tasks.new_id(user_id), {
+            'name': f"{chore.capitalize()}{suffix}", 'folder': 'home', 'completed': False,
+            'is_high_priority': False, 'due_date': '', 'created_at': None,
+        })
+    client.bump_data_version(user_id)
+
+
+def _measure(label, fn):
+    ROUND_TRIPS.clear()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:30}{ROUND_TRIPS['reads']:>8}{ROUND_TRIPS['commits']:>10}{elapsed * 1000:>12.1f}")
+
+
+def run(n_tasks: int, n_items: int):
+    descriptions = CHORES[:n_items]
+
+    for mode in ("per-item", "bulk"):
+        use_firestore_db(MemoryFirestore())
+        user_id = f"bench_{mode}"
+        _seed(user_id, n_tasks)
+        config = {'configurable': {'user_id': user_id}}  # read by get_user_id_from_context
+
+        # Warm the resolver's index so both modes start from the same state
+        from utils.intent_resolver import intent_resolver
+        intent_resolver.resolve_task("warmup", user_id=user_id)
+
+        if mode == "per-item":
+            _measure(f"complete ×{n_items} (per-item)",
+                     lambda: [crud_tools.mark_task_complete.func(d) for d in descriptions])
+            _measure(f"move ×{n_items} (per-item)",
+                     lambda: [crud_tools.move_task.func(d, "work") for d in descriptions])
+        else:
+            _measure(f"complete ×{n_items} (bulk)", lambda: crud_tools.mark_tasks_complete.func(descriptions))
+            _measure(f"move ×{n_items} (bulk)", lambda: crud_tools.move_tasks.func(descriptions, "work"))
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:]]
+    n_tasks = args[0] if args else DEFAULT_TASKS
+    items = args[1:] or DEFAULT_ITEMS
+
+    _instrument()
+    print("=" * 62)
+    print(f"Bulk tools: {n_tasks} tasks per user")
+    print("=" * 62)
+    print(f"  {'':30}{'reads':>8}{'commits':>10}{'ms':>12}")
+    for n_items in items:
+        run(n_tasks, min(n_items, len(CHORES)))
+        print()
+
+
+if __name__ == "__main__":
+    main()
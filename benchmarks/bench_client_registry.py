@@ -0,0 +1,103 @@
+# benchmarks/bench_client_registry.py
+"""
+Startup and per-call overhead of the shared Firestore client registry.
+
+Measures:
+  1. Import time of the tool/agent modules (no Firestore client is built at import)
+  2. Cold get_firebase_client() — the one-off Firebase initialisation
+  3. Warm get_firebase_client() — what every analysis tool call now pays
+  4. The per-call setup the old FirebaseClient() constructor ran on every
+     analysis tool call (credentials parse, temp credentials file, Firestore
+     client lookup, init banner), reproduced here for comparison
+
+Usage:
+    python benchmarks/bench_client_registry.py
+
+Requires Firebase credentials (FIREBASE_CREDENTIALS_JSON or firebase-credentials.json).
+No Firestore reads or writes are made.
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import tempfile
+import statistics
+import contextlib
+
+# Add parent directory (backend/) to path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+# Change working directory to backend (for Firebase credentials)
+os.chdir(backend_dir)
+
+WARM_CALLS = 10_000
+LEGACY_CALLS = 50
+
+
+def _time_ms(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _legacy_client_setup():
+    """The work the pre-registry FirebaseClient.__init__ repeated on every construction"""
+    from firebase_admin import credentials, firestore
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(15):  # init banner / diagnostics
+            print("🔧 INITIALIZING FIREBASE CLIENT")
+
+        if os.getenv('FIREBASE_CREDENTIALS_JSON'):
+            cred_dict = json.loads(os.getenv('FIREBASE_CREDENTIALS_JSON'))
+            temp_creds = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
+            json.dump(cred_dict, temp_creds)
+            temp_creds.close()
+            credentials.Certificate(temp_creds.name)
+            os.unlink(temp_creds.name)
+        else:
+            with open("firebase-credentials.json") as f:
+                json.load(f)
+            credentials.Certificate("firebase-credentials.json")
+
+        firestore.client()
+
+
+def main():
+    print(f"\n{'='*60}")
+    print(f"⏱️  FIRESTORE CLIENT REGISTRY")
+    print(f"{'='*60}")
+
+    start = time.perf_counter()
+    import tools.crud_tools  # noqa: F401
+    import tools.cleanup_actions  # noqa: F401
+    import tools.analysis_tools  # noqa: F401
+    import utils.intent_resolver  # noqa: F401
+    import utils.user_profile  # noqa: F401
+    import_ms = (time.perf_counter() - start) * 1000
+    print(f"   Module imports (no client built):   {import_ms:8.1f} ms")
+
+    from utils.firebase_client import get_firebase_client
+
+    start = time.perf_counter()
+    get_firebase_client()
+    cold_ms = (time.perf_counter() - start) * 1000
+    print(f"   Cold get_firebase_client():         {cold_ms:8.1f} ms  (once per process)")
+
+    warm = _time_ms(get_firebase_client, WARM_CALLS)
+    print(f"   Warm get_firebase_client():         {statistics.mean(warm) * 1000:8.3f} µs  (per tool call)")
+
+    legacy = _time_ms(_legacy_client_setup, LEGACY_CALLS)
+    print(f"   Old per-call FirebaseClient() setup: {statistics.median(legacy):8.2f} ms  (median of {LEGACY_CALLS})")
+
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/bench_create_task.py
+"""
+Create-task latency benchmark.
+
+Seeds a throwaway bench user with N existing tasks, then times
+FirebaseClient.create_task for a batch of new, non-duplicate names.
+
+Usage:
+    python benchmarks/bench_create_task.py              # sizes 10, 1000, 10000
+    python benchmarks/bench_create_task.py 10 1000      # custom sizes
+
+WARNING: writes to (and then deletes) users/bench_create_task/* in the
+configured Firebase project.
+"""
+
+import sys
+import os
+import time
+import statistics
+import uuid
+
+# Add parent directory (backend/) to path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+# Change working directory to backend (for Firebase credentials)
+os.chdir(backend_dir)
+
+from firebase_admin import firestore
+from utils.firebase_client import get_firebase_client
+
+BENCH_USER = "bench_create_task"
+BENCH_FOLDER = "Bench"
+DEFAULT_SIZES = [10, 1_000, 10_000]
+CREATES_PER_SIZE = 20
+BATCH_SIZE = 500  # Firestore batch write limit
+
+
+def _clear_user(client):
+    """Delete every task and folder under the bench user"""
+    for ref in (client._get_user_tasks_ref(BENCH_USER), client._get_user_folders_ref(BENCH_USER)):
+        while True:
+            docs = list(ref.limit(BATCH_SIZE).stream())
+            if not docs:
+                break
+            batch = client.db.batch()
+            for doc in docs:
+                batch.delete(doc.reference)
+            batch.commit()
+
+
+def _seed(client, n: int):
+    """Write n distinct tasks with batched writes"""
+    client.create_folder(BENCH_FOLDER, "", BENCH_USER)
+    tasks_ref = client._get_user_tasks_ref(BENCH_USER)
+    for start in range(0, n, BATCH_SIZE):
+        batch = client.db.batch()
+        for i in range(start, min(start + BATCH_SIZE, n)):
+            batch.set(tasks_ref.document(), {
+                'name': f"seed {uuid.uuid4().hex}",
+                'folder': BENCH_FOLDER.lower(),
+                'completed': False,
+                'created_at': firestore.SERVER_TIMESTAMP,
+                'completed_at': None,
+                'is_high_priority': False,
+            })
+        batch.commit()
+
+
+def bench_size(client, n: int) -> dict:
+    _clear_user(client)
+    client._invalidate_task_candidates(BENCH_USER)
+    _seed(client, n)
+
+    latencies = []
+    for i in range(CREATES_PER_SIZE):
+        name = f"bench {i} {uuid.uuid4().hex[:12]}"
+        start = time.perf_counter()
+        client.create_task(name, BENCH_FOLDER, BENCH_USER)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "existing_tasks": n,
+        "first_ms": round(latencies[0], 1),  # includes loading the candidate set
+        "median_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(sorted(latencies)[int(len(latencies) * 0.95) - 1], 1),
+    }
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    client = get_firebase_client()
+
+    print(f"\n{'='*60}")
+    print(f"⏱️  CREATE_TASK LATENCY ({CREATES_PER_SIZE} creates per size)")
+    print(f"{'='*60}")
+
+    results = []
+    try:
+        for n in sizes:
+            result = bench_size(client, n)
+            results.append(result)
+            print(f"   {n:>6} existing → first {result['first_ms']}ms | "
+                  f"median {result['median_ms']}ms | p95 {result['p95_ms']}ms")
+    finally:
+        _clear_user(client)
+
+    print(f"{'='*60}\n")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# benchmarks/bench_intent_resolver.py
+"""
+Intent resolver benchmark: exhaustive fuzzy matching vs the trigram shortlist.
+
+Generates N synthetic task names and a set of user-style references to them
+(dropped words, typos, extra filler words, lowercase) and resolves each one
+both ways:
+
+    exhaustive — IntentResolver._fuzzy_match over every task (the old path)
+    indexed    — NameIndex.shortlist → _fuzzy_match over the shortlist only
+
+Reports the time per lookup, the index build time, the cost of one incremental
+update (rename = remove + add), and how often the indexed path returns a
+match as good as the exhaustive one. No Firestore involved.
+
+Usage:
+    python benchmarks/bench_intent_resolver.py                 # 100, 10k, 100k tasks
+    python benchmarks/bench_intent_resolver.py 500 50000       # custom sizes
+"""
+
+import sys
+import os
+import time
+import random
+
+# Add parent directory (backend/) to path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from utils.task_model import Task
+from utils.name_index import NameIndex
+from utils.intent_resolver import IntentResolver, RESOLVER_SHORTLIST_SIZE
+
+DEFAULT_SIZES = [100, 10_000, 100_000]
+# Exhaustive matching is slow on big lists; keep its total work roughly constant
+EXHAUSTIVE_BUDGET = 2_000_000
+
+VERBS = ["buy", "call", "email", "finish", "review", "book", "pay", "clean", "fix", "read", "write",
+         "schedule", "plan", "prepare", "submit", "update", "cancel", "renew", "practice", "organize"]
+OBJECTS = ["groceries", "mom", "dentist", "tax return", "electricity bill", "report", "flight", "car",
+           "garage", "chapter", "essay", "meeting", "presentation", "invoice", "passport", "gym membership",
+           "guitar", "closet", "laptop", "insurance", "shoulder press", "budget", "resume", "birthday gift"]
+QUALIFIERS = ["", "", "", "for work", "before friday", "at 5 pm", "tomorrow", "with sam", "30 lbs",
+              "for the trip", "online", "again", "this week", "part 2"]
+
+
+def _names(n: int):
+    rng = random.Random(42)
+    names = []
+    for i in range(n):
+        parts = [rng.choice(VERBS), rng.choice(OBJECTS), rng.choice(QUALIFIERS)]
+        if rng.random() < 0.3:
+            parts.append(str(rng.randint(1, 99)))
+        names.append(" ".join(p for p in parts if p).capitalize())
+    return names
+
+
+def _typo(word: str, rng) -> str:
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1:] if rng.random() < 0.5 else word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def _reference(name: str, rng) -> str:
+    """How a user might refer to a task: partial, misspelled, padded with filler"""
+    words = name.lower().split()
+    style = rng.randrange(4)
+    if style == 0 and len(words) > 2:
+        words = words[:2]
+    elif style == 1:
+        words = [_typo(w, rng) if rng.random() < 0.5 else w for w in words]
+    elif style == 2:
+        words = ["the"] + words + ["task"]
+    else:
+        words = words[1:] or words
+    return " ".join(words)
+
+
+def _bench(n: int):
+    resolver = IntentResolver()
+    names = _names(n)
+    tasks = [Task(f"task{i:07d}", name=name, completed=False) for i, name in enumerate(names)]
+
+    start = time.perf_counter()
+    index = NameIndex(IntentResolver.STOP_WORDS)
+    for task in tasks:
+        index.add(task.id, task.name, task)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    rng = random.Random(7)
+    updates = 2_000
+    start = time.perf_counter()
+    for _ in range(updates):
+        task = tasks[rng.randrange(n)]
+        index.add(task.id, task.name, task)  # re-index = remove + add
+    update_us = (time.perf_counter() - start) / updates * 1e6
+
+    n_queries = max(10, min(200, EXHAUSTIVE_BUDGET // n))
+    queries = [_reference(names[rng.randrange(n)], rng) for _ in range(n_queries)]
+
+    start = time.perf_counter()
+    exhaustive = [resolver._fuzzy_match(q, tasks, 'name') for q in queries]
+    exhaustive_ms = (time.perf_counter() - start) / n_queries * 1000
+
+    start = time.perf_counter()
+    shortlist = [index.shortlist(q, RESOLVER_SHORTLIST_SIZE) for q in queries]
+    shortlist_ms = (time.perf_counter() - start) / n_queries * 1000
+
+    start = time.perf_counter()
+    indexed = [resolver._fuzzy_match(q, resolver._task_candidates(index, q), 'name') for q in queries]
+    indexed_ms = (time.perf_counter() - start) / n_queries * 1000
+
+    # "As good": same confidence as the exhaustive best (ties between equally good names are fine)
+    agree = sum(
+        1 for a, b in zip(exhaustive, indexed)
+        if (a is None and b is None) or (a and b and abs(a['confidence'] - b['confidence']) < 1e-9)
+    )
+
+    print(f"\n{n:,} tasks ({n_queries} lookups)")
+    print(f"  index build:        {build_ms:10.1f} ms   ({len(index):,} names)")
+    print(f"  incremental update: {update_us:10.1f} µs per task")
+    print(f"  exhaustive lookup:  {exhaustive_ms:10.2f} ms")
+    print(f"  indexed lookup:     {indexed_ms:10.2f} ms   (shortlist alone {shortlist_ms:.2f} ms, "
+          f"{sum(map(len, shortlist)) / n_queries:.0f} candidates)")
+    print(f"  speedup:            {exhaustive_ms / indexed_ms:10.1f}x")
+    print(f"  same best score:    {agree}/{n_queries}")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print("=" * 60)
+    print("Intent resolver: exhaustive vs trigram shortlist")
+    print(f"(exhaustive scoring up to {RESOLVER_SHORTLIST_SIZE} shortlist candidates; "
+          f"lists ≤ RESOLVER_SHORTLIST_MIN_TASKS are scored in full)")
+    print("=" * 60)
+    for n in sizes:
+        _bench(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# benchmarks/bench_phonetic_resolution.py
+"""
+Phonetic matching benchmark: transcription-style task references.
+
+Builds a realistic task list and short spoken references to each task
+("the fone bill", "cee dentist") the way speech-to-text mangles them — homophones ("see" → "cee", "buy" → "by"), sound-alike
+spellings ("phone" → "fone", "press" → "presse", "check" → "chek") and
+number words ("30" → "thirty") — then resolves every reference with the
+phonetic signal off and on:
+
+    resolved  — matched the intended task
+    failed    — no match (the agent falls back to suggestions / search_tasks)
+    wrong     — matched a different task
+
+Plain references (no errors) and references to tasks that don't exist are
+included, to check the phonetic signal doesn't cost accuracy elsewhere.
+IntentResolver._fuzzy_match only; no Firestore involved.
+
+Usage:
+    python benchmarks/bench_phonetic_resolution.py
+"""
+
+import sys
+import os
+import random
+
+# Add parent directory (backend/) to path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+import utils.intent_resolver as intent_resolver_module
+from utils.intent_resolver import IntentResolver
+from utils.task_model import Task
+
+TASKS = [
+    "Shoulder press 30lbs", "Wake up at 5:45 AM", "Call mom", "Buy groceries", "Finish tax return",
+    "See the dentist", "Read chapter 4", "Pay phone bill", "Check car tires", "Write thank you notes",
+    "Book flight to Phoenix", "Meet Sarah for coffee", "Renew passport", "Schedule physio session",
+    "Clean the garage", "Pick up dry cleaning", "Email Professor Knight", "Practice guitar scales",
+    "Submit expense report", "Water the plants", "Buy birthday present for Mike", "Fix kitchen faucet",
+    "Prepare quarterly presentation", "Cancel gym membership", "Order new glasses", "Walk the dog",
+    "Review insurance policy", "Send invoice to Acme", "Plan weekend hike", "Laundry",
+    "Bench press 3 sets", "Yoga class", "Refill prescription", "Buy flour and sugar", "Fax the lease",
+    "Write weekly journal", "Mail the package", "Bake cookies for Rachel", "Pay electricity bill",
+    "Squats 20 reps",
+]
+
+# Words that sound like other words / spellings speech-to-text produces
+HOMOPHONES = {
+    "see": ["cee", "sea"], "buy": ["by", "bye"], "write": ["right", "rite"], "meet": ["meat"],
+    "for": ["four", "fore"], "to": ["two", "too"], "flour": ["flower"], "mail": ["male"],
+    "weekly": ["weakly"], "knight": ["night"], "new": ["knew"], "dye": ["die"], "dry": ["drye"],
+    "week": ["weak"], "sets": ["setts"], "reps": ["repps"], "walk": ["wok"], "yoga": ["yogah"],
+    "phone": ["fone"], "physio": ["fizio", "fysio"], "phoenix": ["feenix", "phenix"],
+    "check": ["chek", "cheque"], "tires": ["tyres"], "fax": ["facks"], "cookies": ["cookys"],
+    "rachel": ["rachael", "raychel"], "sarah": ["sara"], "mike": ["myke"], "guitar": ["gitar"],
+    "scales": ["scails"], "press": ["presse", "pres"], "shoulder": ["sholder", "shoulda"],
+    "groceries": ["grosseries", "grocerys"], "dentist": ["dentiste"], "faucet": ["fawcet", "forcet"],
+    "quarterly": ["quortarly"], "passport": ["pasport"], "journal": ["jurnal"], "lease": ["leese"],
+    "prescription": ["perscription"], "squats": ["squots"], "laundry": ["londry", "lawndry"],
+    "coffee": ["coffey", "kofee"], "garage": ["garaj"], "invoice": ["invoyce"], "acme": ["akme"],
+    "hike": ["hyke"], "glasses": ["glases"], "plants": ["plance"], "package": ["packidge"],
+    "cleaning": ["kleaning"], "bill": ["bil"], "mom": ["mum"], "expense": ["expence"],
+    "electricity": ["electrisity"], "30lbs": ["thirty pounds"], "3": ["three"], "20": ["twenty"],
+    "4": ["four"], "insurance": ["insurence"], "practice": ["practise"], "present": ["presant"],
+}
+
+# References to tasks that aren't in the list (should stay unresolved)
+ABSENT = [
+    "book a haircut", "call the plumber", "renew car registration", "buy a new mattress",
+    "finish the novel", "pay parking ticket", "clean the windows", "email the landlord",
+    "sign up for swimming", "return library books", "feed the cat", "update my resume",
+]
+
+
+def _transcribe(name: str, rng) -> str:
+    """
+    A short spoken reference to the task ("the fone bill"): one or two of its
+    content words, at least one of them replaced by a sound-alike
+    """
+    words = [w for w in name.lower().replace(":", " ").split() if w not in IntentResolver.STOP_WORDS]
+    swappable = [i for i, w in enumerate(words) if w in HOMOPHONES]
+    if not swappable:
+        return None
+    spoken = rng.choice(swappable)
+    kept = sorted({spoken, rng.randrange(len(words))}) if rng.random() < 0.6 else [spoken]
+    reference = [rng.choice(HOMOPHONES[words[i]]) if i == spoken else words[i] for i in kept]
+    return " ".join(reference)
+
+
+def _evaluate(resolver, tasks, cases):
+    counts = {'resolved': 0, 'failed': 0, 'wrong': 0}
+    for query, expected in cases:
+        match = resolver._fuzzy_match(query, tasks, 'name')
+        if match is None:
+            counts['failed' if expected else 'resolved'] += 1
+        elif match['id'] == expected:
+            counts['resolved'] += 1
+        else:
+            counts['wrong'] += 1
+    return counts
+
+
+def main():
+    rng = random.Random(11)
+    tasks = [Task(f"task{i:03d}", name=name, completed=False) for i, name in enumerate(TASKS)]
+
+    transcribed = []
+    for task in tasks:
+        for _ in range(5):
+            reference = _transcribe(task.name, rng)
+            if reference and reference != task.name.lower():
+                transcribed.append((reference, task.id))
+    transcribed = sorted(set(transcribed))
+    plain = [(task.name.lower(), task.id) for task in tasks]
+    absent = [(reference, None) for reference in ABSENT]
+
+    resolver = IntentResolver()
+    print("=" * 66)
+    print("Phonetic matching: transcription-style task references")
+    print(f"{len(tasks)} tasks; {len(transcribed)} transcribed, {len(plain)} plain, {len(absent)} absent references")
+    print("=" * 66)
+    print(f"{'':24}{'resolved':>10}{'failed':>10}{'wrong':>10}")
+
+    for label, cases in (("transcribed", transcribed), ("plain", plain), ("absent (any match wrong)", absent)):
+        for phonetic in (False, True):
+            intent_resolver_module.RESOLVER_PHONETIC_ENABLED = phonetic
+            counts = _evaluate(resolver, tasks, cases)
+            name = f"{label} [{'phonetic' if phonetic else 'baseline'}]"
+            print(f"{name:34}{counts['resolved']:>4}{counts['failed']:>10}{counts['wrong']:>10}")
+
+
+if __name__ == "__main__":
+    main()
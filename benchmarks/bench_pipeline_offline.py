@@ -0,0 +1,165 @@
+# benchmarks/bench_pipeline_offline.py
+"""
+Offline load test / profile of the tool layer against the in-memory Firestore.
+
+Seeds synthetic users (folders + tasks with spread-out created/completed
+timestamps) into a MemoryFirestore, then drives the same @tool functions the
+agents call — CRUD, fuzzy-matched updates and the analysis tools — and
+reports per-tool latency. No credentials, network or LLM calls.
+
+Usage:
+    python benchmarks/bench_pipeline_offline.py                  # 5 users × 1000 tasks
+    python benchmarks/bench_pipeline_offline.py 20 5000          # users, tasks per user
+    python benchmarks/bench_pipeline_offline.py 5 1000 --profile # + cProfile top 25
+"""
+
+import sys
+import os
+import io
+import time
+import random
+import cProfile
+import pstats
+import statistics
+import contextlib
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory (backend/) to path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+os.chdir(backend_dir)
+
+os.environ["VOICELOG_STORAGE"] = "memory"
+
+from utils.memory_firestore import MemoryFirestore
+from utils.firebase_client import get_firebase_client, use_firestore_db
+
+DEFAULT_USERS = 5
+DEFAULT_TASKS = 1_000
+ROUNDS_PER_USER = 5
+BATCH_SIZE = 500
+TIMEZONE = "America/Los_Angeles"
+
+FOLDERS = ["Work", "Personal", "School", "Fitness", "Errands", "Reading"]
+VERBS = ["write", "call", "review", "buy", "plan", "clean", "read", "email", "fix", "book"]
+OBJECTS = ["report", "mom", "slides", "groceries", "trip", "garage", "chapter", "landlord",
+           "bike", "dentist", "budget", "resume", "essay", "laundry", "tickets"]
+
+
+def _seed_user(client, user_id: str, n_tasks: int, rng: random.Random):
+    """Folders plus n_tasks tasks spread over the last 90 days, ~60% completed"""
+    for folder in FOLDERS:
+        client.create_folder(folder, "", user_id)
+
+    now = datetime.now(timezone.utc)
+    tasks_ref = client._get_user_tasks_ref(user_id)
+    for start in range(0, n_tasks, BATCH_SIZE):
+        batch = client.db.batch()
+        for i in range(start, min(start + BATCH_SIZE, n_tasks)):
+            created = now - timedelta(days=rng.uniform(0, 90))
+            completed = rng.random() < 0.6
+            completed_at = created + timedelta(hours=rng.uniform(0.5, 24 * 7)) if completed else None
+            if completed_at and completed_at > now:
+                completed_at = now
+            due = (created + timedelta(days=rng.randint(0, 14))).strftime("%Y-%m-%d")
+            batch.set(tasks_ref.document(), {
+                'name': f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {i}",
+                'folder': rng.choice(FOLDERS).lower(),
+                'completed': completed,
+                'recurrence': "once",
+                'time': "",
+                'duration': "",
+                'due_date': due,
+                'created_at': created,
+                'completed_at': completed_at,
+                'completed_day': completed_at.strftime("%Y-%m-%d") if completed_at else None,
+                'is_high_priority': rng.random() < 0.1,
+                'updated_at': completed_at or created,
+            })
+        batch.commit()
+
+
+def _call(tool, **kwargs):
+    """Invoke a @tool the way the agents do: user_id comes from a `config` local up the stack"""
+    config = {'configurable': {'user_id': _call.user_id}}  # noqa: F841 (read via frame inspection)
+    return tool.func(**kwargs)
+
+
+def _workload(user_id: str, rng: random.Random):
+    """One simulated session; returns [(tool_name, ms)]"""
+    from tools import crud_tools, analysis_tools
+
+    _call.user_id = user_id
+    obj = rng.choice(OBJECTS)
+    steps = [
+        ("create_task", crud_tools.create_task,
+         {'task_name': f"{rng.choice(VERBS)} new {obj} {rng.randint(0, 10**6)}", 'folder_name': rng.choice(FOLDERS)}),
+        ("list_all_tasks", crud_tools.list_all_tasks, {}),
+        ("search_tasks", crud_tools.search_tasks, {'query': obj}),
+        ("count_completed_tasks", crud_tools.count_completed_tasks, {}),
+        ("mark_task_complete", crud_tools.mark_task_complete, {'task_description': f"{rng.choice(VERBS)} {obj}"}),
+        ("get_productivity_patterns", analysis_tools.get_productivity_patterns, {'user_timezone': TIMEZONE}),
+        ("get_procrastination_report", analysis_tools.get_procrastination_report, {'user_timezone': TIMEZONE}),
+        ("get_weekly_accountability_summary", analysis_tools.get_weekly_accountability_summary,
+         {'user_timezone': TIMEZONE}),
+        ("get_tasks_by_filter", analysis_tools.get_tasks_by_filter,
+         {'user_timezone': TIMEZONE, 'completed': False, 'overdue_only': True}),
+        ("get_trend_report", analysis_tools.get_trend_report, {'user_timezone': TIMEZONE, 'window_days': 30}),
+    ]
+
+    timings = []
+    for name, tool, kwargs in steps:
+        start = time.perf_counter()
+        _call(tool, **kwargs)
+        timings.append((name, (time.perf_counter() - start) * 1000))
+    return timings
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    n_users = int(args[0]) if len(args) > 0 else DEFAULT_USERS
+    n_tasks = int(args[1]) if len(args) > 1 else DEFAULT_TASKS
+    profile = "--profile" in sys.argv
+
+    rng = random.Random(42)
+    db = MemoryFirestore()
+    use_firestore_db(db)
+    client = get_firebase_client()
+
+    print(f"\n{'='*60}")
+    print(f"⏱️  OFFLINE PIPELINE ({n_users} users × {n_tasks} tasks, in-memory Firestore)")
+    print(f"{'='*60}")
+
+    start = time.perf_counter()
+    users = [f"synthetic_user_{i}" for i in range(n_users)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for user_id in users:
+            _seed_user(client, user_id, n_tasks, rng)
+    print(f"   Seeded {db.document_count()} documents in {time.perf_counter() - start:.1f}s")
+
+    profiler = cProfile.Profile() if profile else None
+    by_tool = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        if profiler:
+            profiler.enable()
+        for _ in range(ROUNDS_PER_USER):
+            for user_id in users:
+                for name, ms in _workload(user_id, rng):
+                    by_tool.setdefault(name, []).append(ms)
+        if profiler:
+            profiler.disable()
+
+    for name, samples in by_tool.items():
+        samples.sort()
+        p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+        print(f"   {name:<36} median {statistics.median(samples):8.2f}ms | p95 {p95:8.2f}ms")
+    print(f"{'='*60}\n")
+
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+    return by_tool
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# benchmarks/bench_task_frame.py
+"""
+Analytics engine benchmark: per-task Python loops vs the columnar TaskFrame.
+
+Generates N synthetic Task objects (spread over the last 400 days so DST
+transitions are included) and computes the get_productivity_patterns metrics
+— weighted weekday/hour/bucket scores, average completion time, overdue count —
+both ways:
+
+    loop   — one datetime.fromtimestamp(ts, tz) per task, dict accumulators
+    frame  — TaskFrame columns + bincount / masks (frame build timed separately)
+
+Results are checked for equality. No Firestore involved.
+
+Usage:
+    python benchmarks/bench_task_frame.py                    # 1k, 100k, 1M tasks
+    python benchmarks/bench_task_frame.py 5000 50000         # custom sizes
+"""
+
+import sys
+import os
+import time
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+# Add parent directory (backend/) to path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from utils.task_model import Task
+from utils.task_frame import TaskFrame, WEEKDAY_NAMES, TIME_BUCKETS, HOUR_TO_BUCKET, peak, today_ordinal
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+
+def _tasks(n: int):
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc).timestamp()
+    today = datetime.now(timezone.utc).date().toordinal()
+    tasks = []
+    for i in range(n):
+        created = now - rng.uniform(0, 400 * 86_400)
+        completed = rng.random() < 0.6
+        has_due = rng.random() < 0.5
+        tasks.append(Task(
+            f"task{i:07d}",
+            name=f"task {i}",
+            folder=rng.choice(["work", "personal", "school"]),
+            completed=completed,
+            is_high_priority=rng.random() < 0.1,
+            created_ts=created,
+            completed_ts=min(created + rng.uniform(1_800, 7 * 86_400), now) if completed else None,
+            due_ordinal=today - rng.randint(-14, 60) if has_due else None,
+        ))
+    return tasks
+
+
+def _loop_metrics(tasks, tz):
+    today = today_ordinal(tz)
+    day_scores, hour_scores, bucket_scores = defaultdict(float), defaultdict(float), defaultdict(float)
+    durations, overdue = [], 0
+    for t in tasks:
+        if t.completed:
+            if t.completed_ts is None:
+                continue
+            w = 3 if t.is_high_priority else 2 if t.has_due_date else 1
+            local = datetime.fromtimestamp(t.completed_ts, tz)
+            day_scores[local.strftime("%A")] += w
+            hour_scores[local.hour] += w
+            bucket_scores[TIME_BUCKETS[HOUR_TO_BUCKET[local.hour]]] += w
+            if t.created_ts is not None:
+                durations.append((t.completed_ts - t.created_ts) / 3600)
+        elif t.has_due_date:
+            if t.due_ordinal is not None and t.due_ordinal < today:
+                overdue += 1
+        elif t.created_ts is not None:
+            if today - datetime.fromtimestamp(t.created_ts, tz).toordinal() >= 7:
+                overdue += 1
+    return (
+        {d: s for d, s in day_scores.items()},
+        {h: s for h, s in hour_scores.items()},
+        {b: s for b, s in bucket_scores.items()},
+        round(sum(durations) / len(durations), 2) if durations else None,
+        overdue,
+    )
+
+
+def _frame_metrics(frame, tz):
+    today = today_ordinal(tz)
+    done = frame.completed & frame.has_completed_at
+    weights = frame.weights()[done]
+    local = frame.completed_local(tz)
+    days, hours = local.weekday[done], local.hour[done]
+
+    day_scores = np.bincount(days, weights=weights, minlength=7)
+    hour_scores = np.bincount(hours, weights=weights, minlength=24)
+    bucket_scores = np.bincount(HOUR_TO_BUCKET[hours], weights=weights, minlength=len(TIME_BUCKETS))
+    durations = frame.completion_hours(frame.completed)
+    stale = (~frame.completed & ~frame.has_due & frame.has_created
+             & (today - frame.created_local(tz).day_ordinal >= 7))
+
+    peak(day_scores), peak(hour_scores), peak(bucket_scores)
+    return (
+        {WEEKDAY_NAMES[i]: float(s) for i, s in enumerate(day_scores) if s},
+        {i: float(s) for i, s in enumerate(hour_scores) if s},
+        {TIME_BUCKETS[i]: float(s) for i, s in enumerate(bucket_scores) if s},
+        round(float(durations.mean()), 2) if durations.size else None,
+        int(frame.overdue(today).sum() + stale.sum()),
+    )
+
+
+def bench_size(n: int):
+    tasks = _tasks(n)
+
+    start = time.perf_counter()
+    loop_result = _loop_metrics(tasks, TIMEZONE)
+    loop_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    frame = TaskFrame(tasks)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    frame_result = _frame_metrics(frame, TIMEZONE)
+    compute_ms = (time.perf_counter() - start) * 1000
+
+    # avg_completion_hours may differ in the last float bit from summation order
+    match = loop_result[:3] == frame_result[:3] and loop_result[4] == frame_result[4] and \
+        abs((loop_result[3] or 0) - (frame_result[3] or 0)) <= 0.01
+    print(f"   {n:>9,} tasks | loop {loop_ms:9.1f}ms | frame build {build_ms:8.1f}ms "
+          f"+ metrics {compute_ms:7.1f}ms | {loop_ms / (build_ms + compute_ms):5.1f}x | match {match}")
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or DEFAULT_SIZES
+
+    print(f"\n{'='*60}")
+    print(f"⏱️  ANALYTICS ENGINE (loop vs TaskFrame)")
+    print(f"{'='*60}")
+    for n in sizes:
+        bench_size(n)
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# benchmarks/bench_task_model.py
+"""
+Task model benchmark: ISO-string dicts vs compact Task objects.
+
+Builds N synthetic task documents (datetime timestamps, as Firestore returns
+them) and compares the two ways of feeding them to analysis code:
+
+    dicts  — the old get_all_tasks() shape: timestamps formatted to ISO strings,
+             then parsed straight back (_parse_utc_iso) for every task
+    Task   — Task.from_document(): epoch seconds + due-date ordinals, no re-parse
+
+Each path builds the list once and runs the same analysis pass (local-hour
+histogram, completion durations, overdue count). Reports CPU time and the
+memory held by the task list (tracemalloc). No Firestore involved.
+
+Usage:
+    python benchmarks/bench_task_model.py            # 50,000 tasks
+    python benchmarks/bench_task_model.py 200000     # custom size
+"""
+
+import sys
+import os
+import gc
+import time
+import random
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+# Add parent directory (backend/) to path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from utils.task_model import Task
+
+DEFAULT_TASKS = 50_000
+ROUNDS = 5
+TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+
+def _documents(n: int):
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    docs = []
+    for i in range(n):
+        created = now - timedelta(days=rng.uniform(0, 90))
+        completed = rng.random() < 0.6
+        completed_at = min(created + timedelta(hours=rng.uniform(0.5, 24 * 7)), now) if completed else None
+        docs.append((f"task{i:07d}", {
+            'name': f"task {i}",
+            'folder': rng.choice(["work", "personal", "school"]),
+            'completed': completed,
+            'is_high_priority': rng.random() < 0.1,
+            'due_date': (created + timedelta(days=rng.randint(0, 14))).strftime("%Y-%m-%d"),
+            'created_at': created,
+            'completed_at': completed_at,
+        }))
+    return docs
+
+
+# ----- old path: ISO dicts, parsed back per task -----
+
+def _iso(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat()
+    return value.strip() or None
+
+
+def _build_dicts(docs):
+    return [{
+        'id': task_id,
+        'name': data.get('name'),
+        'folder': data.get('folder'),
+        'completed': data.get('completed', False),
+        'recurrence': data.get('recurrence'),
+        'time': data.get('time'),
+        'duration': data.get('duration'),
+        'is_high_priority': data.get('is_high_priority', False),
+        'created_at': _iso(data.get('created_at')),
+        'completed_at': _iso(data.get('completed_at')),
+        'due_date': _iso(data.get('due_date')),
+    } for task_id, data in docs]
+
+
+def _parse_utc_iso(dt_str):
+    if not dt_str:
+        return None
+    dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
+    return dt.astimezone(timezone.utc)
+
+
+def _analyse_dicts(tasks):
+    today = datetime.now(TIMEZONE).date()
+    hours, durations, overdue = Counter(), [], 0
+    for t in tasks:
+        completed_at = _parse_utc_iso(t.get("completed_at"))
+        created_at = _parse_utc_iso(t.get("created_at"))
+        if t.get("completed"):
+            if completed_at:
+                hours[completed_at.astimezone(TIMEZONE).hour] += 1
+                if created_at:
+                    durations.append((completed_at - created_at).total_seconds() / 3600)
+        elif t.get("due_date"):
+            if datetime.strptime(t["due_date"].strip(), "%Y-%m-%d").date() < today:
+                overdue += 1
+    return hours, len(durations), overdue
+
+
+# ----- new path: Task objects -----
+
+def _build_tasks(docs):
+    return [Task.from_document(task_id, data) for task_id, data in docs]
+
+
+def _analyse_tasks(tasks):
+    today = datetime.now(TIMEZONE).date().toordinal()
+    hours, durations, overdue = Counter(), [], 0
+    for t in tasks:
+        if t.completed:
+            if t.completed_ts is not None:
+                hours[datetime.fromtimestamp(t.completed_ts, TIMEZONE).hour] += 1
+                if t.created_ts is not None:
+                    durations.append((t.completed_ts - t.created_ts) / 3600)
+        elif t.due_ordinal is not None and t.due_ordinal < today:
+            overdue += 1
+    return hours, len(durations), overdue
+
+
+def _measure(label, docs, build, analyse):
+    gc.collect()
+    tracemalloc.start()
+    tasks = build(docs)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    build_ms, analyse_ms = [], []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        tasks = build(docs)
+        build_ms.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        result = analyse(tasks)
+        analyse_ms.append((time.perf_counter() - start) * 1000)
+
+    build_best, analyse_best = min(build_ms), min(analyse_ms)
+    print(f"   {label:<7} build {build_best:8.1f}ms | analyse {analyse_best:8.1f}ms | "
+          f"total {build_best + analyse_best:8.1f}ms | held {held / 2**20:7.1f} MiB")
+    return build_best + analyse_best, held, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TASKS
+    docs = _documents(n)
+
+    print(f"\n{'='*60}")
+    print(f"⏱️  TASK MODEL ({n:,} tasks, best of {ROUNDS})")
+    print(f"{'='*60}")
+    old_ms, old_mem, old_result = _measure("dicts", docs, _build_dicts, _analyse_dicts)
+    new_ms, new_mem, new_result = _measure("Task", docs, _build_tasks, _analyse_tasks)
+    print(f"   CPU saved: {(1 - new_ms / old_ms) * 100:.0f}% | memory saved: {(1 - new_mem / old_mem) * 100:.0f}%")
+    print(f"   Results match: {old_result == new_result}")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from utils.firebase_client import FirebaseClient
+from utils.firebase_client import get_firebase_client
 
 USER_ID = "gXLno2jNqIP0hTkV7g6zFQCutf83"
 
@@ -17,7 +17,7 @@ print(f"🧹 CLEANING UP TEST TASKS")
 print(f"{'='*80}\n")
 
 # Initialize Firebase client
-client = FirebaseClient()
+client = get_firebase_client()
 
 # Get all tasks
 tasks_ref = client._get_user_tasks_ref(USER_ID)
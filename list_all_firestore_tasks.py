@@ -9,7 +9,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from utils.firebase_client import FirebaseClient
+from utils.firebase_client import get_firebase_client
 
 # Your user ID
 USER_ID = "gXLno2jNqIP0hTkV7g6zFQCutf83"
@@ -22,7 +22,7 @@ print(f"📍 Firestore path: users/{USER_ID}/tasks/")
 print(f"{'='*80}\n")
 
 # Initialize Firebase client
-client = FirebaseClient()
+client = get_firebase_client()
 
 # Get all tasks
 tasks_ref = client._get_user_tasks_ref(USER_ID)
@@ -0,0 +1,48 @@
+# tests/conftest.py
+"""
+Shared fixtures: every test runs against a fresh in-memory Firestore
+(utils/memory_firestore.py) behind the same ResilientFirestore wrapper the
+app uses, so no Firebase project or credentials are needed.
+
+    python -m pytest -q
+"""
+
+import os
+import sys
+import uuid
+
+import pytest
+
+# Add parent directory (backend/) to path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+os.environ.setdefault("VOICELOG_STORAGE", "memory")
+
+from utils.memory_firestore import MemoryFirestore
+from utils.firestore_resilience import ResilientFirestore
+from utils.firebase_client import get_firebase_client, use_firestore_db
+
+
+@pytest.fixture
+def client():
+    """The shared FirebaseClient, pointed at an empty in-memory store"""
+    use_firestore_db(ResilientFirestore(MemoryFirestore()))
+    return get_firebase_client()
+
+
+@pytest.fixture
+def user_id(client):
+    """A new user with Home and Work folders (unique, so per-user caches never carry over)"""
+    uid = f"test_{uuid.uuid4().hex[:12]}"
+    client.create_folder("Home", "🏠", uid)
+    client.create_folder("Work", "💼", uid)
+    return uid
+
+
+def add_task(client, user_id: str, name: str, folder: str = "Home", due_date: str = "") -> str:
+    """Create a task through the client and return its document id"""
+    result = client.create_task(name, folder, user_id, due_date=due_date)
+    task = client.get_task_by_name(name, user_id)
+    assert task is not None, result
+    return task["id"]
@@ -0,0 +1,69 @@
+# tests/test_intent_resolver.py
+"""
+IntentResolver.resolve_many: several task references resolved against one
+snapshot of the user's tasks, each task claimed at most once.
+"""
+
+import pytest
+
+from utils.intent_resolver import IntentResolver
+from conftest import add_task
+
+
+@pytest.fixture
+def resolver():
+    """A resolver with no cached indexes from other tests"""
+    return IntentResolver()
+
+
+@pytest.fixture
+def tasks(client, user_id):
+    return {name: add_task(client, user_id, name)
+            for name in ["Laundry", "Wash dishes", "Vacuuming the living room", "Pay phone bill",
+                         "Dishes in dishwasher"]}
+
+
+def matched_ids(results):
+    return [result['match']['id'] if result['match'] else None for result in results]
+
+
+def test_resolves_each_description_in_order(resolver, user_id, tasks):
+    results = resolver.resolve_many(["laundry", "phone bill", "vacuuming"], user_id=user_id)
+
+    assert [result['description'] for result in results] == ["laundry", "phone bill", "vacuuming"]
+    assert matched_ids(results) == [tasks["Laundry"], tasks["Pay phone bill"], tasks["Vacuuming the living room"]]
+
+
+def test_same_task_is_not_claimed_twice(resolver, user_id, tasks):
+    results = resolver.resolve_many(["dishes", "dishes"], user_id=user_id)
+
+    first, second = matched_ids(results)
+    assert {first, second} == {tasks["Wash dishes"], tasks["Dishes in dishwasher"]}
+
+
+def test_unknown_description_has_no_match(resolver, user_id, tasks):
+    results = resolver.resolve_many(["laundry", "zzz qqq"], user_id=user_id)
+
+    assert matched_ids(results) == [tasks["Laundry"], None]
+
+
+def test_only_incomplete_skips_completed_tasks(resolver, client, user_id, tasks):
+    client.mark_task_complete_by_id(tasks["Laundry"], user_id)
+
+    assert matched_ids(resolver.resolve_many(["laundry"], only_incomplete=True, user_id=user_id)) == [None]
+    assert matched_ids(resolver.resolve_many(["laundry"], user_id=user_id)) == [tasks["Laundry"]]
+
+
+def test_index_follows_writes(resolver, client, user_id, tasks):
+    assert matched_ids(resolver.resolve_many(["laundry"], user_id=user_id)) == [tasks["Laundry"]]
+
+    client.delete_task_by_id(tasks["Laundry"], user_id)
+    groceries = add_task(client, user_id, "Buy groceries")
+
+    results = resolver.resolve_many(["laundry", "groceries"], user_id=user_id)
+    assert matched_ids(results) == [None, groceries]
+
+
+def test_user_id_is_required(resolver):
+    with pytest.raises(ValueError):
+        resolver.resolve_many(["laundry"])
@@ -0,0 +1,136 @@
+# tests/test_task_counters.py
+"""
+Stats and analytics rollup documents are kept up to date with Increments
+staged in each task write's batch. After any sequence of writes they must
+equal a fresh scan of the tasks.
+"""
+
+import pytest
+
+from utils.task_repository import TASK_STATS_SCHEMA, _public_stats
+from utils.task_rollups import public_rollups
+from conftest import add_task
+
+TZ = "UTC"  # no profile timezone set, so writers bucket rollups in UTC
+
+
+@pytest.fixture
+def tasks(client, user_id):
+    """Five tasks, with the counters documents rebuilt so later reads use the increments"""
+    ids = {name: add_task(client, user_id, name, folder, due_date)
+           for name, folder, due_date in [
+               ("Laundry", "Home", ""),
+               ("Dishes", "Home", "2026-01-10"),
+               ("Urgent report", "Work", "2026-01-05"),
+               ("Call plumber", "Home", ""),
+               ("Expense sheet", "Work", "2030-01-01"),
+           ]}
+    client.tasks.rebuild_stats(user_id)
+    client.tasks.rebuild_rollups(user_id, TZ)
+    return ids
+
+
+def stored_stats(client, user_id):
+    return _public_stats(client.tasks._stats_ref(user_id).get().to_dict())
+
+
+def stored_rollups(client, user_id):
+    return public_rollups(client.tasks._rollups_ref(user_id).get().to_dict(), TZ)
+
+
+def assert_counters_match_tasks(client, user_id):
+    stats = stored_stats(client, user_id)
+    assert stats == client.tasks.rebuild_stats(user_id)
+
+    rollups = stored_rollups(client, user_id)
+    expected = public_rollups(client.tasks._scan_rollups(user_id, TZ), TZ)
+    # Writers price completed_at (a server timestamp) with their own clock: equal to within clock drift
+    assert rollups.pop('duration_sum_hours') == pytest.approx(expected.pop('duration_sum_hours'), abs=1e-3)
+    assert rollups == expected
+
+
+def test_counters_after_create(client, user_id, tasks):
+    stats = stored_stats(client, user_id)
+    assert stats['total'] == 5
+    assert stats['completed'] == 0
+    assert stats['high_priority_pending'] == 1
+    assert stats['folders'] == {'home': {'total': 3, 'completed': 0}, 'work': {'total': 2, 'completed': 0}}
+    assert_counters_match_tasks(client, user_id)
+
+
+def test_counters_after_complete_and_uncomplete(client, user_id, tasks):
+    client.mark_task_complete_by_id(tasks["Laundry"], user_id)
+    client.mark_task_complete_by_id(tasks["Urgent report"], user_id)
+
+    stats = stored_stats(client, user_id)
+    assert stats['completed'] == 2
+    assert stats['high_priority_pending'] == 0
+    assert stats['folders']['work'] == {'total': 2, 'completed': 1}
+    rollups = stored_rollups(client, user_id)
+    assert rollups['completed'] == 2
+    assert rollups['high_priority_completed'] == 1
+    assert sum(rollups['completed_by_day'].values()) == 2
+    assert_counters_match_tasks(client, user_id)
+
+    client.mark_task_incomplete_by_id(tasks["Urgent report"], user_id)
+
+    stats = stored_stats(client, user_id)
+    assert stats['completed'] == 1
+    assert stats['high_priority_pending'] == 1
+    assert stored_rollups(client, user_id)['high_priority_completed'] == 0
+    assert_counters_match_tasks(client, user_id)
+
+
+def test_counters_after_move(client, user_id, tasks):
+    client.mark_task_complete_by_id(tasks["Dishes"], user_id)
+    client.move_task_by_id(tasks["Dishes"], "Work", user_id)
+
+    stats = stored_stats(client, user_id)
+    assert stats['folders'] == {'home': {'total': 2, 'completed': 0}, 'work': {'total': 3, 'completed': 1}}
+    rollups = stored_rollups(client, user_id)
+    assert 'home' not in rollups['folder_completed_by_day']
+    assert sum(rollups['folder_completed_by_day']['work'].values()) == 1
+    assert_counters_match_tasks(client, user_id)
+
+
+def test_counters_after_delete(client, user_id, tasks):
+    client.mark_task_complete_by_id(tasks["Call plumber"], user_id)
+    client.delete_task_by_id(tasks["Call plumber"], user_id)
+    client.delete_task_by_id(tasks["Urgent report"], user_id)
+
+    stats = stored_stats(client, user_id)
+    assert stats['total'] == 3
+    assert stats['completed'] == 0
+    assert stats['high_priority_pending'] == 0
+    assert stats['folders'] == {'home': {'total': 2, 'completed': 0}, 'work': {'total': 1, 'completed': 0}}
+    assert stored_rollups(client, user_id)['tasks'] == 3
+    assert_counters_match_tasks(client, user_id)
+
+
+def test_counters_after_bulk_writes(client, user_id, tasks):
+    client.complete_tasks([tasks["Laundry"], tasks["Dishes"]], user_id)
+    client.move_tasks([tasks["Laundry"], tasks["Call plumber"]], "Work", user_id)
+    client.delete_tasks([tasks["Expense sheet"]], user_id)
+
+    stats = stored_stats(client, user_id)
+    assert stats['total'] == 4
+    assert stats['completed'] == 2
+    assert stats['folders'] == {'home': {'total': 1, 'completed': 1}, 'work': {'total': 3, 'completed': 1}}
+    assert_counters_match_tasks(client, user_id)
+
+
+def test_rebuild_rescans_when_a_write_lands_mid_scan(client, user_id, tasks):
+    repo = client.tasks
+    scans = []
+
+    def scan():
+        doc = {'total': len(list(repo._tasks_ref(user_id).stream())), 'schema': TASK_STATS_SCHEMA}
+        if not scans:
+            add_task(client, user_id, "Late arrival")  # commits its Increment after the scan read the tasks
+        scans.append(doc['total'])
+        return doc
+
+    repo._replace_if_unchanged(repo._stats_ref(user_id), scan)
+
+    assert scans == [5, 6]
+    assert stored_stats(client, user_id)['total'] == 6
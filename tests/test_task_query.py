@@ -0,0 +1,106 @@
+# tests/test_task_query.py
+"""
+TaskQuery paging: every match exactly once across pages, in store order,
+with cursors that resume where the previous page stopped.
+"""
+
+from datetime import date, timezone
+
+import pytest
+
+from utils.task_query import TaskQuery
+from conftest import add_task
+
+TODAY = date(2026, 3, 15).toordinal()
+
+# Distinct enough that create_task's duplicate check lets every one through
+CHORES = ["Laundry", "Dishes", "Vacuuming", "Groceries", "Recycling", "Water plants", "Pay rent"]
+
+
+def all_pages(client, user_id, query, limit, **kwargs):
+    """Every page of a query → (list of pages of task names, cursors handed out)"""
+    pages, cursors, cursor = [], [], None
+    while True:
+        tasks, cursor = client.query_tasks(user_id, query, limit=limit, cursor=cursor, **kwargs)
+        pages.append([task.name for task in tasks])
+        if cursor is None:
+            return pages, cursors
+        cursors.append(cursor)
+
+
+def test_pages_cover_every_task_once(client, user_id):
+    names = CHORES
+    for name in names:
+        add_task(client, user_id, name)
+
+    pages, cursors = all_pages(client, user_id, TaskQuery(today=TODAY), limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sorted(name for page in pages for name in page) == sorted(names)
+    assert len(cursors) == 2
+
+
+def test_due_range_pages_in_due_date_order(client, user_id):
+    for name, due in [("Dentist", "2026-03-20"), ("Pay rent", "2026-03-02"), ("Renew passport", "2026-04-01"),
+                      ("Car service", "2026-03-11"), ("Call mom", "soon"), ("Read book", "")]:
+        add_task(client, user_id, name, due_date=due)
+
+    query = TaskQuery(due_after="2026-03-01", due_before="2026-03-31", today=TODAY)
+    pages, _ = all_pages(client, user_id, query, limit=2)
+
+    assert pages == [["Pay rent", "Car service"], ["Dentist"]]
+
+
+def test_overdue_only_pages(client, user_id):
+    for name, due in [("File taxes", "2026-03-01"), ("Car service", "2026-03-10"), ("Dentist", "2026-03-14"),
+                      ("Pay rent", "2026-03-15"), ("Renew passport", "2026-03-22")]:
+        add_task(client, user_id, name, due_date=due)
+    done = add_task(client, user_id, "Call mom", due_date="2026-03-05")
+    client.mark_task_complete_by_id(done, user_id)
+
+    pages, _ = all_pages(client, user_id, TaskQuery(overdue_only=True, today=TODAY), limit=2)
+
+    assert pages == [["File taxes", "Car service"], ["Dentist"]]
+
+
+def test_client_side_filter_resumes_after_scan_limit(client, user_id):
+    completed_ids = []
+    for i, name in enumerate(CHORES[:6]):
+        task_id = add_task(client, user_id, name)
+        if i % 2 == 0:
+            client.mark_task_complete_by_id(task_id, user_id)
+            completed_ids.append(task_id)
+
+    hours = {client.tasks.get(user_id, task_id).to_dict()['completed_at'].astimezone(timezone.utc).hour
+             for task_id in completed_ids}
+    if len(hours) != 1:
+        pytest.skip("completions straddled an hour boundary")
+    hour = hours.pop()
+    query = TaskQuery(completed=True, hour=hour, tz=timezone.utc, today=TODAY)
+
+    # max_scan=1: one row examined per call, so pages come back short with a cursor
+    names, cursor = [], None
+    while True:
+        tasks, cursor = query.run(client.tasks, user_id, limit=5, cursor=cursor, max_scan=1)
+        names.extend(task.name for task in tasks)
+        if cursor is None:
+            break
+
+    assert sorted(names) == ["Laundry", "Recycling", "Vacuuming"]
+
+
+def test_cursor_from_another_query_is_rejected(client, user_id):
+    for i, name in enumerate(CHORES[:3]):
+        add_task(client, user_id, name, due_date=f"2026-03-0{i + 1}")
+    _, cursor = client.query_tasks(user_id, TaskQuery(today=TODAY), limit=1)
+
+    with pytest.raises(ValueError):
+        client.query_tasks(user_id, TaskQuery(due_after="2026-03-01", today=TODAY), limit=1, cursor=cursor)
+
+
+def test_contradictory_filters_return_nothing(client, user_id):
+    add_task(client, user_id, "Late", due_date="2026-03-01")
+
+    assert client.query_tasks(user_id, TaskQuery(completed=True, overdue_only=True, today=TODAY)) == ([], None)
+    assert client.query_tasks(
+        user_id, TaskQuery(due_after="2026-04-01", due_before="2026-03-01", today=TODAY)) == ([], None)
@@ -0,0 +1,97 @@
+# tests/test_task_sync.py
+"""
+Delta sync (/tasks/changes): cursors, tombstones and the full-resync
+fallback for cursors older than tombstone retention.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utils.task_repository import TOMBSTONE_RETENTION_DAYS, datetime_to_cursor
+from conftest import add_task
+
+
+def ids(snapshots):
+    return sorted(snapshot.id for snapshot in snapshots)
+
+
+def test_initial_sync_returns_everything(client, user_id):
+    laundry = add_task(client, user_id, "Laundry")
+    report = add_task(client, user_id, "Write report", "Work")
+
+    changes = client.get_task_changes(user_id)
+
+    assert ids(changes['created']) == sorted([laundry, report])
+    assert changes['updated'] == []
+    assert changes['deleted'] == []
+    assert changes['full_resync'] is False
+    assert changes['next_cursor']
+
+
+def test_delta_reports_creates_updates_and_deletes(client, user_id):
+    laundry = add_task(client, user_id, "Laundry")
+    dishes = add_task(client, user_id, "Dishes")
+    cursor = client.get_task_changes(user_id)['next_cursor']
+
+    groceries = add_task(client, user_id, "Buy groceries")
+    client.mark_task_complete_by_id(laundry, user_id)
+    client.delete_task_by_id(dishes, user_id)
+
+    changes = client.get_task_changes(user_id, since=cursor)
+
+    assert ids(changes['created']) == [groceries]
+    assert ids(changes['updated']) == [laundry]
+    assert changes['deleted'] == [dishes]
+    assert changes['full_resync'] is False
+
+
+def test_cursor_without_changes_returns_nothing(client, user_id):
+    add_task(client, user_id, "Laundry")
+    first = client.get_task_changes(user_id)
+
+    again = client.get_task_changes(user_id, since=first['next_cursor'])
+    assert again['created'] == again['updated'] == again['deleted'] == []
+
+    # The next cursor still sees later writes
+    report = add_task(client, user_id, "Write report", "Work")
+    later = client.get_task_changes(user_id, since=again['next_cursor'])
+    assert ids(later['created']) == [report]
+
+
+def test_idle_account_cursor_stays_inside_retention(client, user_id):
+    add_task(client, user_id, "Laundry")
+    cursor = client.get_task_changes(user_id)['next_cursor']
+
+    issued = client.tasks.cursor_time(cursor)
+    assert issued > datetime.now(timezone.utc) - timedelta(days=1)
+
+
+def test_cursor_older_than_retention_gets_full_resync(client, user_id):
+    laundry = add_task(client, user_id, "Laundry")
+    dishes = add_task(client, user_id, "Dishes")
+    client.delete_task_by_id(dishes, user_id)
+
+    stale = datetime_to_cursor(datetime.now(timezone.utc) - timedelta(days=TOMBSTONE_RETENTION_DAYS + 1))
+    changes = client.get_task_changes(user_id, since=stale)
+
+    assert changes['full_resync'] is True
+    assert ids(changes['created']) == [laundry]
+    assert changes['deleted'] == []
+
+
+def test_invalid_cursor_is_rejected(client, user_id):
+    with pytest.raises(ValueError):
+        client.get_task_changes(user_id, since="not-a-cursor")
+
+
+def test_prune_tombstones_drops_only_old_ones(client, user_id):
+    laundry = add_task(client, user_id, "Laundry")
+    cursor = client.get_task_changes(user_id)['next_cursor']
+    client.delete_task_by_id(laundry, user_id)
+
+    assert client.tasks.prune_tombstones(user_id, datetime.now(timezone.utc) - timedelta(days=1)) == 0
+    assert client.get_task_changes(user_id, since=cursor)['deleted'] == [laundry]
+
+    assert client.tasks.prune_tombstones(user_id, datetime.now(timezone.utc) + timedelta(seconds=1)) == 1
+    assert client.get_task_changes(user_id, since=cursor)['deleted'] == []
@@ -1,9 +1,15 @@
 from langchain_core.tools import tool
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import date, datetime, timedelta
+import numpy as np
 import pytz
 import inspect
 
+from utils.task_model import date_to_ordinal
+from utils.task_frame import WEEKDAY_NAMES, TIME_BUCKETS, HOUR_TO_BUCKET, peak
+from utils.task_snapshot import get_task_snapshot, request_now
+from utils.task_query import TaskQuery
+from utils.task_windows import compare_windows, streaks, folder_trends
+
 try:
     from zoneinfo import ZoneInfo
 except ImportError:
@@ -36,182 +42,88 @@ def _get_tz(tz_name: str):
         return pytz.timezone(tz_name)
 
 
-def _parse_utc_iso(dt_str: str):
-    if not dt_str:
-        return None
-    try:
-        dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=pytz.UTC)
-        return dt.astimezone(pytz.UTC)
-    except Exception:
-        return None
-
-
 def _to_local(dt_utc: datetime, user_timezone: str):
     return dt_utc.astimezone(_get_tz(user_timezone))
 
 
+def _present(labels, values, counts) -> dict:
+    """{label: value} for the histogram bins that have data (for debug prints)"""
+    return {label: float(v) for label, v, c in zip(labels, values, counts) if c}
+
+
 # =========================================================
 # PRODUCTIVITY PATTERNS
 # =========================================================
 
-@tool
-def get_productivity_patterns(user_timezone: str) -> dict:
-    """
-    Return structured productivity facts.
-    NO prose. NO formatting.
-    """
-    from utils.firebase_client import FirebaseClient
+def productivity_patterns(user_id: str, user_timezone: str) -> dict:
+    """Structured productivity facts for one user (agent tool and /analytics endpoints)"""
+    from utils.firebase_client import get_firebase_client
     
-    user_id = get_user_id_from_context()
-    client = FirebaseClient()
+    client = get_firebase_client()
 
-    tasks = client.get_all_tasks(user_id)
-    completed = [t for t in tasks if t.get("completed")]
-    incomplete = [t for t in tasks if not t.get("completed")]
+    # Incrementally maintained rollups: one document read, no task scan
+    rollups = client.get_task_rollups(user_id, user_timezone)
 
-    if not completed:
+    if not rollups["completed"]:
         return {"has_data": False}
 
-    # Weighted scoring: high priority = 3, has deadline = 2, regular = 1
-    def _task_weight(t):
-        if t.get("is_high_priority"):
-            return 3
-        if t.get("due_date") and str(t.get("due_date", "")).strip():
-            return 2
-        return 1
-
-    # Time-of-day bucketing
-    def _time_bucket(hour):
-        if 5 <= hour < 12:
-            return "morning"
-        elif 12 <= hour < 17:
-            return "afternoon"
-        elif 17 <= hour < 21:
-            return "evening"
-        else:
-            return "night"
-
-    hour_scores = defaultdict(float)
-    day_scores = defaultdict(float)
-    hour_counts = defaultdict(int)
-    day_counts = defaultdict(int)
-    bucket_scores = defaultdict(float)
-
-    for task in completed:
-        w = _task_weight(task)
-
-        # --- Day: prefer stored completed_day (safety net), fall back to timestamp ---
-        stored_day = task.get("completed_day")
-        if stored_day and isinstance(stored_day, str) and stored_day.strip():
-            day = stored_day.strip()
-        else:
-            dt_utc = _parse_utc_iso(task.get("completed_at"))
-            if not dt_utc:
-                continue
-            day = _to_local(dt_utc, user_timezone).strftime("%A")
-
-        day_scores[day] += w
-        day_counts[day] += 1
-
-        # --- Hour: derive from completed_at timestamp (need local conversion) ---
-        dt_utc = _parse_utc_iso(task.get("completed_at"))
-        if dt_utc:
-            local_hour = _to_local(dt_utc, user_timezone).hour
-            hour_scores[local_hour] += w
-            hour_counts[local_hour] += 1
-            bucket_scores[_time_bucket(local_hour)] += w
-
-    print("DAY SCORES (weighted):", dict(day_scores))
-    print("DAY COUNTS (raw):", dict(day_counts))
-    print("HOUR SCORES (weighted):", dict(hour_scores))
-    print("BUCKET SCORES:", dict(bucket_scores))
-
-    if not day_scores:
+    tz = _get_tz(user_timezone)
+
+    # Completed tasks with a timestamp, weighted: high priority = 3, has deadline = 2, regular = 1
+    day_scores = np.array(rollups["weekday_scores"], dtype=np.float64)
+    day_counts = np.array(rollups["weekday_counts"], dtype=np.int64)
+    hour_scores = np.array(rollups["hour_scores"], dtype=np.float64)
+    hour_counts = np.array(rollups["hour_counts"], dtype=np.int64)
+    bucket_scores = np.bincount(HOUR_TO_BUCKET, weights=hour_scores, minlength=len(TIME_BUCKETS))
+
+    print("DAY SCORES (weighted):", _present(WEEKDAY_NAMES, day_scores, day_counts))
+    print("DAY COUNTS (raw):", _present(WEEKDAY_NAMES, day_counts, day_counts))
+    print("HOUR SCORES (weighted):", _present(range(24), hour_scores, hour_counts))
+    print("BUCKET SCORES:", _present(TIME_BUCKETS, bucket_scores, bucket_scores))
+
+    if not hour_counts.any():
         return {
             "has_data": False,
-            "reason": "Completed tasks exist but none have valid timestamps or stored day.",
+            "reason": "Completed tasks exist but none have valid timestamps.",
         }
 
     # --- Detect ties / insufficient data ---
-    # Peak day: only report if the top day clearly leads (score > second place)
-    sorted_days = sorted(day_scores.items(), key=lambda x: x[1], reverse=True)
-    top_day, top_day_score = sorted_days[0]
-    second_day_score = sorted_days[1][1] if len(sorted_days) > 1 else 0
-
-    if top_day_score > second_day_score:
-        peak_day = top_day
-        peak_day_count = day_counts[top_day]
-    else:
-        # Tie — not enough data to determine a clear peak
-        peak_day = None
-        peak_day_count = None
-
-    # Peak hour: same tie detection
-    peak_hour_24 = None
-    peak_hour_count = None
-    peak_bucket = None
-    if hour_scores:
-        sorted_hours = sorted(hour_scores.items(), key=lambda x: x[1], reverse=True)
-        top_hour, top_hour_score = sorted_hours[0]
-        second_hour_score = sorted_hours[1][1] if len(sorted_hours) > 1 else 0
-
-        if top_hour_score > second_hour_score:
-            peak_hour_24 = top_hour
-            peak_hour_count = hour_counts[top_hour]
-
-    if bucket_scores:
-        sorted_buckets = sorted(bucket_scores.items(), key=lambda x: x[1], reverse=True)
-        top_bucket, top_bucket_score = sorted_buckets[0]
-        second_bucket_score = sorted_buckets[1][1] if len(sorted_buckets) > 1 else 0
-
-        if top_bucket_score > second_bucket_score:
-            peak_bucket = top_bucket
-
-    durations = []
-    for task in completed:
-        created = _parse_utc_iso(task.get("created_at"))
-        completed_at = _parse_utc_iso(task.get("completed_at"))
-        if created and completed_at:
-            durations.append((completed_at - created).total_seconds() / 3600)
+    # Peaks are only reported when the top score clearly leads (score > second place)
+    top_day = peak(day_scores)
+    peak_day = WEEKDAY_NAMES[top_day] if top_day is not None else None
+    peak_day_count = int(day_counts[top_day]) if top_day is not None else None
+
+    peak_hour_24 = peak(hour_scores)
+    peak_hour_count = int(hour_counts[peak_hour_24]) if peak_hour_24 is not None else None
+
+    top_bucket = peak(bucket_scores)
+    peak_bucket = TIME_BUCKETS[top_bucket] if top_bucket is not None else None
 
     avg_completion_hours = (
-        round(sum(durations) / len(durations), 2) if durations else None
+        round(rollups["duration_sum_hours"] / rollups["duration_count"], 2)
+        if rollups["duration_count"] else None
     )
 
-    high_priority = [t for t in tasks if t.get("is_high_priority")]
-    hp_completed = [t for t in high_priority if t.get("completed")]
+    high_priority = rollups["high_priority"]
+    hp_completed = rollups["high_priority_completed"]
 
     hp_completion_rate = (
-        round((len(hp_completed) / len(high_priority)) * 100, 1)
+        round((hp_completed / high_priority) * 100, 1)
         if high_priority else None
     )
 
-    now_local = _to_local(datetime.now(pytz.UTC), user_timezone)
-    overdue_count = 0
-
-    for task in incomplete:
-        due_date_str = task.get("due_date", "")
-        if due_date_str and due_date_str.strip():
-            try:
-                due = datetime.strptime(due_date_str.strip(), "%Y-%m-%d").date()
-                if due < now_local.date():
-                    overdue_count += 1
-            except ValueError:
-                pass
-        else:
-            created_utc = _parse_utc_iso(task.get("created_at"))
-            if not created_utc:
-                continue
-            created_local = _to_local(created_utc, user_timezone)
-            age_days = (now_local.date() - created_local.date()).days
-            if age_days >= 7:
-                overdue_count += 1
+    # Overdue: past its due date, or no due date and untouched for 7+ days
+    today = request_now(tz).date().toordinal()
+    today_iso = date.fromordinal(today).isoformat()
+    stale_before = date.fromordinal(today - 6).isoformat()
+    overdue_count = (
+        sum(n for due, n in rollups["pending_due"].items() if due < today_iso)
+        + sum(n for day, n in rollups["pending_undated"].items() if day < stale_before)
+    )
 
     return {
         "has_data": True,
-        "total_completed": len(completed),
+        "total_completed": rollups["completed"],
         "peak_hour_24": peak_hour_24,
         "peak_hour_count": peak_hour_count,
         "peak_time_of_day": peak_bucket,
@@ -225,159 +137,215 @@ def get_productivity_patterns(user_timezone: str) -> dict:
     }
 
 
-# =========================================================
-# PROCRASTINATION / AVOIDANCE
-# =========================================================
-
 @tool
-def get_procrastination_report(user_timezone: str) -> dict:
+def get_productivity_patterns(user_timezone: str) -> dict:
     """
-    Return structured data about delayed / avoided tasks.
+    Return structured productivity facts.
+    NO prose. NO formatting.
     """
-    from utils.firebase_client import FirebaseClient
-    
-    user_id = get_user_id_from_context()
-    client = FirebaseClient()
+    return productivity_patterns(get_user_id_from_context(), user_timezone)
 
-    tasks = client.get_all_tasks(user_id)
-    incomplete = [t for t in tasks if not t.get("completed")]
 
-    if not incomplete:
+# =========================================================
+# PROCRASTINATION / AVOIDANCE
+# =========================================================
+
+def procrastination_report(user_id: str, user_timezone: str) -> dict:
+    """Structured data about a user's delayed / avoided tasks (agent tool and /analytics endpoints)"""
+    # Shared with the other tools when called inside an analysis run
+    snapshot = get_task_snapshot(user_id, user_timezone)
+    frame = snapshot.frame
+    incomplete = snapshot.pending
+
+    if not incomplete.any():
         return {"has_data": False}
 
-    now_local = _to_local(datetime.now(pytz.UTC), user_timezone)
-    analyzed = []
-
-    today = now_local.date()
-    overdue_count = 0
-
-    for task in incomplete:
-        created_utc = _parse_utc_iso(task.get("created_at"))
-        if not created_utc:
-            continue
-
-        created_local = _to_local(created_utc, user_timezone)
-        age_days = (now_local.date() - created_local.date()).days
-
-        # Check actual due_date for overdue status
-        due_date_str = task.get("due_date", "")
-        is_overdue = False
-        days_overdue = None
-        if due_date_str and due_date_str.strip():
-            try:
-                due = datetime.strptime(due_date_str.strip(), "%Y-%m-%d").date()
-                if due < today:
-                    is_overdue = True
-                    days_overdue = (today - due).days
-            except ValueError:
-                pass
-
-        if is_overdue:
-            overdue_count += 1
-
-        analyzed.append({
-            "name": task.get("name"),
-            "folder": task.get("folder"),
-            "age_days": age_days,
-            "is_high_priority": task.get("is_high_priority", False),
-            "due_date": due_date_str or None,
-            "is_overdue": is_overdue,
-            "days_overdue": days_overdue,
+    analyzed = incomplete & frame.has_created
+    age_days = snapshot.age_days
+
+    # Check actual due_date for overdue status
+    overdue = snapshot.overdue & analyzed
+    days_overdue = snapshot.days_overdue
+
+    # Sort: overdue first, then most days overdue, then oldest
+    order = np.lexsort((-age_days[analyzed], -days_overdue[analyzed], ~overdue[analyzed]))
+
+    top = []
+    for i in frame.select(analyzed, order, limit=10):  # top 10 only
+        task = frame.tasks[i]
+        top.append({
+            "name": task.name,
+            "folder": task.folder,
+            "age_days": int(age_days[i]),
+            "is_high_priority": task.is_high_priority,
+            "due_date": task.due_date,
+            "is_overdue": bool(overdue[i]),
+            "days_overdue": int(days_overdue[i]) if overdue[i] else None,
         })
 
-    # Sort: overdue first, then by age
-    analyzed.sort(key=lambda x: (not x["is_overdue"], -(x["days_overdue"] or 0), -x["age_days"]))
-
     return {
         "has_data": True,
-        "total_pending": len(analyzed),
-        "high_priority_pending": sum(1 for t in analyzed if t["is_high_priority"]),
-        "overdue_count": overdue_count,
-        "oldest_task_days": max((t["age_days"] for t in analyzed), default=None),
-        "tasks": analyzed[:10],  # top 10 only
+        "total_pending": int(analyzed.sum()),
+        "high_priority_pending": int((frame.high_priority & analyzed).sum()),
+        "overdue_count": int(overdue.sum()),
+        "oldest_task_days": int(age_days[analyzed].max()) if analyzed.any() else None,
+        "tasks": top,
         "timezone_used": user_timezone,
     }
 
 
-# =========================================================
-# WEEKLY ACCOUNTABILITY
-# =========================================================
-
 @tool
-def get_weekly_accountability_summary(user_timezone: str) -> dict:
+def get_procrastination_report(user_timezone: str) -> dict:
     """
-    Return structured weekly productivity data.
+    Return structured data about delayed / avoided tasks.
     """
-    from utils.firebase_client import FirebaseClient
-    
-    user_id = get_user_id_from_context()
-    client = FirebaseClient()
+    return procrastination_report(get_user_id_from_context(), user_timezone)
 
-    now_utc = datetime.now(pytz.UTC)
-    now_local = _to_local(now_utc, user_timezone)
-    week_ago_local = now_local - timedelta(days=7)
-    week_ago_utc = week_ago_local.astimezone(pytz.UTC)
 
-    tasks = client.get_all_tasks(user_id)
+# =========================================================
+# WEEKLY ACCOUNTABILITY
+# =========================================================
+
+def weekly_accountability_summary(user_id: str, user_timezone: str) -> dict:
+    """Structured weekly productivity data for one user (agent tool and /analytics endpoints)"""
+    from utils.firebase_client import get_firebase_client
+    
+    client = get_firebase_client()
 
-    created = []
-    completed = []
+    now_local = _to_local(request_now(), user_timezone)
+    # 7 local days ending today — the same window as trend_report(window_days=7)
+    week_start = (now_local.date() - timedelta(days=6)).isoformat()
 
-    for task in tasks:
-        created_dt = _parse_utc_iso(task.get("created_at"))
-        completed_dt = _parse_utc_iso(task.get("completed_at"))
+    # Whole local days from week_start through today, summed from the daily rollups
+    rollups = client.get_task_rollups(user_id, user_timezone)
 
-        if created_dt and created_dt >= week_ago_utc:
-            created.append(task)
+    def in_week(by_day):
+        return sum(n for day, n in by_day.items() if day >= week_start)
 
-        if completed_dt and completed_dt >= week_ago_utc:
-            completed.append(task)
+    n_created = in_week(rollups["created_by_day"])
 
     completion_rate = (
         round(
-            sum(1 for t in created if t.get("completed")) / len(created) * 100,
+            in_week(rollups["created_completed_by_day"]) / n_created * 100,
             1
-        ) if created else None
+        ) if n_created else None
     )
 
     return {
         "has_data": True,
-        "week_start_local": week_ago_local.date().isoformat(),
+        "week_start_local": week_start,
         "week_end_local": now_local.date().isoformat(),
-        "tasks_created": len(created),
-        "tasks_completed": len(completed),
+        "tasks_created": n_created,
+        "tasks_completed": in_week(rollups["completed_by_day"]),
         "completion_rate": completion_rate,
         "timezone_used": user_timezone,
     }
 
 
+@tool
+def get_weekly_accountability_summary(user_timezone: str) -> dict:
+    """
+    Return structured weekly productivity data.
+    """
+    return weekly_accountability_summary(get_user_id_from_context(), user_timezone)
+
+
 # =========================================================
-# FOLDER FOCUS (NO TIME MATH, BUT CONSISTENT SIGNATURE)
+# COMPLETION HEATMAP
 # =========================================================
 
+def completion_heatmap(user_id: str, user_timezone: str) -> dict:
+    """Completed-task counts by local weekday × hour, from the rollups (for the /analytics dashboard)"""
+    from utils.firebase_client import get_firebase_client
+
+    rollups = get_firebase_client().get_task_rollups(user_id, user_timezone)
+    counts = rollups["weekday_hour_counts"]
+
+    return {
+        "has_data": any(any(row) for row in counts),
+        "weekdays": WEEKDAY_NAMES,
+        "hours": list(range(24)),
+        "counts": counts,
+        "max_count": max(max(row) for row in counts),
+        "timezone_used": user_timezone,
+    }
+
+
+# =========================================================
+# TRENDS / STREAKS (ANY WINDOW, FROM DAILY COUNTERS)
+# =========================================================
+
+def trend_report(user_id: str, user_timezone: str, window_days: int = 7,
+                 start_date: str = None, end_date: str = None) -> dict:
+    """Window-over-window trends, streaks and folder trends for one user (agent tool and templates)"""
+    from utils.firebase_client import get_firebase_client
+
+    client = get_firebase_client()
+
+    tz = _get_tz(user_timezone)
+    today = request_now(tz).date().toordinal()
+    end = date_to_ordinal(end_date) or today
+    start = date_to_ordinal(start_date)
+    if start is None:
+        start = end - max(int(window_days), 1) + 1
+    if start > end:
+        start, end = end, start
+
+    # Per-day counters from the rollups: cost is the window length, not the task count
+    rollups = client.get_task_rollups(user_id, user_timezone)
+    if not rollups["tasks"]:
+        return {"has_data": False}
+
+    comparison = compare_windows(rollups, start, end)
+
+    return {
+        "has_data": True,
+        "current": comparison["current"],
+        "previous": comparison["previous"],
+        "change": comparison["change"],
+        "streaks": streaks(rollups, today),
+        "folders": folder_trends(rollups, start, end),
+        "timezone_used": user_timezone,
+    }
+
+
 @tool
-def get_folder_focus_summary(user_timezone: str) -> dict:
+def get_trend_report(
+    user_timezone: str,
+    window_days: int = 7,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> dict:
     """
-    Return structured data about folder usage.
-    Timezone not used, but required for consistency.
+    Return completion trends for a window compared with the window before it,
+    completion streaks, and per-folder trends.
+
+    Args:
+        user_timezone: User's timezone
+        window_days: Window length ending today (7 = this week vs last week, 30 = this month vs last month)
+        start_date: Optional window start (YYYY-MM-DD); overrides window_days
+        end_date: Optional window end (YYYY-MM-DD), defaults to today
     """
-    from utils.firebase_client import FirebaseClient
+    return trend_report(get_user_id_from_context(), user_timezone, window_days, start_date, end_date)
+
+
+# =========================================================
+# FOLDER FOCUS (NO TIME MATH, BUT CONSISTENT SIGNATURE)
+# =========================================================
+
+def folder_focus_summary(user_id: str, user_timezone: str) -> dict:
+    """Structured folder usage for one user (agent tool and templates)"""
+    from utils.firebase_client import get_firebase_client
     
-    user_id = get_user_id_from_context()
-    client = FirebaseClient()
+    client = get_firebase_client()
 
-    tasks = client.get_all_tasks(user_id)
-    if not tasks:
+    # Per-folder counters: one document read instead of loading every task
+    folders = client.get_task_stats(user_id)["folders"]
+    if not folders:
         return {"has_data": False}
 
-    folder_total = defaultdict(int)
-    folder_completed = defaultdict(int)
-
-    for task in tasks:
-        folder = task.get("folder", "uncategorized")
-        folder_total[folder] += 1
-        if task.get("completed"):
-            folder_completed[folder] += 1
+    folder_total = {folder: counts["total"] for folder, counts in folders.items()}
+    folder_completed = {folder: counts["completed"] for folder, counts in folders.items() if counts["completed"]}
 
     most_created = max(folder_total.items(), key=lambda x: x[1])
     most_completed = (
@@ -395,6 +363,69 @@ def get_folder_focus_summary(user_timezone: str) -> dict:
     }
 
 
+@tool
+def get_folder_focus_summary(user_timezone: str) -> dict:
+    """
+    Return structured data about folder usage.
+    Timezone not used, but required for consistency.
+    """
+    return folder_focus_summary(get_user_id_from_context(), user_timezone)
+
+
+def tasks_by_filter(
+    user_id: str,
+    user_timezone: str,
+    completed: bool = None,
+    is_high_priority: bool = None,
+    hour: int = None,
+    due_before: str = None,
+    due_after: str = None,
+    overdue_only: bool = False,
+    limit: int = 15,
+    cursor: str = None,
+) -> dict:
+    """One page of a user's tasks matching the filters (agent tool and templates)"""
+    from utils.firebase_client import get_firebase_client
+
+    client = get_firebase_client()
+    tz = _get_tz(user_timezone)
+
+    # Everything but the local completion hour becomes a store query
+    query = TaskQuery(
+        completed=completed, is_high_priority=is_high_priority, due_before=due_before, due_after=due_after,
+        overdue_only=overdue_only, hour=hour, tz=tz, today=request_now(tz).date().toordinal(),
+    )
+    limit = max(1, min(limit, 50))
+    try:
+        tasks, next_cursor = client.query_tasks(user_id, query, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return {"has_data": False, "error": str(e), "timezone_used": user_timezone}
+
+    # ISO conversion only for the tasks actually returned
+    results = []
+    for task in tasks:
+        data = task.to_dict()
+        results.append({key: data[key] for key in (
+            "name", "folder", "is_high_priority", "completed", "created_at", "completed_at", "due_date",
+        )})
+
+    if next_cursor is None and cursor is None:
+        task_count = len(results)
+    elif not query.client_side:
+        task_count = client.count_tasks(user_id, **query.store_filters)
+    else:
+        task_count = None  # hour filter: unknown until every page is read
+
+    return {
+        "has_data": True,
+        "task_count": task_count,
+        "tasks": results,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
+        "timezone_used": user_timezone
+    }
+
+
 @tool
 def get_tasks_by_filter(
     user_timezone: str,
@@ -404,6 +435,8 @@ def get_tasks_by_filter(
     due_before: str | None = None,
     due_after: str | None = None,
     overdue_only: bool = False,
+    limit: int = 15,
+    cursor: str | None = None,
 ) -> dict:
     """
     Return tasks with timestamps filtered by simple criteria.
@@ -419,95 +452,16 @@ def get_tasks_by_filter(
         due_before: Only tasks with due_date on or before this date (YYYY-MM-DD)
         due_after: Only tasks with due_date on or after this date (YYYY-MM-DD)
         overdue_only: If True, only return incomplete tasks whose due_date is before today
+        limit: Page size (max 50)
+        cursor: next_cursor from a previous call with the same filters, to get the next page
 
     Returns:
         Dict with tasks including name, folder, completed status,
-        created_at, completed_at, and due_date.
+        created_at, completed_at, and due_date; has_more / next_cursor
+        when more tasks match.
     """
-    from utils.firebase_client import FirebaseClient
-
-    user_id = get_user_id_from_context()
-    client = FirebaseClient()
-
-    tasks = client.get_all_tasks(user_id)
-
-    # Pre-parse date filter boundaries
-    now_local = _to_local(datetime.now(pytz.UTC), user_timezone)
-    today = now_local.date()
-
-    def _parse_date(s):
-        try:
-            return datetime.strptime(s.strip(), "%Y-%m-%d").date()
-        except (ValueError, AttributeError):
-            return None
-
-    due_before_date = _parse_date(due_before) if due_before else None
-    due_after_date = _parse_date(due_after) if due_after else None
-
-    results = []
-
-    for task in tasks:
-        # --------------------
-        # Completed filter
-        # --------------------
-        if completed is not None and task.get("completed") != completed:
-            continue
-
-        # --------------------
-        # High priority filter
-        # --------------------
-        if is_high_priority is not None and task.get("is_high_priority") != is_high_priority:
-            continue
-
-        # --------------------
-        # Hour filter (only applies to completed tasks)
-        # --------------------
-        if hour is not None:
-            completed_at = task.get("completed_at")
-            if not completed_at:
-                continue
-
-            dt_utc = _parse_utc_iso(completed_at)
-            if not dt_utc:
-                continue
-
-            dt_local = dt_utc.astimezone(ZoneInfo(user_timezone))
-            if dt_local.hour != hour:
-                continue
-
-        # --------------------
-        # Due date filters
-        # --------------------
-        task_due_str = task.get("due_date", "")
-        task_due = _parse_date(task_due_str) if task_due_str else None
-
-        if due_before_date is not None:
-            if task_due is None or task_due > due_before_date:
-                continue
-
-        if due_after_date is not None:
-            if task_due is None or task_due < due_after_date:
-                continue
-
-        if overdue_only:
-            if task.get("completed"):
-                continue
-            if task_due is None or task_due >= today:
-                continue
-
-        results.append({
-            "name": task.get("name"),
-            "folder": task.get("folder"),
-            "is_high_priority": task.get("is_high_priority", False),
-            "completed": task.get("completed", False),
-            "created_at": task.get("created_at"),
-            "completed_at": task.get("completed_at"),
-            "due_date": task.get("due_date"),
-        })
-
-    return {
-        "has_data": True,
-        "task_count": len(results),
-        "tasks": results[:15],  # cap for safety
-        "timezone_used": user_timezone
-    }
\ No newline at end of file
+    return tasks_by_filter(
+        get_user_id_from_context(), user_timezone, completed=completed, is_high_priority=is_high_priority,
+        hour=hour, due_before=due_before, due_after=due_after, overdue_only=overdue_only,
+        limit=limit, cursor=cursor,
+    )
\ No newline at end of file
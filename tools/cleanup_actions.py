@@ -1,12 +1,10 @@
 # backend/tools/cleanup_actions.py
 
 from langchain_core.tools import tool
-from utils.firebase_client import FirebaseClient
+from utils.firebase_client import get_firebase_client
 from datetime import datetime, timezone
 import inspect
 
-firebase_client = FirebaseClient()
-
 def get_user_id_from_context():
     """Extract user_id from execution context"""
     frame = inspect.currentframe()
@@ -54,11 +52,11 @@ def handle_cleanup_action(action: str, task_name: str, insight_id: str = None) -
     
     # Execute action
     if action in ['delete', 'remove']:
-        result = firebase_client.delete_task(task_exact_name, user_id)
+        result = get_firebase_client().delete_task_by_id(match['id'], user_id)
         action_msg = f"🗑️ Deleted '{task_exact_name}'"
     
     elif action in ['complete', 'done', 'finish']:
-        result = firebase_client.mark_task_complete(task_exact_name, user_id)
+        result = get_firebase_client().mark_task_complete_by_id(match['id'], user_id)
         action_msg = f"✅ Marked '{task_exact_name}' as complete"
     
     elif action in ['keep', 'save', 'ignore', 'leave']:
@@ -71,7 +69,7 @@ def handle_cleanup_action(action: str, task_name: str, insight_id: str = None) -
     # Mark insight as resolved if insight_id provided
     if insight_id:
         try:
-            firebase_client.db.collection('monitor_insights').document(insight_id).update({
+            get_firebase_client().db.collection('monitor_insights').document(insight_id).update({
                 'resolved': True,
                 'resolved_at': datetime.now(timezone.utc),
                 'resolution_action': action
@@ -91,7 +89,7 @@ def list_pending_cleanup_actions() -> str:
         List of tasks awaiting user action
     """
     user_id = get_user_id_from_context()
-    db = firebase_client.db
+    db = get_firebase_client().db
     
     # Get unresolved cleanup insights
     insights_ref = db.collection('monitor_insights')
@@ -1,12 +1,11 @@
 from langchain_core.tools import tool
-from utils.firebase_client import FirebaseClient
+from utils.firebase_client import get_firebase_client
+from firebase_admin import firestore
 from datetime import datetime
 import pytz
 import re
 import inspect
 
-firebase_client = FirebaseClient()
-
 
 # ============================================
 # HELPER FUNCTION TO GET USER_ID
@@ -46,7 +45,7 @@ def create_folder(folder_name: str, emoji: str = "") -> str:
         emoji: Optional emoji for the folder (e.g., "💼", "🏠")
     """
     user_id = get_user_id_from_context()
-    result = firebase_client.create_folder(folder_name.strip().title(), emoji.strip(), user_id)
+    result = get_firebase_client().create_folder(folder_name.strip().title(), emoji.strip(), user_id)
     return result
 
 
@@ -89,7 +88,7 @@ def create_task(
                 "parse_relative_date) and use the YYYY-MM-DD value from its output."
             )
 
-    result = firebase_client.create_task(
+    result = get_firebase_client().create_task(
         task_name=task_name,
         folder_name=folder_name,
         user_id=user_id,
@@ -125,11 +124,12 @@ def mark_task_complete(task_description: str) -> str:
     user_id = get_user_id_from_context()
     
     # Only search incomplete tasks (can't complete what's already done)
-    match = intent_resolver.resolve_task_name(task_description, only_incomplete=True, user_id=user_id)
+    resolution = intent_resolver.resolve_task(task_description, only_incomplete=True, user_id=user_id)
+    match = resolution['match']
     
     if not match:
         # No match - show suggestions (only incomplete tasks)
-        suggestions = intent_resolver.get_task_suggestions(task_description, only_incomplete=True, user_id=user_id)
+        suggestions = resolution['suggestions']
         if suggestions:
             suggestion_list = "\n".join([
                 f"  • {s['name']} ({'✅' if s['completed'] else '⭕'})"
@@ -140,7 +140,7 @@ def mark_task_complete(task_description: str) -> str:
             return f"No incomplete tasks found matching '{task_description}'"
     
     # Found a match - execute
-    result = firebase_client.mark_task_complete(match['exact_name'], user_id)
+    result = get_firebase_client().mark_task_complete_by_id(match['id'], user_id)
     
     confidence_msg = f" (matched with {match['confidence']:.0%} confidence)" if match['confidence'] < 0.9 else ""
     
@@ -160,17 +160,18 @@ def mark_task_incomplete(task_description: str) -> str:
     user_id = get_user_id_from_context()
     
     # Search ALL tasks (need to find completed ones to mark incomplete)
-    match = intent_resolver.resolve_task_name(task_description, only_incomplete=False, user_id=user_id)
+    resolution = intent_resolver.resolve_task(task_description, only_incomplete=False, user_id=user_id)
+    match = resolution['match']
     
     if not match:
         # No match - show suggestions
-        suggestions = intent_resolver.get_task_suggestions(task_description, only_incomplete=False, user_id=user_id)
+        suggestions = resolution['suggestions']
         if suggestions:
             suggestion_list = "\n".join([f"  • {s['name']}" for s in suggestions])
             return f"❌ Couldn't find '{task_description}'.\n\nDid you mean:\n{suggestion_list}"
         return f"No tasks found matching '{task_description}'"
     
-    result = firebase_client.mark_task_incomplete(match['exact_name'], user_id)
+    result = get_firebase_client().mark_task_incomplete_by_id(match['id'], user_id)
     
     return f"✅ {result}"
 
@@ -188,17 +189,18 @@ def delete_task(task_description: str) -> str:
     user_id = get_user_id_from_context()
     
     # Search ALL tasks (can delete completed or incomplete)
-    match = intent_resolver.resolve_task_name(task_description, only_incomplete=False, user_id=user_id)
+    resolution = intent_resolver.resolve_task(task_description, only_incomplete=False, user_id=user_id)
+    match = resolution['match']
     
     if not match:
         # No match - show suggestions
-        suggestions = intent_resolver.get_task_suggestions(task_description, only_incomplete=False, user_id=user_id)
+        suggestions = resolution['suggestions']
         if suggestions:
             suggestion_list = "\n".join([f"  • {s['name']}" for s in suggestions])
             return f"❌ Couldn't find '{task_description}'.\n\nDid you mean:\n{suggestion_list}"
         return f"No tasks found matching '{task_description}'"
     
-    result = firebase_client.delete_task(match['exact_name'], user_id)
+    result = get_firebase_client().delete_task_by_id(match['id'], user_id)
     
     return f"🗑️ {result}"
 
@@ -215,16 +217,17 @@ def delete_folder(folder_description: str) -> str:
 
     user_id = get_user_id_from_context()
 
-    match = intent_resolver.resolve_folder_name(folder_description, user_id=user_id)
+    resolution = intent_resolver.resolve_folder(folder_description, user_id=user_id)
+    match = resolution['match']
 
     if not match:
-        suggestions = intent_resolver.get_folder_suggestions(folder_description, user_id=user_id)
+        suggestions = resolution['suggestions']
         if suggestions:
             suggestion_list = "\n".join([f"  • {s['emoji']} {s['name']}" for s in suggestions])
             return f"❌ Couldn't find folder matching '{folder_description}'.\n\nAvailable folders:\n{suggestion_list}"
         return f"No folders found matching '{folder_description}'"
 
-    result = firebase_client.delete_folder(match['exact_name'], user_id)
+    result = get_firebase_client().delete_folder(match['exact_name'], user_id)
 
     return f"🗑️ {result}"
 
@@ -248,15 +251,16 @@ def move_task(task_description: str, destination_folder_description: str) -> str
         return f"❌ Couldn't find task matching '{task_description}'"
     
     # Resolve folder
-    folder_match = intent_resolver.resolve_folder_name(destination_folder_description, user_id=user_id)
+    resolution = intent_resolver.resolve_folder(destination_folder_description, user_id=user_id)
+    folder_match = resolution['match']
     if not folder_match:
-        suggestions = intent_resolver.get_folder_suggestions(destination_folder_description, user_id=user_id)
+        suggestions = resolution['suggestions']
         if suggestions:
             suggestion_list = "\n".join([f"  • {s['emoji']} {s['name']}" for s in suggestions])
             return f"❌ Couldn't find folder matching '{destination_folder_description}'.\n\nAvailable folders:\n{suggestion_list}"
         return f"No folders found matching '{destination_folder_description}'"
     
-    result = firebase_client.move_task(task_match['exact_name'], folder_match['exact_name'], user_id)
+    result = get_firebase_client().move_task_by_id(task_match['id'], folder_match['exact_name'], user_id)
     
     return f"📦 {result}"
 
@@ -309,8 +313,8 @@ def edit_task(
         else:
             return f"❌ Couldn't find folder matching '{new_folder_description}'"
 
-    result = firebase_client.edit_task(
-        old_task_name=task_match['exact_name'],
+    result = get_firebase_client().edit_task_by_id(
+        task_id=task_match['id'],
         new_task_name=new_task_name,
         new_folder=new_folder_exact,
         new_recurrence=new_recurrence,
@@ -337,16 +341,17 @@ def edit_folder_name(old_folder_description: str, new_name: str, new_emoji: str
     
     user_id = get_user_id_from_context()
     
-    match = intent_resolver.resolve_folder_name(old_folder_description, user_id=user_id)
+    resolution = intent_resolver.resolve_folder(old_folder_description, user_id=user_id)
+    match = resolution['match']
     
     if not match:
-        suggestions = intent_resolver.get_folder_suggestions(old_folder_description, user_id=user_id)
+        suggestions = resolution['suggestions']
         if suggestions:
             suggestion_list = "\n".join([f"  • {s['emoji']} {s['name']}" for s in suggestions])
             return f"❌ Couldn't find folder matching '{old_folder_description}'.\n\nAvailable folders:\n{suggestion_list}"
         return f"No folders found matching '{old_folder_description}'"
     
-    result = firebase_client.edit_folder_name(
+    result = get_firebase_client().edit_folder_name(
         old_name=match['exact_name'],
         new_name=new_name,
         new_emoji=new_emoji,
@@ -373,20 +378,104 @@ def get_folder_contents(folder_description: str) -> str:
     user_id = get_user_id_from_context()
     
     # Resolve folder
-    match = intent_resolver.resolve_folder_name(folder_description, user_id=user_id)
+    resolution = intent_resolver.resolve_folder(folder_description, user_id=user_id)
+    match = resolution['match']
     
     if not match:
-        suggestions = intent_resolver.get_folder_suggestions(folder_description, user_id=user_id)
+        suggestions = resolution['suggestions']
         if suggestions:
             suggestion_list = "\n".join([f"  • {s['emoji']} {s['name']}" for s in suggestions])
             return f"❌ Couldn't find folder matching '{folder_description}'.\n\nAvailable folders:\n{suggestion_list}"
         return f"No folders found matching '{folder_description}'"
     
-    result = firebase_client.get_folder_contents(match['exact_name'], user_id)
+    result = get_firebase_client().get_folder_contents(match['exact_name'], user_id)
     
     return result
 
 
+# ============================================
+# BULK OPERATIONS (several tasks, one write)
+# ============================================
+
+def _resolve_bulk(task_descriptions: list, only_incomplete: bool, user_id: str):
+    """
+    Resolve every description against one snapshot of the user's tasks.
+    Returns (matched task ids, lines describing the descriptions that didn't match).
+    """
+    from utils.intent_resolver import intent_resolver
+
+    task_ids, misses = [], []
+    for resolution in intent_resolver.resolve_many(task_descriptions, only_incomplete=only_incomplete,
+                                                   user_id=user_id, limit=3):
+        if resolution['match']:
+            task_ids.append(resolution['match']['id'])
+            continue
+        suggestions = ", ".join(s['name'] for s in resolution['suggestions'])
+        hint = f" (did you mean: {suggestions}?)" if suggestions else ""
+        misses.append(f"❌ Couldn't find '{resolution['description']}'{hint}")
+    return task_ids, misses
+
+
+@tool
+def mark_tasks_complete(task_descriptions: list[str]) -> str:
+    """
+    Mark several tasks as complete at once ("I did the laundry, dishes and vacuuming").
+    Use this instead of calling mark_task_complete once per task.
+    
+    Args:
+        task_descriptions: One natural-language description per task
+    """
+    user_id = get_user_id_from_context()
+
+    task_ids, misses = _resolve_bulk(task_descriptions, only_incomplete=True, user_id=user_id)
+    lines = [f"✅ {get_firebase_client().complete_tasks(task_ids, user_id)}"] if task_ids else []
+    return "\n".join(lines + misses)
+
+
+@tool
+def delete_tasks(task_descriptions: list[str]) -> str:
+    """
+    Delete several tasks at once.
+    Use this instead of calling delete_task once per task.
+    
+    Args:
+        task_descriptions: One natural-language description per task
+    """
+    user_id = get_user_id_from_context()
+
+    task_ids, misses = _resolve_bulk(task_descriptions, only_incomplete=False, user_id=user_id)
+    lines = [f"🗑️ {get_firebase_client().delete_tasks(task_ids, user_id)}"] if task_ids else []
+    return "\n".join(lines + misses)
+
+
+@tool
+def move_tasks(task_descriptions: list[str], destination_folder_description: str) -> str:
+    """
+    Move several tasks to the same folder at once ("move these three to Work").
+    Use this instead of calling move_task once per task.
+    
+    Args:
+        task_descriptions: One natural-language description per task
+        destination_folder_description: Where to move them (natural language)
+    """
+    from utils.intent_resolver import intent_resolver
+
+    user_id = get_user_id_from_context()
+
+    resolution = intent_resolver.resolve_folder(destination_folder_description, user_id=user_id)
+    folder_match = resolution['match']
+    if not folder_match:
+        suggestions = resolution['suggestions']
+        if suggestions:
+            suggestion_list = "\n".join([f"  • {s['emoji']} {s['name']}" for s in suggestions])
+            return f"❌ Couldn't find folder matching '{destination_folder_description}'.\n\nAvailable folders:\n{suggestion_list}"
+        return f"No folders found matching '{destination_folder_description}'"
+
+    task_ids, misses = _resolve_bulk(task_descriptions, only_incomplete=False, user_id=user_id)
+    lines = [f"📦 {get_firebase_client().move_tasks(task_ids, folder_match['exact_name'], user_id)}"] if task_ids else []
+    return "\n".join(lines + misses)
+
+
 # ============================================
 # UTILITY OPERATIONS
 # ============================================
@@ -395,7 +484,7 @@ def get_folder_contents(folder_description: str) -> str:
 def list_all_folders() -> str:
     """List all folders in the system."""
     user_id = get_user_id_from_context()
-    result = firebase_client.list_all_folders(user_id)
+    result = get_firebase_client().list_all_folders(user_id)
     return result
 
 
@@ -404,7 +493,7 @@ def list_all_tasks() -> str:
     """List all tasks across all folders with their completion status."""
     user_id = get_user_id_from_context()
     
-    tasks = firebase_client._get_user_tasks_ref(user_id).stream()
+    tasks = get_firebase_client().stream_tasks(user_id, fields="listing")
     task_list = []
     
     for task in tasks:
@@ -424,14 +513,9 @@ def count_completed_tasks() -> str:
     """Count how many tasks have been completed."""
     user_id = get_user_id_from_context()
     
-    tasks = firebase_client._get_user_tasks_ref(user_id).stream()
-    total = 0
-    completed = 0
-    
-    for task in tasks:
-        total += 1
-        if task.to_dict().get('completed', False):
-            completed += 1
+    stats = get_firebase_client().get_task_stats(user_id)
+    total = stats['total']
+    completed = stats['completed']
     
     if total == 0:
         return "You don't have any tasks yet"
@@ -456,7 +540,7 @@ def search_tasks(query: str) -> str:
 
     print(f"🔍 Searching tasks for: '{query}'")
     
-    all_tasks = firebase_client._get_user_tasks_ref(user_id).stream()
+    all_tasks = get_firebase_client().stream_tasks(user_id, fields="name+completed")
     matches = []
     
     for task in all_tasks:
@@ -491,21 +575,20 @@ def mark_task_as_priority(task_name: str, reason: str = "") -> str:
     """
     user_id = get_user_id_from_context()
     
-    tasks = firebase_client._get_user_tasks_ref(user_id).stream()
+    client = get_firebase_client()
+    task = client.tasks.find_by_name(user_id, task_name)
     
-    for task in tasks:
-        task_data = task.to_dict()
-        if task_data['name'].lower() == task_name.lower():
-            task_ref = firebase_client._get_user_tasks_ref(user_id).document(task.id)
-            
-            # Update priority
-            task_ref.update({
-                'is_high_priority': True,
-                'priority_score': 1.0,
-                'priority_reason': reason,
-                'priority_marked_at': datetime.now(pytz.UTC).isoformat()
-            })
-            
-            return f"Marked '{task_name}' as high priority. Reason: {reason}"
-    
-    return f"Task '{task_name}' not found."
\ No newline at end of file
+    if task is None:
+        return f"Task '{task_name}' not found."
+    
+    # Update priority
+    client.tasks.update(user_id, task.id, {
+        'is_high_priority': True,
+        'priority_score': 1.0,
+        'priority_reason': reason,
+        'priority_marked_at': datetime.now(pytz.UTC).isoformat(),
+        'updated_at': firestore.SERVER_TIMESTAMP,
+    }, before=task.to_dict())
+    client.bump_data_version(user_id)
+    
+    return f"Marked '{task_name}' as high priority. Reason: {reason}"
\ No newline at end of file
@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 from langchain_core.tools import tool
 from zoneinfo import ZoneInfo
 
+from utils.task_snapshot import request_now
+
 
 @tool
 def get_current_date(timezone: str) -> str:
@@ -18,7 +20,7 @@ def get_current_date(timezone: str) -> str:
     """
     try:
         tz = ZoneInfo(timezone)
-        now = datetime.now(tz)
+        now = request_now(tz)
         
         formatted = now.strftime("%A, %B %d, %Y at %I:%M %p")
         tz_abbr = now.strftime("%Z")
@@ -46,7 +48,7 @@ def get_date_in_days(days: int, timezone: str ) -> str:
     """
     try:
         tz = ZoneInfo(timezone)
-        target_date = datetime.now(tz) + timedelta(days=days)
+        target_date = request_now(tz) + timedelta(days=days)
 
         human = target_date.strftime("%A, %B %d, %Y")
         iso = target_date.strftime("%Y-%m-%d")
@@ -82,7 +84,7 @@ def get_next_weekday(weekday: str, timezone: str) -> str:
             return f"Error: Invalid weekday '{weekday}'. Use Monday, Tuesday, etc."
         
         tz = ZoneInfo(timezone)
-        today = datetime.now(tz)
+        today = request_now(tz)
         current_weekday = today.weekday()
         
         # Calculate days until target weekday
@@ -122,7 +124,7 @@ def parse_relative_date(description: str, timezone: str) -> str:
     """
     try:
         tz = ZoneInfo(timezone)
-        today = datetime.now(tz)
+        today = request_now(tz)
         
         description = description.lower().strip()
 
@@ -1,94 +1,80 @@
 # utils/firebase_client.py
 import firebase_admin
 from firebase_admin import credentials, firestore
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import json
 import pytz 
 from dateutil import parser as date_parser 
 import os
 import re 
 import time 
-from functools import wraps 
-import tempfile 
+import threading
+from collections import Counter
 
+from utils.task_repository import FirestoreTaskRepository, TOMBSTONE_RETENTION_DAYS
+from utils.task_model import Task, date_to_ordinal
+from utils.firestore_resilience import ResilientFirestore
 
-class FirebaseClient:
-    def __init__(self):
-        self.db = None
-        self._initialize()
-    
-    def _initialize(self):
-        """Initialize Firebase"""
-        import tempfile
 
-        print(f"\n{'='*80}")
-        print(f"🔧 INITIALIZING FIREBASE CLIENT")
-        print(f"{'='*80}")
+# Where task documents live: "firestore" (default) or "postgres" — see utils/task_repository.py
+TASK_STORE = os.getenv("VOICELOG_TASK_STORE", "firestore").lower()
 
-        try:
-            if os.getenv('FIREBASE_CREDENTIALS_JSON'):
-                # Running on Render - credentials in environment variable
-                print(f"   🌐 Running on Render - using environment credentials")
-                cred_dict = json.loads(os.getenv('FIREBASE_CREDENTIALS_JSON'))
-                print(f"   📊 Project ID from env: {cred_dict.get('project_id')}")
-
-                # Create temporary file
-                temp_creds = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
-                json.dump(cred_dict, temp_creds)
-                temp_creds.close()
-
-                cred = credentials.Certificate(temp_creds.name)
-            else:
-                # Running locally - use file path
-                print(f"   💻 Running locally - using firebase-credentials.json")
-                cred_path = "firebase-credentials.json"
-
-                if not os.path.exists(cred_path):
-                    error_msg = f"❌ Credentials file not found: {cred_path}"
-                    print(error_msg)
-                    raise FileNotFoundError(error_msg)
-
-                print(f"   📄 Loading credentials from: {cred_path}")
-                cred = credentials.Certificate(cred_path)
-
-                # Read project ID from credentials
-                with open(cred_path, 'r') as f:
-                    cred_data = json.load(f)
-                    print(f"   📊 Project ID: {cred_data.get('project_id')}")
-
-            if not firebase_admin._apps:
-                print(f"   🔧 Initializing Firebase Admin SDK...")
-                firebase_admin.initialize_app(cred)
-                print(f"   ✅ Firebase Admin SDK initialized")
-            else:
-                print(f"   ℹ️  Firebase Admin SDK already initialized")
+# Verbose create/write dumps (set FIREBASE_DEBUG=true in env to enable)
+FIREBASE_DEBUG = os.getenv("FIREBASE_DEBUG", "false").lower() == "true"
 
-            print(f"   🔧 Getting Firestore client...")
-            self.db = firestore.client()
-            print(f"   ✅ Firestore client obtained: {self.db}")
-            print(f"   ✅ Client type: {type(self.db)}")
+# *_by_id reply when the resolved task was deleted in the meantime (never echo the document ID)
+TASK_GONE_MESSAGE = "That task no longer exists"
 
-            if self.db is None:
-                error_msg = "❌ CRITICAL: Firestore client is None!"
-                print(error_msg)
-                raise Exception(error_msg)
+# Duplicate-detection candidates per user: {user_id: {'loaded_at': float, 'tasks': {task_id: _TaskCandidate}}}
+# Module-level so every FirebaseClient in the process shares one copy.
+TASK_CANDIDATE_TTL_SECONDS = 60
+_TASK_CANDIDATE_CACHE = {}
 
-            # Verify we can access Firebase
-            app = firebase_admin.get_app()
-            print(f"   ✅ Firebase app: {app.name}")
-            print(f"   ✅ Project ID: {app.project_id}")
 
-            print(f"✅ Firebase initialization SUCCESSFUL")
-            print(f"{'='*80}\n")
+# Named field projections for task queries (Firestore select()).
+# Each call site asks for the smallest set it needs; None means the whole document.
+TASK_FIELD_SETS = {
+    "completed": ['completed'],
+    "name+completed": ['name', 'completed'],
+    "name+folder": ['name', 'folder'],
+    "listing": ['name', 'completed', 'folder'],
+    "resolver": ['name', 'completed', 'folder', 'updated_at'],
+    "analytics": [
+        'name', 'folder', 'completed', 'is_high_priority',
+        'created_at', 'completed_at', 'completed_day', 'due_date',
+    ],
+    "mobile": [
+        'name', 'folder', 'completed', 'recurrence', 'time', 'duration',
+        'created_at', 'completed_at', 'due_date', 'is_high_priority', 'updated_at',
+    ],
+    "stats": ['folder', 'completed', 'is_high_priority', 'due_date'],
+    "full": None,
+}
 
-        except Exception as e:
-            print(f"\n❌ FIREBASE INITIALIZATION FAILED!")
-            print(f"   Error type: {type(e).__name__}")
-            print(f"   Error message: {str(e)}")
-            print(f"{'='*80}\n")
-            import traceback
-            traceback.print_exc()
-            raise
+
+class _TaskCandidate:
+    """Pre-lowered task name plus character counts for the duplicate check"""
+    __slots__ = ('name', 'name_lower', 'folder', 'char_counts')
+
+    def __init__(self, name: str, folder: str):
+        self.name = name or ''
+        self.name_lower = self.name.lower()
+        self.folder = folder
+        self.char_counts = Counter(self.name_lower)
+
+
+class FirebaseClient:
+    def __init__(self, db=None, tasks=None):
+        """
+        Args:
+            db: Firestore client to use. Defaults to the process-wide client
+                from get_firestore_db(); prefer get_firebase_client() over
+                constructing new instances.
+            tasks: TaskRepository holding task documents. Defaults to Firestore,
+                or Postgres when VOICELOG_TASK_STORE=postgres.
+        """
+        self.db = db if db is not None else get_firestore_db()
+        self.tasks = tasks if tasks is not None else _default_task_repository(self.db)
     
     # ============================================
     # HELPER METHOD: Get user collection reference
@@ -101,6 +87,32 @@ class FirebaseClient:
     def _get_user_tasks_ref(self, user_id: str):
         """Get reference to user's tasks collection"""
         return self.db.collection('users').document(user_id).collection('tasks')
+
+    def _get_user_tombstones_ref(self, user_id: str):
+        """Get reference to user's deleted-task tombstones (for delta sync)"""
+        return self.db.collection('users').document(user_id).collection('task_tombstones')
+
+    def _get_user_doc_ref(self, user_id: str):
+        """Get reference to the user's root document (holds data_version)"""
+        return self.db.collection('users').document(user_id)
+
+    # ============================================
+    # DATA VERSION (per-user change counter)
+    # ============================================
+
+    def get_data_version(self, user_id: str) -> int:
+        """Current task/folder data version for a user (0 if never written)"""
+        snapshot = self._get_user_doc_ref(user_id).get()
+        if not snapshot.exists:
+            return 0
+        return (snapshot.to_dict() or {}).get('data_version', 0)
+
+    def bump_data_version(self, user_id: str):
+        """Increment the user's data version after any task/folder mutation"""
+        self._get_user_doc_ref(user_id).set(
+            {'data_version': firestore.Increment(1)},
+            merge=True,
+        )
     
     # ============================================
     # FOLDER OPERATIONS (UPDATED WITH USER_ID)
@@ -123,21 +135,20 @@ class FirebaseClient:
             'created_at': firestore.SERVER_TIMESTAMP
         })
         
+        self.bump_data_version(user_id)
         return f"Created folder {emoji} {folder_name}".strip()
     
     def list_all_folders(self, user_id: str):
         """List all folders for a specific user"""
         folders = self._get_user_folders_ref(user_id).stream()
         folder_list = []
+
+        # Per-folder totals from the counters document instead of a query per folder
+        counts = self.tasks.stats(user_id)['folders']
         
         for folder in folders:
             folder_data = folder.to_dict()
-            # Count tasks in this folder for this user
-            task_count = len(list(
-                self._get_user_tasks_ref(user_id)
-                .where('folder', '==', folder.id)
-                .stream()
-            ))
+            task_count = counts.get(folder.id, {}).get('total', 0)
             folder_list.append(f"{folder_data.get('emoji', '')} {folder_data['name']} ({task_count} tasks)")
         
         if not folder_list:
@@ -154,11 +165,11 @@ class FirebaseClient:
             return f"Folder '{folder_name}' doesn't exist"
 
         # Delete all tasks in folder
-        tasks = self._get_user_tasks_ref(user_id).where('folder', '==', folder_id).stream()
-        for task in tasks:
-            task.reference.delete()
+        self.tasks.delete_folder_tasks(user_id, folder_id)
 
         folder_ref.delete()
+        self._invalidate_task_candidates(user_id)
+        self.bump_data_version(user_id)
         return f"Deleted folder '{folder_name}'"
     
     def edit_folder_name(self, old_name: str, new_name: str, new_emoji: str = None, user_id: str = None):
@@ -186,11 +197,11 @@ class FirebaseClient:
         self._get_user_folders_ref(user_id).document(new_id).set(new_data)
         
         # Update all tasks
-        tasks = self._get_user_tasks_ref(user_id).where('folder', '==', old_id).stream()
-        for task in tasks:
-            task.reference.update({'folder': new_id})
+        self.tasks.move_folder_tasks(user_id, old_id, new_id)
         
         old_ref.delete()
+        self._invalidate_task_candidates(user_id)
+        self.bump_data_version(user_id)
         return f"Renamed folder to '{new_name}'"
     
     def get_folder_contents(self, folder_name: str, user_id: str):
@@ -216,7 +227,7 @@ class FirebaseClient:
             print(f"   ⚠️  Folder document not found, but checking for tasks anyway...")
 
         # Get tasks in this folder
-        tasks = self._get_user_tasks_ref(user_id).where('folder', '==', normalized).stream()
+        tasks = self.tasks.stream(user_id, fields="name+completed", folder=normalized)
         task_list = []
 
         for task in tasks:
@@ -252,17 +263,14 @@ class FirebaseClient:
         try:
             folder_id = folder_name.lower().replace(" ", "_")
 
-            # EXTENSIVE LOGGING
-            print(f"\n{'='*80}")
-            print(f"🔧 CREATE_TASK CALLED")
-            print(f"{'='*80}")
-            print(f"📝 Task name: '{task_name}'")
-            print(f"📁 Folder: '{folder_name}' → '{folder_id}'")
-            print(f"👤 User ID: '{user_id}'")
-            print(f"🔄 Recurrence: '{recurrence}'")
-            print(f"⏰ Time: '{time}'")
-            print(f"📅 Due date: '{due_date}'")
-            print(f"⏱️  Duration: '{duration}'")
+            self._debug(f"\n{'='*80}")
+            self._debug(f"🔧 CREATE_TASK CALLED")
+            self._debug(f"📝 Task name: '{task_name}' | 📁 Folder: '{folder_name}' → '{folder_id}'")
+            self._debug(f"👤 User ID: '{user_id}' | 📅 Due date: '{due_date}'")
+            self._debug(f"🔄 Recurrence: '{recurrence}' | ⏰ Time: '{time}' | ⏱️  Duration: '{duration}'")
+
+            if self.db is None:
+                raise Exception("❌ CRITICAL ERROR: self.db is None! Firebase not initialized!")
 
             # Check folder exists — fuzzy match to handle typos like "Probelms" vs "Problems"
             from difflib import SequenceMatcher as SM
@@ -296,60 +304,25 @@ class FirebaseClient:
                     )
 
             # Check for duplicate task name (fuzzy — catches spelling variations)
-            from difflib import SequenceMatcher
-            existing_tasks = list(self._get_user_tasks_ref(user_id).stream())
-            for existing in existing_tasks:
-                existing_data = existing.to_dict()
-                existing_name = existing_data.get('name', '')
-                similarity = SequenceMatcher(None, task_name.lower(), existing_name.lower()).ratio()
-                if similarity >= 0.80:
-                    existing_folder = existing_data.get('folder', 'unknown')
-                    return (
-                        f"Task '{existing_name}' already exists in folder '{existing_folder}' "
-                        f"(similarity: {similarity:.0%}). Use edit_task to modify it."
-                    )
+            duplicate = self._find_duplicate_task(task_name, user_id)
+            if duplicate:
+                existing_name, existing_folder, similarity = duplicate
+                return (
+                    f"Task '{existing_name}' already exists in folder '{existing_folder}' "
+                    f"(similarity: {similarity:.0%}). Use edit_task to modify it."
+                )
 
             processed_due_date = None
             if due_date and due_date.strip():
                 try:
-                     dt = date_parser.parse(due_date.strip())
-            # Keep only the calendar date in ISO format
-                     processed_due_date = dt.date().isoformat()  # "2026-03-03"
-                     print(f"✅ Normalized due date: '{processed_due_date}' from '{due_date}'")
+                    dt = date_parser.parse(due_date.strip())
+                    # Keep only the calendar date in ISO format
+                    processed_due_date = dt.date().isoformat()  # "2026-03-03"
                 except Exception as e:
-                     print(f"⚠️ Could not parse due_date '{due_date}': {e}")
-                     processed_due_date = None 
-                # Parse to validate format
-                  
-
-            # Check Firebase client status
-            print(f"\n🔍 Checking Firebase client...")
-            print(f"   self.db: {self.db}")
-            print(f"   self.db type: {type(self.db)}")
+                    print(f"⚠️ Could not parse due_date '{due_date}': {e}")
+                    processed_due_date = None
 
-            if self.db is None:
-                error_msg = "❌ CRITICAL ERROR: self.db is None! Firebase not initialized!"
-                print(error_msg)
-                raise Exception(error_msg)
-
-            print(f"   ✅ Firebase client is initialized")
-
-            # Get tasks collection reference
-            print(f"\n🔍 Getting tasks collection reference...")
-            tasks_ref = self._get_user_tasks_ref(user_id)
-            print(f"   tasks_ref: {tasks_ref}")
-            print(f"   tasks_ref type: {type(tasks_ref)}")
-            print(f"   tasks_ref path: users/{user_id}/tasks")
-
-            # Create document reference
-            print(f"\n🔍 Creating task document reference...")
-            task_ref = tasks_ref.document()
-            print(f"   task_ref: {task_ref}")
-            print(f"   task_ref.id: {task_ref.id}")
-            print(f"   task_ref.path: {task_ref.path}")
-
-            # Prepare task data
-            print(f"\n🔍 Preparing task data...")
+            task_id = self.tasks.new_id(user_id)
             task_data = {
                 'name': task_name,
                 'folder': folder_id,
@@ -367,52 +340,106 @@ class FirebaseClient:
 
                 # Completion tracking (initially null)
                 'completed_at': None,
-            }
-
-            print(f"   Task data prepared:")
-            for key, value in task_data.items():
-                print(f"      {key}: {value}")
-
-            # CRITICAL: Write to Firestore
-            print(f"\n🔧 WRITING TO FIRESTORE...")
-            print(f"   Path: {task_ref.path}")
 
-            write_result = task_ref.set(task_data)
-
-            print(f"   ✅✅✅ WRITE SUCCESSFUL!")
-            print(f"   Write result: {write_result}")
-            print(f"   Update time: {write_result.update_time if hasattr(write_result, 'update_time') else 'N/A'}")
-
-            # Verify write (optional but useful for debugging)
-            print(f"\n🔍 Verifying task was written...")
-            verification = task_ref.get()
+                # Delta sync cursor field
+                'updated_at': firestore.SERVER_TIMESTAMP,
+            }
 
-            if verification.exists:
-                print(f"   ✅ VERIFICATION SUCCESSFUL - Task exists in Firestore!")
-                verified_data = verification.to_dict()
-                print(f"   Verified task name: {verified_data.get('name')}")
-            else:
-                print(f"   ⚠️  WARNING: Task does not exist after write (might be eventual consistency)")
+            self._debug(f"🔧 Writing task {task_id} for {user_id}: {task_data}")
+            self.tasks.add(user_id, task_id, task_data)
+            self._remember_task_candidate(user_id, task_id, task_name, folder_id)
+            self.bump_data_version(user_id)
 
             priority_msg = " (High Priority)" if task_data['is_high_priority'] else ""
 
             success_msg = f"Created task '{task_name}'{priority_msg} in {folder_name}"
-            print(f"\n✅ {success_msg}")
-            print(f"{'='*80}\n")
+            self._debug(f"✅ {success_msg}\n{'='*80}\n")
 
             return success_msg
 
         except Exception as e:
-            error_msg = f"❌ EXCEPTION in create_task: {type(e).__name__}: {str(e)}"
-            print(f"\n{'='*80}")
-            print(error_msg)
-            print(f"{'='*80}\n")
+            print(f"❌ EXCEPTION in create_task: {type(e).__name__}: {str(e)}")
 
             import traceback
             traceback.print_exc()
 
             raise  # Re-raise to propagate error
 
+    # ============================================
+    # DUPLICATE DETECTION (cached candidate set)
+    # ============================================
+
+    def _get_task_candidates(self, user_id: str):
+        """
+        Return the cached duplicate-detection candidates for a user.
+
+        Loaded once with a name/folder projection and kept up to date by this
+        process's own writes; the TTL bounds staleness from writes made elsewhere.
+        """
+        entry = _TASK_CANDIDATE_CACHE.get(user_id)
+        now = time.monotonic()
+        if entry is not None and now - entry['loaded_at'] < TASK_CANDIDATE_TTL_SECONDS:
+            return entry['tasks']
+
+        tasks = {}
+        for doc in self.stream_tasks(user_id, fields="name+folder"):
+            data = doc.to_dict()
+            tasks[doc.id] = _TaskCandidate(data.get('name', ''), data.get('folder', 'unknown'))
+
+        _TASK_CANDIDATE_CACHE[user_id] = {'loaded_at': now, 'tasks': tasks}
+        return tasks
+
+    def _remember_task_candidate(self, user_id: str, task_id: str, name: str, folder: str):
+        """Add a freshly written task to the cached candidate set (if loaded)"""
+        entry = _TASK_CANDIDATE_CACHE.get(user_id)
+        if entry is not None:
+            entry['tasks'][task_id] = _TaskCandidate(name, folder)
+
+    def _invalidate_task_candidates(self, user_id: str):
+        """Drop cached candidates after renames, moves or deletes"""
+        _TASK_CANDIDATE_CACHE.pop(user_id, None)
+
+    def _find_duplicate_task(self, task_name: str, user_id: str, threshold: float = 0.80):
+        """
+        Find an existing task whose name is >= threshold similar to task_name.
+
+        Same result as scoring SequenceMatcher against every task, but candidates
+        are rejected first by length and character-count upper bounds, so only a
+        handful of names ever reach the full ratio() computation.
+
+        Returns (existing_name, existing_folder, similarity) or None.
+        """
+        from difflib import SequenceMatcher
+
+        needle = task_name.lower()
+        needle_len = len(needle)
+        needle_counts = Counter(needle)
+
+        for candidate in self._get_task_candidates(user_id).values():
+            total_len = needle_len + len(candidate.name_lower)
+            if total_len == 0:
+                continue
+
+            # Upper bound 1 (real_quick_ratio): lengths alone
+            if 2.0 * min(needle_len, len(candidate.name_lower)) / total_len < threshold:
+                continue
+
+            # Upper bound 2 (quick_ratio): shared character multiset
+            shared = sum((needle_counts & candidate.char_counts).values())
+            if 2.0 * shared / total_len < threshold:
+                continue
+
+            similarity = SequenceMatcher(None, needle, candidate.name_lower).ratio()
+            if similarity >= threshold:
+                return candidate.name, candidate.folder, similarity
+
+        return None
+
+    def _debug(self, message: str):
+        """Print verbose Firestore diagnostics only when FIREBASE_DEBUG=true"""
+        if FIREBASE_DEBUG:
+            print(message)
+
     def _detect_priority(self, task_name: str):
         """Detect if task is high priority from name"""
         priority_keywords = [
@@ -424,90 +451,88 @@ class FirebaseClient:
     
     def mark_task_complete(self, task_name: str, user_id: str):
         """Mark task complete for specific user"""
-        tasks = self._get_user_tasks_ref(user_id).stream()
-
-        for task in tasks:
-            task_data = task.to_dict()
-            if task_data['name'].lower() == task_name.lower():
-                task_ref = self._get_user_tasks_ref(user_id).document(task.id)
-
-                now_utc = datetime.now(pytz.UTC)
-                task_ref.update({
-                    'completed': True,
-                    'completed_at': firestore.SERVER_TIMESTAMP,
-                    'completed_day': now_utc.strftime("%A"),
-                })
-
-                return f"Marked '{task_name}' as complete ✅"
-
-        return f"Task '{task_name}' not found."
+        task = self.tasks.find_by_name(user_id, task_name)
+        if task is None:
+            return f"Task '{task_name}' not found."
+        return self._complete_task(task, user_id)
+
+    def mark_task_complete_by_id(self, task_id: str, user_id: str):
+        """Mark task complete by document ID (one read, one write; no name lookup)"""
+        task = self.tasks.get(user_id, task_id)
+        if task is None:
+            return TASK_GONE_MESSAGE
+        return self._complete_task(task, user_id)
+
+    def _complete_task(self, task, user_id: str):
+        now_utc = datetime.now(pytz.UTC)
+        self.tasks.update(user_id, task.id, {
+            'completed': True,
+            'completed_at': firestore.SERVER_TIMESTAMP,
+            'completed_day': now_utc.strftime("%A"),
+            'updated_at': firestore.SERVER_TIMESTAMP,
+        }, before=task.to_dict())
+        self.bump_data_version(user_id)
+
+        return f"Marked '{task.to_dict()['name']}' as complete ✅"
     
     def mark_task_incomplete(self, task_name: str, user_id: str):
         """Mark a task as incomplete for specific user"""
-        tasks_ref = self._get_user_tasks_ref(user_id)
-        task_query = tasks_ref.where('name', '==', task_name).limit(1)
-        task_docs = list(task_query.stream())
-        
-        if task_docs:
-            task_doc = task_docs[0]
-            task_doc.reference.update({
-                'completed': False,
-                'completed_at': None
-            })
-            return f"Marked '{task_name}' as incomplete"
-        
-        # Case-insensitive search
-        all_tasks = tasks_ref.stream()
-        for task in all_tasks:
-            task_data = task.to_dict()
-            if task_data['name'].lower() == task_name.lower():
-                task.reference.update({
-                    'completed': False,
-                    'completed_at': None
-                })
-                return f"Marked '{task_data['name']}' as incomplete"
-        
-        return f"Task '{task_name}' not found"
+        task = self.tasks.find_by_name(user_id, task_name)
+        if task is None:
+            return f"Task '{task_name}' not found"
+        return self._uncomplete_task(task, user_id)
+
+    def mark_task_incomplete_by_id(self, task_id: str, user_id: str):
+        """Mark a task as incomplete by document ID"""
+        task = self.tasks.get(user_id, task_id)
+        if task is None:
+            return TASK_GONE_MESSAGE
+        return self._uncomplete_task(task, user_id)
+
+    def _uncomplete_task(self, task, user_id: str):
+        self.tasks.update(user_id, task.id, {
+            'completed': False,
+            'completed_at': None,
+            'updated_at': firestore.SERVER_TIMESTAMP,
+        }, before=task.to_dict())
+        self.bump_data_version(user_id)
+        return f"Marked '{task.to_dict()['name']}' as incomplete"
     
     def toggle_task(self, task_id: str, completed: bool, user_id: str):
         """Toggle task completion by ID for specific user"""
         try:
-            task_ref = self._get_user_tasks_ref(user_id).document(task_id)
-            task_doc = task_ref.get()
-            
-            if not task_doc.exists:
+            task = self.tasks.get(user_id, task_id)
+            if task is None:
                 return "Task not found"
             
             if completed:
-                now_utc = datetime.now(pytz.UTC)
-                task_ref.update({
-                    'completed': True,
-                    'completed_at': firestore.SERVER_TIMESTAMP,
-                    'completed_day': now_utc.strftime("%A"),
-                })
-                return "success"
+                self._complete_task(task, user_id)
             else:
-                task_ref.update({
-                    'completed': False,
-                    'completed_at': None
-                })
-                return "success"
+                self._uncomplete_task(task, user_id)
+            return "success"
         except Exception as e:
             return f"Error: {str(e)}"
     
     def delete_task(self, task_name: str, user_id: str):
         """Delete a task for specific user"""
-        tasks = self._get_user_tasks_ref(user_id).where('name', '==', task_name).stream()
-        
-        deleted = False
-        for task in tasks:
-            task.reference.delete()
-            deleted = True
-            break
+        task = self.tasks.find_by_name(user_id, task_name, exact_only=True)
         
-        if deleted:
-            return f"Deleted task '{task_name}'"
+        if task is not None:
+            return self._delete_task(task, user_id)
         return f"Task '{task_name}' not found"
+
+    def delete_task_by_id(self, task_id: str, user_id: str):
+        """Delete a task by document ID"""
+        task = self.tasks.get(user_id, task_id)
+        if task is None:
+            return TASK_GONE_MESSAGE
+        return self._delete_task(task, user_id)
+
+    def _delete_task(self, task, user_id: str):
+        self.tasks.delete(user_id, task.id, before=task.to_dict())
+        self._invalidate_task_candidates(user_id)
+        self.bump_data_version(user_id)
+        return f"Deleted task '{task.to_dict()['name']}'"
     
     def move_task(self, task_name: str, destination_folder: str, user_id: str):
         """Move a task to another folder for specific user"""
@@ -516,95 +541,305 @@ class FirebaseClient:
         if not self._get_user_folders_ref(user_id).document(dest_id).get().exists:
             return f"Folder '{destination_folder}' doesn't exist"
         
-        tasks = self._get_user_tasks_ref(user_id).where('name', '==', task_name).stream()
-        
-        moved = False
-        for task in tasks:
-            task.reference.update({'folder': dest_id})
-            moved = True
-            break
+        task = self.tasks.find_by_name(user_id, task_name, exact_only=True)
         
-        if moved:
-            return f"Moved '{task_name}' to {destination_folder}"
+        if task is not None:
+            return self._move_task(task, dest_id, destination_folder, user_id)
         return f"Task '{task_name}' not found"
+
+    def move_task_by_id(self, task_id: str, destination_folder: str, user_id: str):
+        """Move a task to another folder by document ID"""
+        dest_id = destination_folder.lower().replace(" ", "_")
+
+        if not self._get_user_folders_ref(user_id).document(dest_id).get().exists:
+            return f"Folder '{destination_folder}' doesn't exist"
+
+        task = self.tasks.get(user_id, task_id)
+        if task is None:
+            return TASK_GONE_MESSAGE
+        return self._move_task(task, dest_id, destination_folder, user_id)
+
+    def _move_task(self, task, dest_id: str, destination_folder: str, user_id: str):
+        self.tasks.update(user_id, task.id, {'folder': dest_id, 'updated_at': firestore.SERVER_TIMESTAMP},
+                          before=task.to_dict())
+        self._invalidate_task_candidates(user_id)
+        self.bump_data_version(user_id)
+        return f"Moved '{task.to_dict()['name']}' to {destination_folder}"
     
     def edit_task(self, old_task_name: str, new_task_name: str = None, new_folder: str = None,
                   new_recurrence: str = None, new_time: str = None, new_duration: str = None, new_due_date: str = None,  user_id: str = None):
         """Edit task properties for specific user"""
-        tasks = self._get_user_tasks_ref(user_id).stream()
+        task = self.tasks.find_by_name(user_id, old_task_name)
+        if task is None:
+            return f"Task '{old_task_name}' not found"
+        return self._edit_task(task, new_task_name, new_folder, new_recurrence, new_time, new_duration,
+                               new_due_date, user_id)
+
+    def edit_task_by_id(self, task_id: str, new_task_name: str = None, new_folder: str = None,
+                        new_recurrence: str = None, new_time: str = None, new_duration: str = None,
+                        new_due_date: str = None, user_id: str = None):
+        """Edit task properties by document ID"""
+        task = self.tasks.get(user_id, task_id)
+        if task is None:
+            return TASK_GONE_MESSAGE
+        return self._edit_task(task, new_task_name, new_folder, new_recurrence, new_time, new_duration,
+                               new_due_date, user_id)
+
+    def _edit_task(self, task, new_task_name, new_folder, new_recurrence, new_time, new_duration, new_due_date,
+                   user_id: str):
+        updates = {}
         
-        for task in tasks:
-            task_data = task.to_dict()
-            if task_data['name'].lower() == old_task_name.lower():
-                updates = {}
-                
-                if new_task_name:
-                    updates['name'] = new_task_name
-                    updates['is_high_priority'] = self._detect_priority(new_task_name)
-                
-                if new_folder:
-                    new_id = new_folder.lower().replace(" ", "_")
-                    if not self._get_user_folders_ref(user_id).document(new_id).get().exists:
-                        return f"Folder '{new_folder}' doesn't exist"
-                    updates['folder'] = new_id
-                
-                if new_recurrence is not None:
-                    updates['recurrence'] = new_recurrence
-                if new_time is not None:
-                    updates['time'] = new_time
-                if new_duration is not None:
-                    updates['duration'] = new_duration
-                if new_due_date is not None: 
-                    updates['due_date'] = new_due_date     
-                
-                if updates:
-                    task.reference.update(updates)
-                    final_name = new_task_name if new_task_name else old_task_name
-                    return f"Updated '{final_name}'"
-                else:
-                    return "Nothing to update"
+        if new_task_name:
+            updates['name'] = new_task_name
+            updates['is_high_priority'] = self._detect_priority(new_task_name)
+        
+        if new_folder:
+            new_id = new_folder.lower().replace(" ", "_")
+            if not self._get_user_folders_ref(user_id).document(new_id).get().exists:
+                return f"Folder '{new_folder}' doesn't exist"
+            updates['folder'] = new_id
+        
+        if new_recurrence is not None:
+            updates['recurrence'] = new_recurrence
+        if new_time is not None:
+            updates['time'] = new_time
+        if new_duration is not None:
+            updates['duration'] = new_duration
+        if new_due_date is not None: 
+            # Canonical YYYY-MM-DD like create_task, so indexed due_date ranges see it
+            due_ordinal = date_to_ordinal(new_due_date)
+            updates['due_date'] = date.fromordinal(due_ordinal).isoformat() if due_ordinal else new_due_date
         
-        return f"Task '{old_task_name}' not found"
+        if not updates:
+            return "Nothing to update"
+
+        updates['updated_at'] = firestore.SERVER_TIMESTAMP
+        self.tasks.update(user_id, task.id, updates, before=task.to_dict())
+        self._invalidate_task_candidates(user_id)
+        self.bump_data_version(user_id)
+        final_name = new_task_name if new_task_name else task.to_dict()['name']
+        return f"Updated '{final_name}'"
     
+    # ============================================
+    # BULK TASK OPERATIONS (one batch per call)
+    # ============================================
+
+    def complete_tasks(self, task_ids: list, user_id: str):
+        """Mark several tasks complete in one batch; already completed ones are skipped"""
+        pending = {task_id: task.to_dict() for task_id, task in self.tasks.get_many(user_id, task_ids).items()
+                   if not task.to_dict().get('completed')}
+        if not pending:
+            return "No incomplete tasks to complete"
+
+        now_utc = datetime.now(pytz.UTC)
+        self.tasks.update_many(user_id, list(pending), {
+            'completed': True,
+            'completed_at': firestore.SERVER_TIMESTAMP,
+            'completed_day': now_utc.strftime("%A"),
+            'updated_at': firestore.SERVER_TIMESTAMP,
+        }, befores=pending)
+        self.bump_data_version(user_id)
+
+        names = ", ".join(f"'{data.get('name', '')}'" for data in pending.values())
+        return f"Marked {len(pending)} task{'s' if len(pending) != 1 else ''} as complete ✅: {names}"
+
+    def delete_tasks(self, task_ids: list, user_id: str):
+        """Delete several tasks in one batch"""
+        found = {task_id: task.to_dict() for task_id, task in self.tasks.get_many(user_id, task_ids).items()}
+        if not found:
+            return "No tasks found to delete"
+
+        self.tasks.delete_many(user_id, list(found), befores=found)
+        self._invalidate_task_candidates(user_id)
+        self.bump_data_version(user_id)
+
+        names = ", ".join(f"'{data.get('name', '')}'" for data in found.values())
+        return f"Deleted {len(found)} task{'s' if len(found) != 1 else ''}: {names}"
+
+    def move_tasks(self, task_ids: list, destination_folder: str, user_id: str):
+        """Move several tasks to another folder in one batch"""
+        dest_id = destination_folder.lower().replace(" ", "_")
+
+        if not self._get_user_folders_ref(user_id).document(dest_id).get().exists:
+            return f"Folder '{destination_folder}' doesn't exist"
+
+        found = {task_id: task.to_dict() for task_id, task in self.tasks.get_many(user_id, task_ids).items()}
+        if not found:
+            return "No tasks found to move"
+
+        self.tasks.update_many(user_id, list(found), {'folder': dest_id, 'updated_at': firestore.SERVER_TIMESTAMP},
+                               befores=found)
+        self._invalidate_task_candidates(user_id)
+        self.bump_data_version(user_id)
+
+        names = ", ".join(f"'{data.get('name', '')}'" for data in found.values())
+        return f"Moved {len(found)} task{'s' if len(found) != 1 else ''} to {destination_folder}: {names}"
+
     # ============================================
     # QUERY OPERATIONS (UPDATED WITH USER_ID)
     # ============================================
     
-    def get_all_tasks(self, user_id: str):
-        """Get all tasks for specific user (for comprehensive analysis)"""
-        tasks = self._get_user_tasks_ref(user_id).stream()
-        task_list = []
-        
-        for task in tasks:
-            task_data = task.to_dict()
-            task_list.append(self._format_task_data(task.id, task_data))
-        
-        return task_list
+    def stream_tasks(self, user_id: str, fields: str = "full", folder: str = None, completed: bool = None,
+                     is_high_priority: bool = None, due_before: str = None, due_after: str = None):
+        """
+        Stream a user's task documents, downloading only the named field set.
+
+        Filters run in the task store (SQL on Postgres; indexed queries on
+        Firestore, see firestore.indexes.json).
+
+        Args:
+            user_id: Firebase UID of the user
+            fields: Key of TASK_FIELD_SETS ("name+completed", "analytics", "full", ...)
+            folder: Optional folder id to restrict the query to
+            completed / is_high_priority: Optional equality filters
+            due_before / due_after: Optional inclusive YYYY-MM-DD bounds on due_date
+        """
+        return self.tasks.stream(user_id, fields, folder=folder, completed=completed,
+                                 is_high_priority=is_high_priority, due_before=due_before, due_after=due_after)
+
+    def count_tasks(self, user_id: str, folder: str = None, completed: bool = None, is_high_priority: bool = None,
+                    due_before: str = None, due_after: str = None) -> int:
+        """Number of tasks matching the filters, counted by the task store"""
+        return self.tasks.count(user_id, folder=folder, completed=completed, is_high_priority=is_high_priority,
+                                due_before=due_before, due_after=due_after)
+
+    def query_tasks(self, user_id: str, query, fields: str = "analytics", limit: int = 15, cursor: str = None):
+        """
+        One page of tasks for a planned filter (utils/task_query.TaskQuery).
+
+        Args:
+            user_id: Firebase UID of the user
+            query: TaskQuery built from the filter arguments
+            fields: Key of TASK_FIELD_SETS
+            limit: Page size
+            cursor: next_cursor returned by the previous page
+
+        Returns:
+            (list of Task, next_cursor or None when there are no more matches)
+
+        Raises:
+            ValueError: if cursor was not produced by the same kind of query
+        """
+        return query.run(self.tasks, user_id, fields=fields, limit=limit, cursor=cursor)
+
+    def get_task_stats(self, user_id: str, today: str = None) -> dict:
+        """
+        Per-user task counters (a single document read on Firestore).
+
+        Args:
+            user_id: Firebase UID of the user
+            today: User's local date (YYYY-MM-DD); when given, includes 'overdue'
+
+        Returns:
+            {'total', 'completed', 'high_priority_pending', 'folders': {id: {'total', 'completed'}}[, 'overdue']}
+        """
+        return self.tasks.stats(user_id, today)
+
+    def get_task_rollups(self, user_id: str, timezone: str = "UTC") -> dict:
+        """
+        Per-user analytics rollups bucketed in the user's timezone (a single
+        document read on Firestore; see utils/task_rollups.py for the shape).
+
+        Args:
+            user_id: Firebase UID of the user
+            timezone: User's timezone (from UserProfile)
+        """
+        return self.tasks.rollups(user_id, timezone)
+
+    def list_tasks_page(self, user_id: str, fields: str = "full", folder: str = None,
+                        limit: int = None, start_after: str = None):
+        """
+        One page of a user's tasks in stable document-id order.
+
+        Args:
+            user_id: Firebase UID of the user
+            fields: Key of TASK_FIELD_SETS
+            folder: Optional folder id to restrict the query to
+            limit: Page size (None = everything after the cursor)
+            start_after: Task id cursor returned as next_cursor by the previous page
+
+        Returns:
+            (list of task snapshots, next_cursor or None when this is the last page)
+        """
+        return self.tasks.page(user_id, fields, folder=folder, limit=limit, start_after=start_after)
+
+    def get_task_changes(self, user_id: str, since: str = None, fields: str = "mobile"):
+        """
+        Tasks created, updated or deleted after a sync cursor.
+
+        Args:
+            user_id: Firebase UID of the user
+            since: next_cursor from the previous sync (None = initial full sync)
+            fields: Key of TASK_FIELD_SETS for the returned task documents
+
+        Returns:
+            {
+                'created': [task snapshots created after the cursor],
+                'updated': [task snapshots changed, but created before the cursor],
+                'deleted': [task ids deleted after the cursor],
+                'next_cursor': opaque string for the next call,
+                'full_resync': True when the cursor predates tombstone retention
+                               (everything is in 'created'; drop local tasks not in it),
+            }
+
+        Raises:
+            ValueError: if since is not a cursor produced by this method
+        """
+        full_resync = False
+        if since:
+            cutoff = datetime.now(pytz.UTC) - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+            if self.tasks.cursor_time(since) < cutoff:
+                # Deletions that old may have been pruned: a delta could miss them
+                since, full_resync = None, True
+
+        changes = self.tasks.changes(user_id, since, fields)
+        since_time = changes['since_time']
+
+        created, updated = [], []
+        for task in changes['tasks']:
+            task_created = task.to_dict().get('created_at')
+            if since_time is None or (isinstance(task_created, datetime) and task_created > since_time):
+                created.append(task)
+            else:
+                updated.append(task)
+
+        return {
+            'created': created,
+            'updated': updated,
+            'deleted': changes['deleted'],
+            'next_cursor': changes['next_cursor'],
+            'full_resync': full_resync,
+        }
+
+    def get_task_models(self, user_id: str, fields: str = "full", **filters):
+        """
+        Get a user's tasks as compact Task objects (epoch timestamps, due-date ordinals).
+
+        Used by analysis code that never needs ISO strings; same filters as
+        get_all_tasks.
+        """
+        return [Task.from_document(task.id, task.to_dict())
+                for task in self.stream_tasks(user_id, fields=fields, **filters)]
+
+    def get_all_tasks(self, user_id: str, fields: str = "full", **filters):
+        """
+        Get all tasks for specific user (for comprehensive analysis).
+
+        Keyword filters (completed, folder, is_high_priority, due_before,
+        due_after) are passed to stream_tasks and applied by the task store.
+        """
+        return [task.to_dict() for task in self.get_task_models(user_id, fields=fields, **filters)]
     
     def get_task_by_name(self, task_name: str, user_id: str):
         """Get a specific task by name for specific user"""
         if not task_name or not task_name.strip():
             return None
 
-        task_name = task_name.strip()
-
-        # Try exact match first
-        tasks_ref = self._get_user_tasks_ref(user_id)
-        task_query = tasks_ref.where('name', '==', task_name).limit(1)
-        task_docs = list(task_query.stream())
-
-        if task_docs:
-            task_doc = task_docs[0]
-            return self._format_task_data(task_doc.id, task_doc.to_dict())
-
-        # Case-insensitive search
-        all_tasks = tasks_ref.stream()
-        for task in all_tasks:
-            task_data = task.to_dict()
-            if task_data['name'].lower() == task_name.lower():
-                return self._format_task_data(task.id, task_data)
-
-        return None
+        # Exact match first, then case-insensitive
+        task = self.tasks.find_by_name(user_id, task_name.strip())
+        if task is None:
+            return None
+        return self._format_task_data(task.id, task.to_dict())
     
     # ============================================
     # INTERNAL HELPERS
@@ -615,19 +850,7 @@ class FirebaseClient:
         Format task data with proper timestamp conversion.
         Converts Firestore Timestamps to ISO strings (UTC).
         """
-        return {
-            'id': task_id,
-            'name': task_data.get('name'),
-            'folder': task_data.get('folder'),
-            'completed': task_data.get('completed', False),
-            'recurrence': task_data.get('recurrence'),
-            'time': task_data.get('time'),
-            'duration': task_data.get('duration'),
-            'is_high_priority': task_data.get('is_high_priority', False),
-            'created_at': self._timestamp_to_iso(task_data.get('created_at')),
-            'completed_at': self._timestamp_to_iso(task_data.get('completed_at')),
-            'due_date': self._timestamp_to_iso(task_data.get('due_date')),
-        }
+        return Task.from_document(task_id, task_data).to_dict()
     
     def _timestamp_to_iso(self, timestamp):
         """Convert Firestore timestamp to ISO UTC string"""
@@ -667,29 +890,131 @@ class FirebaseClient:
             return None
 
 
-def firebase_retry(max_attempts=3, delay=1):
-    """Decorator to retry Firebase operations on connection errors"""
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            last_error = None
-            for attempt in range(max_attempts):
+# ============================================
+# PROCESS-WIDE CLIENT REGISTRY
+# ============================================
+# firebase_admin, the Firestore client and the FirebaseClient wrapper are each
+# created at most once per process, on first use. Every module (tools, agents,
+# UserProfile, auth) goes through these getters instead of initialising its own.
+
+# "firestore" (default) or "memory" — see utils/memory_firestore.py
+STORAGE_BACKEND = os.getenv("VOICELOG_STORAGE", "firestore").lower()
+
+_registry_lock = threading.Lock()
+_firebase_app = None
+_firestore_db = None
+_firebase_client = None
+
+
+def _load_credentials(cred_path: str = None):
+    """Service-account credentials from FIREBASE_CREDENTIALS_JSON or a local file"""
+    if os.getenv('FIREBASE_CREDENTIALS_JSON'):
+        # Running on Render - credentials in environment variable
+        print(f"   🌐 Using environment credentials")
+        return credentials.Certificate(json.loads(os.getenv('FIREBASE_CREDENTIALS_JSON')))
+
+    # Running locally - use file path
+    if cred_path is None:
+        cred_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "firebase-credentials.json")
+    if not os.path.exists(cred_path):
+        raise FileNotFoundError(f"❌ Credentials file not found: {cred_path}")
+
+    print(f"   📄 Loading credentials from: {cred_path}")
+    return credentials.Certificate(cred_path)
+
+
+def _default_task_repository(db):
+    """Task store selected by VOICELOG_TASK_STORE"""
+    if TASK_STORE == "postgres":
+        from utils.postgres_task_repository import get_postgres_task_repository
+        return get_postgres_task_repository()
+    return FirestoreTaskRepository(db)
+
+
+def get_task_repository(db=None):
+    """Task store for agents that hold their own Firestore client (shared one if db is None)"""
+    if db is None:
+        return get_firebase_client().tasks
+    return _default_task_repository(db)
+
+
+def get_firebase_app(cred_path: str = None):
+    """
+    Initialise the Firebase Admin SDK once per process and return the app.
+
+    Args:
+        cred_path: Optional credentials file, only used if the SDK isn't initialised yet
+    """
+    global _firebase_app
+    if _firebase_app is not None:
+        return _firebase_app
+
+    with _registry_lock:
+        if _firebase_app is None:
+            if firebase_admin._apps:
+                _firebase_app = firebase_admin.get_app()
+            else:
+                print(f"\n{'='*80}")
+                print(f"🔧 INITIALIZING FIREBASE")
                 try:
-                    return func(*args, **kwargs)
+                    _firebase_app = firebase_admin.initialize_app(_load_credentials(cred_path))
                 except Exception as e:
-                    last_error = e
-                    error_str = str(e).lower()
-                    
-                    # Only retry on connection/timeout errors
-                    if any(x in error_str for x in ['timeout', 'unavailable', 'deadline', 'connection']):
-                        if attempt < max_attempts - 1:
-                            print(f"⚠️  Firebase retry {attempt + 1}/{max_attempts}: {e}")
-                            time.sleep(delay)
-                            continue
-                    
-                    # Don't retry other errors (like permission denied)
+                    print(f"❌ FIREBASE INITIALIZATION FAILED: {type(e).__name__}: {e}")
                     raise
-            
-            raise last_error
-        return wrapper
-    return decorator
\ No newline at end of file
+                print(f"✅ Firebase initialized (project: {_firebase_app.project_id})")
+                print(f"{'='*80}\n")
+    return _firebase_app
+
+
+def get_firestore_db(cred_path: str = None):
+    """
+    Shared Firestore client (initialises Firebase on first call).
+
+    With VOICELOG_STORAGE=memory this is an in-process MemoryFirestore instead,
+    so benchmarks and load tests run without credentials or a Firebase project.
+
+    Either way it is wrapped in ResilientFirestore: backoff retries, the
+    per-request deadline and optional hedged reads (utils/firestore_resilience.py).
+    """
+    global _firestore_db
+    if _firestore_db is None:
+        if STORAGE_BACKEND == "memory":
+            from utils.memory_firestore import MemoryFirestore
+            with _registry_lock:
+                if _firestore_db is None:
+                    print(f"🧪 Using in-memory Firestore (VOICELOG_STORAGE=memory)")
+                    _firestore_db = ResilientFirestore(MemoryFirestore())
+            return _firestore_db
+
+        app = get_firebase_app(cred_path)
+        with _registry_lock:
+            if _firestore_db is None:
+                _firestore_db = ResilientFirestore(firestore.client(app))
+    return _firestore_db
+
+
+def use_firestore_db(db):
+    """
+    Swap the process-wide Firestore client (e.g. a MemoryFirestore for benchmarks).
+
+    Resets the shared FirebaseClient and the duplicate-check cache so nothing
+    keeps pointing at the previous backend. Objects that already captured a db
+    (UserProfile, agents) must be rebuilt after calling this.
+    """
+    global _firestore_db, _firebase_client
+    with _registry_lock:
+        _firestore_db = db
+        _firebase_client = None
+        _TASK_CANDIDATE_CACHE.clear()
+
+
+def get_firebase_client() -> FirebaseClient:
+    """Shared FirebaseClient for the whole process"""
+    global _firebase_client
+    if _firebase_client is None:
+        db = get_firestore_db()
+        with _registry_lock:
+            if _firebase_client is None:
+                _firebase_client = FirebaseClient(db)
+    return _firebase_client
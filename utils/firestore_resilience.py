@@ -0,0 +1,419 @@
+# utils/firestore_resilience.py
+"""
+Firestore Resilience Layer
+
+get_firestore_db() hands out the Firestore client wrapped in ResilientFirestore,
+so every call made through it (FirebaseClient, task repository, UserProfile,
+agents) gets:
+
+    • Retries with exponential backoff + full jitter on transient errors
+      (UNAVAILABLE, RESOURCE_EXHAUSTED, ABORTED; reads also DEADLINE_EXCEEDED,
+      INTERNAL, connection resets).
+      A write that failed with UNAVAILABLE may still have been applied, so
+      retrying it is only safe when applying it twice is harmless. Writes
+      that aren't (Increment counters — the stats/rollups deltas and
+      data_version — and collection.add auto-ids) are retried only on
+      RESOURCE_EXHAUSTED / ABORTED, where the server rejected the request.
+    • A per-request deadline (contextvar). app.py opens one per HTTP request;
+      each attempt's RPC timeout is capped at what's left (and at
+      FIRESTORE_ATTEMPT_TIMEOUT_SECONDS for single-document calls), and once
+      it's spent the call fails fast with FirestoreDeadlineExceeded instead of
+      hanging until gunicorn kills the worker. Streaming reads (stream,
+      get_all) are only bounded by the request deadline: they're materialised
+      whole, so a fixed per-attempt cap would fail big scans every time.
+      Outside a deadline (scripts, background jobs) no timeout is imposed.
+    • Optional hedged reads (FIRESTORE_HEDGED_READS=true): if a read is still
+      running after the p95 latency seen for that collection, an identical
+      second read is sent and whichever answers first wins.
+
+Environment:
+    FIRESTORE_MAX_ATTEMPTS             (default 4)
+    FIRESTORE_BACKOFF_BASE_SECONDS     (default 0.1)
+    FIRESTORE_BACKOFF_MAX_SECONDS      (default 2.0)
+    FIRESTORE_ATTEMPT_TIMEOUT_SECONDS  (default 10)
+    FIRESTORE_REQUEST_DEADLINE_SECONDS (default 90, below gunicorn's 120s timeout)
+    FIRESTORE_HEDGED_READS             (default false)
+"""
+
+import os
+import time
+import random
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, wait, FIRST_COMPLETED
+
+from google.api_core import exceptions as gexc
+from google.cloud.firestore_v1 import transforms
+
+MAX_ATTEMPTS = int(os.getenv("FIRESTORE_MAX_ATTEMPTS", "4"))
+BACKOFF_BASE_SECONDS = float(os.getenv("FIRESTORE_BACKOFF_BASE_SECONDS", "0.1"))
+BACKOFF_MAX_SECONDS = float(os.getenv("FIRESTORE_BACKOFF_MAX_SECONDS", "2.0"))
+ATTEMPT_TIMEOUT_SECONDS = float(os.getenv("FIRESTORE_ATTEMPT_TIMEOUT_SECONDS", "10"))
+REQUEST_DEADLINE_SECONDS = float(os.getenv("FIRESTORE_REQUEST_DEADLINE_SECONDS", "90"))
+HEDGED_READS = os.getenv("FIRESTORE_HEDGED_READS", "false").lower() == "true"
+
+# Hedging needs a stable p95 first; below this many samples reads are never hedged
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY_SECONDS = 0.02
+LATENCY_WINDOW = 200
+
+# The server rejected the request: nothing was applied, any write may be retried
+REJECTED_WRITE_ERRORS = (
+    gexc.TooManyRequests,      # RESOURCE_EXHAUSTED
+    gexc.Aborted,
+)
+# The write may or may not have been applied: retry only writes that are safe to apply twice
+RETRYABLE_WRITE_ERRORS = REJECTED_WRITE_ERRORS + (
+    gexc.ServiceUnavailable,
+)
+# Reads have no side effects, so timeouts and server errors are retryable too
+RETRYABLE_READ_ERRORS = RETRYABLE_WRITE_ERRORS + (
+    gexc.DeadlineExceeded,
+    gexc.InternalServerError,
+    gexc.GatewayTimeout,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class FirestoreDeadlineExceeded(TimeoutError):
+    """The request's Firestore time budget ran out (retries included)"""
+
+
+# ============================================
+# PER-REQUEST DEADLINE
+# ============================================
+
+_deadline = contextvars.ContextVar("firestore_deadline", default=None)
+
+
+def start_request_deadline(seconds: float = None):
+    """Start a deadline for the current request/context; returns a token for end_request_deadline()"""
+    return _deadline.set(time.monotonic() + (REQUEST_DEADLINE_SECONDS if seconds is None else seconds))
+
+
+def end_request_deadline(token):
+    _deadline.reset(token)
+
+
+@contextmanager
+def firestore_deadline(seconds: float = None):
+    """Scope a deadline around a block (background jobs, scripts)"""
+    token = start_request_deadline(seconds)
+    try:
+        yield
+    finally:
+        end_request_deadline(token)
+
+
+def remaining_time():
+    """Seconds left in the current deadline, or None when there isn't one"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+# ============================================
+# LATENCY TRACKING + STATS
+# ============================================
+
+class _LatencyWindow:
+    """Recent successful call latencies for one operation label"""
+    __slots__ = ('samples', 'lock')
+
+    def __init__(self):
+        self.samples = deque(maxlen=LATENCY_WINDOW)
+        self.lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def p95(self):
+        with self.lock:
+            if len(self.samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+
+_latencies = {}
+_latencies_lock = threading.Lock()
+
+_stats = {'calls': 0, 'retries': 0, 'hedges': 0, 'hedge_wins': 0, 'deadline_exceeded': 0}
+_stats_lock = threading.Lock()
+
+
+def _window(label: str) -> _LatencyWindow:
+    window = _latencies.get(label)
+    if window is None:
+        with _latencies_lock:
+            window = _latencies.setdefault(label, _LatencyWindow())
+    return window
+
+
+def _count(key: str):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def get_resilience_stats() -> dict:
+    """Counters since process start, plus current p95 per operation (seconds)"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['p95'] = {label: window.p95() for label, window in list(_latencies.items())}
+    return stats
+
+
+# ============================================
+# CALL EXECUTION
+# ============================================
+
+_hedge_pool = None
+_hedge_pool_lock = threading.Lock()
+
+
+def _get_hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_pool
+    if _hedge_pool is None:
+        with _hedge_pool_lock:
+            if _hedge_pool is None:
+                _hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="firestore-hedge")
+    return _hedge_pool
+
+
+def _backoff(attempt: int) -> float:
+    """Full jitter: uniform in [0, min(max, base * 2^attempt)]"""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+def _attempt_timeout(streaming: bool = False):
+    """RPC timeout for the next attempt: None (no cap) outside a request deadline"""
+    remaining = remaining_time()
+    if remaining is None or streaming:
+        return remaining
+    return min(ATTEMPT_TIMEOUT_SECONDS, remaining)
+
+
+def _is_idempotent(value) -> bool:
+    """False when write data holds an Increment (applying it twice double-counts)"""
+    if isinstance(value, transforms.Increment):
+        return False
+    if isinstance(value, dict):
+        return all(_is_idempotent(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return all(_is_idempotent(v) for v in value)
+    return True
+
+
+def _timed(label: str, call):
+    start = time.monotonic()
+    result = call()
+    _window(label).add(time.monotonic() - start)
+    return result
+
+
+def _hedged(label: str, call):
+    """Run a read; if it outlives the label's p95, race an identical second read"""
+    threshold = _window(label).p95()
+    if threshold is None:
+        return _timed(label, call)
+
+    pool = _get_hedge_pool()
+    # Each submit gets its own context copy so both attempts see the request deadline
+    primary = pool.submit(contextvars.copy_context().run, _timed, label, call)
+    try:
+        return primary.result(timeout=max(threshold, HEDGE_MIN_DELAY_SECONDS))
+    except FutureTimeout:
+        pass
+
+    _count('hedges')
+    hedge = pool.submit(contextvars.copy_context().run, _timed, label, call)
+    pending = {primary, hedge}
+    first_error = None
+    while pending:
+        done, pending = wait(pending, timeout=remaining_time(), return_when=FIRST_COMPLETED)
+        if not done:
+            raise FirestoreDeadlineExceeded(f"Firestore {label} exceeded the request deadline")
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    _count('hedge_wins')
+                return future.result()
+            first_error = first_error or future.exception()
+    raise first_error
+
+
+def run_with_retry(label: str, call, is_read: bool, idempotent: bool = True, streaming: bool = False):
+    """
+    Run call(timeout) with backoff retries inside the current deadline.
+
+    Args:
+        label: Operation name for latency tracking ("tasks.stream", ...)
+        call: Callable taking the per-attempt RPC timeout in seconds (None = no timeout)
+        is_read: Reads retry on more error types and may be hedged
+        idempotent: False for writes that must not be applied twice (retried only when rejected)
+        streaming: Whole-result reads (stream / get_all); no per-attempt cap
+    """
+    if is_read:
+        retryable = RETRYABLE_READ_ERRORS
+    else:
+        retryable = RETRYABLE_WRITE_ERRORS if idempotent else REJECTED_WRITE_ERRORS
+    _count('calls')
+
+    for attempt in range(MAX_ATTEMPTS):
+        timeout = _attempt_timeout(streaming)
+        if timeout is not None and timeout <= 0:
+            _count('deadline_exceeded')
+            raise FirestoreDeadlineExceeded(f"Firestore {label}: request deadline already spent")
+
+        try:
+            if is_read and HEDGED_READS:
+                return _hedged(label, lambda: call(timeout))
+            return _timed(label, lambda: call(timeout))
+        except FirestoreDeadlineExceeded:
+            # A TimeoutError too, but the budget is gone: retrying can't help
+            _count('deadline_exceeded')
+            raise
+        except retryable as e:
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+
+            delay = _backoff(attempt)
+            remaining = remaining_time()
+            if remaining is not None and delay >= remaining:
+                _count('deadline_exceeded')
+                raise FirestoreDeadlineExceeded(f"Firestore {label}: no time left to retry ({e})") from e
+
+            _count('retries')
+            print(f"⚠️  Firestore {label} retry {attempt + 1}/{MAX_ATTEMPTS - 1} in {delay * 1000:.0f}ms: "
+                  f"{type(e).__name__}: {e}")
+            time.sleep(delay)
+
+
+# ============================================
+# CLIENT PROXIES
+# ============================================
+
+# Methods that build another reference/query locally (no RPC)
+_NAVIGATION_METHODS = {
+    'collection', 'document', 'where', 'order_by', 'limit', 'limit_to_last', 'offset', 'select',
+    'start_at', 'start_after', 'end_at', 'end_before', 'count', 'sum', 'avg',
+    'collection_group',
+}
+_READ_METHODS = {'get', 'get_all', 'stream', 'list_documents', 'collections'}
+_WRITE_METHODS = {'set', 'update', 'delete', 'create', 'add'}
+
+
+def _unwrap(value):
+    """Hand the SDK its own objects back (refs inside cursors, batch args, ...)"""
+    if isinstance(value, _ResilientProxy):
+        return value._target
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_unwrap(v) for v in value]
+    return value
+
+
+class _ResilientProxy:
+    """Wraps a Firestore client/reference/query; RPC methods go through run_with_retry"""
+
+    def __init__(self, target, label: str):
+        self._target = target
+        self._label = label
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        if name == 'batch':
+            return lambda *a, **kw: _ResilientBatch(attr(*a, **kw), self._label)
+
+        if name in _NAVIGATION_METHODS:
+            def navigate(*args, **kwargs):
+                label = args[0] if name in ('collection', 'collection_group') and args else self._label
+                return _ResilientProxy(attr(*[_unwrap(a) for a in args], **_unwrap(kwargs)), label)
+            return navigate
+
+        if name in _READ_METHODS or name in _WRITE_METHODS:
+            is_read = name in _READ_METHODS
+
+            def rpc(*args, **kwargs):
+                args = [_unwrap(a) for a in args]
+                kwargs = _unwrap(kwargs)
+
+                def call(timeout):
+                    kw = {'retry': None, 'timeout': timeout, **kwargs}
+                    if name in ('stream', 'get_all'):
+                        # Materialise so retries/hedges cover the whole read, not just the first page
+                        return list(attr(*args, **kw))
+                    return attr(*args, **kw)
+
+                streaming = name in ('stream', 'get_all')
+                # collection.add() picks a new id per attempt: a retry after an applied add duplicates it
+                idempotent = is_read or (name != 'add' and _is_idempotent(args) and _is_idempotent(kwargs))
+                result = run_with_retry(f"{self._label}.{name}", call, is_read,
+                                        idempotent=idempotent, streaming=streaming)
+                return iter(result) if name in ('stream', 'get_all') else result
+            return rpc
+
+        return attr
+
+    def __eq__(self, other):
+        return _unwrap(other) == self._target
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __repr__(self):
+        return f"<Resilient {self._target!r}>"
+
+
+class _ResilientBatch:
+    """Staging calls pass straight through; commit() is retried as a write (idempotent unless an Increment was staged)"""
+
+    def __init__(self, batch, label: str):
+        self._batch = batch
+        self._label = label
+        self._idempotent = True
+
+    def set(self, reference, document_data, merge=False):
+        self._idempotent = self._idempotent and _is_idempotent(document_data)
+        self._batch.set(_unwrap(reference), document_data, merge=merge)
+        return self
+
+    def update(self, reference, field_updates, *args, **kwargs):
+        self._idempotent = self._idempotent and _is_idempotent(field_updates)
+        self._batch.update(_unwrap(reference), field_updates, *args, **kwargs)
+        return self
+
+    def delete(self, reference, *args, **kwargs):
+        self._batch.delete(_unwrap(reference), *args, **kwargs)
+        return self
+
+    def create(self, reference, document_data):
+        self._batch.create(_unwrap(reference), document_data)
+        return self
+
+    def commit(self, **kwargs):
+        return run_with_retry(
+            "batch.commit",
+            lambda timeout: self._batch.commit(**{'retry': None, 'timeout': timeout, **kwargs}),
+            is_read=False,
+            idempotent=self._idempotent,
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._batch, name)
+
+
+class ResilientFirestore(_ResilientProxy):
+    """Drop-in wrapper for a firestore.Client (or MemoryFirestore)"""
+
+    def __init__(self, client):
+        super().__init__(client, "db")
@@ -0,0 +1,136 @@
+# utils/folder_lexicon.py
+"""
+Folder Category Lexicon
+
+Offline semantic layer for folder references. "workout stuff" shares no
+characters with "Health", but both belong to the health category here, so
+IntentResolver.resolve_folder can match them without an LLM turn.
+
+Each category lists the names people give folders for it (aliases) and the
+words they use for things in it (terms). A word can belong to more than one
+category ("run" is health and errands). The per-user half of the semantic
+layer — which words a user's own tasks put in which folder — lives in
+IntentResolver, learned from the task name index.
+"""
+
+import re
+
+FOLDER_CATEGORIES = {
+    "health": {
+        "aliases": {"health", "fitness", "wellness", "gym", "workout", "workouts", "exercise", "training",
+                    "medical", "selfcare", "self-care", "body", "sport", "sports"},
+        "terms": {"workout", "exercise", "gym", "run", "running", "jog", "yoga", "pilates", "swim", "cardio",
+                  "lift", "lifting", "weights", "squat", "squats", "press", "bench", "deadlift", "pushups",
+                  "pullups", "stretch", "stretching", "steps", "walk", "hike", "bike", "cycling", "doctor",
+                  "dentist", "physio", "therapy", "therapist", "medicine", "meds", "pills", "prescription",
+                  "vitamins", "checkup", "appointment", "sleep", "meditate", "meditation", "diet", "calories",
+                  "protein", "water", "hydrate", "health", "fitness", "training", "reps", "sets", "lbs", "kg"},
+    },
+    "work": {
+        "aliases": {"work", "job", "office", "career", "business", "professional", "clients", "projects"},
+        "terms": {"meeting", "meetings", "email", "emails", "report", "reports", "deadline", "client", "clients",
+                  "boss", "manager", "team", "presentation", "slides", "deck", "standup", "review", "invoice",
+                  "proposal", "project", "projects", "sprint", "ticket", "tickets", "deploy", "code", "pr",
+                  "interview", "hiring", "colleague", "coworker", "office", "call", "calls", "sync", "okr",
+                  "quarterly", "budget", "spreadsheet", "expense", "expenses", "work", "job", "career"},
+    },
+    "school": {
+        "aliases": {"school", "study", "studies", "college", "university", "uni", "class", "classes",
+                    "courses", "homework", "academics", "education", "learning"},
+        "terms": {"homework", "assignment", "assignments", "essay", "exam", "exams", "test", "quiz", "lecture",
+                  "lectures", "class", "course", "chapter", "read", "reading", "study", "studying", "professor",
+                  "teacher", "thesis", "paper", "lab", "notes", "revise", "revision", "textbook", "syllabus",
+                  "semester", "midterm", "final", "finals", "grade", "tutor", "learn", "practice"},
+    },
+    "finance": {
+        "aliases": {"finance", "finances", "money", "bills", "budget", "banking", "taxes", "financial"},
+        "terms": {"pay", "bill", "bills", "rent", "mortgage", "tax", "taxes", "bank", "budget", "invoice",
+                  "insurance", "loan", "credit", "debit", "card", "savings", "invest", "investing", "stocks",
+                  "salary", "refund", "receipt", "receipts", "subscription", "subscriptions", "electricity",
+                  "utilities", "payment", "transfer", "money", "cash", "accountant"},
+    },
+    "home": {
+        "aliases": {"home", "house", "household", "chores", "apartment", "cleaning", "family", "domestic"},
+        "terms": {"clean", "cleaning", "laundry", "dishes", "vacuum", "vacuuming", "mop", "dust", "trash",
+                  "garbage", "recycling", "cook", "cooking", "dinner", "lunch", "breakfast", "fix", "repair",
+                  "plumber", "garage", "garden", "gardening", "plants", "water", "lawn", "mow", "furniture",
+                  "kitchen", "bathroom", "bedroom", "closet", "organize", "declutter", "chores", "house",
+                  "home", "pet", "dog", "cat", "feed", "kids", "mom", "dad", "family", "faucet"},
+    },
+    "shopping": {
+        "aliases": {"shopping", "groceries", "grocery", "errands", "shop", "buy", "purchases", "to buy"},
+        "terms": {"buy", "purchase", "order", "groceries", "grocery", "milk", "eggs", "bread", "store",
+                  "supermarket", "shop", "shopping", "pickup", "pick", "return", "amazon", "gift", "gifts",
+                  "present", "errand", "errands", "flour", "sugar", "vegetables", "fruit", "snacks"},
+    },
+    "travel": {
+        "aliases": {"travel", "trips", "trip", "vacation", "holiday", "holidays", "travelling", "traveling"},
+        "terms": {"flight", "flights", "hotel", "booking", "book", "passport", "visa", "pack", "packing",
+                  "luggage", "suitcase", "airport", "train", "itinerary", "trip", "vacation", "holiday",
+                  "airbnb", "tickets", "car", "rental", "travel", "tour"},
+    },
+    "social": {
+        "aliases": {"social", "friends", "events", "personal", "people", "relationships"},
+        "terms": {"birthday", "party", "friends", "friend", "dinner", "drinks", "coffee", "date", "wedding",
+                  "gift", "call", "text", "visit", "meet", "hangout", "invite", "rsvp", "celebrate"},
+    },
+    "hobbies": {
+        "aliases": {"hobbies", "hobby", "fun", "leisure", "creative", "music", "art", "side projects"},
+        "terms": {"guitar", "piano", "music", "song", "paint", "painting", "draw", "drawing", "photo",
+                  "photography", "game", "games", "gaming", "movie", "movies", "book", "books", "novel",
+                  "knit", "craft", "write", "writing", "blog", "podcast", "practice", "scales", "chess"},
+    },
+}
+
+# Words that describe a reference rather than its topic ("workout stuff", "money things")
+FILLER_WORDS = frozenset({
+    "stuff", "things", "thing", "related", "folder", "folders", "list", "lists", "items", "item",
+    "category", "section", "tasks", "task", "todos", "todo", "to-dos", "my", "the", "for", "all", "some",
+})
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9'\-]*")
+
+
+def word_forms(word: str) -> set:
+    """word plus naive singular forms (workouts → workout, groceries → grocery)"""
+    forms = {word}
+    if word.endswith("ies") and len(word) > 4:
+        forms.add(word[:-3] + "y")
+    elif word.endswith("es") and len(word) > 4:
+        forms.update((word[:-2], word[:-1]))
+    elif word.endswith("s") and len(word) > 3:
+        forms.add(word[:-1])
+    return forms
+
+
+def topic_words(text: str) -> list:
+    """Lowercase words of text without filler words"""
+    return [w for w in _WORD.findall(text.lower()) if w not in FILLER_WORDS]
+
+
+# word → categories it points to, built once from the lexicon
+_TERM_CATEGORIES = {}
+_ALIAS_CATEGORIES = {}
+for _category, _entry in FOLDER_CATEGORIES.items():
+    for _term in _entry["terms"] | _entry["aliases"]:
+        _TERM_CATEGORIES.setdefault(_term, set()).add(_category)
+    for _alias in _entry["aliases"]:
+        _ALIAS_CATEGORIES.setdefault(_alias, set()).add(_category)
+
+
+def word_categories(word: str) -> set:
+    """Categories a reference word points to (via terms or aliases)"""
+    categories = set()
+    for form in word_forms(word):
+        categories |= _TERM_CATEGORIES.get(form, set())
+    return categories
+
+
+def folder_categories(folder_name: str) -> set:
+    """Categories a folder name belongs to (whole name or any word as an alias)"""
+    name = folder_name.lower().strip().replace("_", " ")
+    categories = set(_ALIAS_CATEGORIES.get(name, set()))
+    for word in topic_words(name):
+        for form in word_forms(word):
+            categories |= _ALIAS_CATEGORIES.get(form, set())
+    return categories
@@ -3,12 +3,79 @@
 Intent Resolution Layer
 Translates natural language → exact Firebase entity names
 This runs BEFORE any tool is called
+
+Task names are matched against a per-user NameIndex (utils/name_index.py)
+kept in this process. Each lookup reads the user's data_version; when it
+changed, only the tasks created, updated or deleted since the last sync are
+fetched (the same delta the mobile client uses) and applied to the index.
+Users with many tasks get a trigram shortlist that is then scored exactly;
+smaller task lists are scored in full, as before.
+
+References arrive through speech-to-text, so names are also compared by
+sound (utils/phonetic.py): "shoulder presse" or "cee the dentist" match on
+their phonetic keys when the spelling is off.
+
+Folders are also matched by meaning when no name matches closely: "workout
+stuff" → "Health" through the bundled category lexicon (utils/folder_lexicon.py),
+or through the user's own tasks — if most tasks mentioning "invoice" live in
+"Clients", then "invoice folder" means "Clients".
 """
 
-from utils.firebase_client import FirebaseClient
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+
+from utils.firebase_client import get_firebase_client
+from utils.name_index import NameIndex
+from utils.phonetic import phonetic_similarity
+from utils.folder_lexicon import topic_words, word_categories, folder_categories, word_forms
+from utils.task_model import Task
 from difflib import SequenceMatcher
 from typing import Optional, Dict, List
 
+# Task lists up to this size are scored exhaustively; larger ones via the trigram shortlist
+RESOLVER_SHORTLIST_MIN_TASKS = int(os.getenv("RESOLVER_SHORTLIST_MIN_TASKS", "200"))
+# Candidates taken from the shortlist for exact scoring
+RESOLVER_SHORTLIST_SIZE = int(os.getenv("RESOLVER_SHORTLIST_SIZE", "50"))
+# Full reload backstop for writes that don't bump data_version
+RESOLVER_INDEX_TTL_SECONDS = int(os.getenv("RESOLVER_INDEX_TTL_SECONDS", "600"))
+# Users whose task index is kept in memory (least recently used are dropped)
+RESOLVER_INDEX_MAX_USERS = int(os.getenv("RESOLVER_INDEX_MAX_USERS", "256"))
+
+# Sound-alike matching for transcribed references
+RESOLVER_PHONETIC_ENABLED = os.getenv("RESOLVER_PHONETIC", "true").lower() == "true"
+# Phonetic similarity below this is ignored; above it counts at PHONETIC_WEIGHT
+PHONETIC_MIN_SIMILARITY = 0.75
+PHONETIC_WEIGHT = 0.85
+
+# Semantic folder matching (category lexicon + the user's task/folder co-occurrence)
+RESOLVER_FOLDER_SEMANTICS = os.getenv("RESOLVER_FOLDER_SEMANTICS", "true").lower() == "true"
+# Confidence when every topic word of the reference is in the folder's category
+LEXICON_WEIGHT = 0.8
+# Confidence when every topic word only appears in tasks of that folder
+COOCCURRENCE_WEIGHT = 0.75
+# Tasks a word must appear in before its folder distribution counts
+COOCCURRENCE_MIN_SUPPORT = 2
+# Added when the lexicon and the user's own tasks point at the same folder
+AGREEMENT_BONUS = 0.1
+# Semantic scores stay below a whole-name hit in the reference
+SEMANTIC_MAX_SCORE = 0.89
+# Lexical scores at or above this (substring hits) skip the semantic layer
+SEMANTIC_SKIP_SCORE = 0.9
+
+
+class _UserTaskIndex:
+    """One user's task NameIndex plus where its delta sync left off"""
+
+    def __init__(self, stop_words):
+        self.index = NameIndex(stop_words, phonetic=RESOLVER_PHONETIC_ENABLED)
+        self.version = None
+        self.cursor = None
+        self.loaded_at = time.monotonic()
+        self.lock = threading.Lock()
+
 class IntentResolver:
     """
     Resolves user's natural language references to exact Firebase entities.
@@ -20,69 +87,103 @@ class IntentResolver:
     """
     
     def __init__(self):
-        self.client = FirebaseClient()
-        self._task_cache = None
+        self._task_indexes = OrderedDict()  # user_id → _UserTaskIndex
+        self._indexes_lock = threading.Lock()
         self._folder_cache = None
+
+    @property
+    def client(self):
+        """Shared FirebaseClient (resolved lazily on first use)"""
+        return get_firebase_client()
     
-    def resolve_task_name(self, user_input: str, only_incomplete: bool = False, user_id: str = None) -> Optional[Dict]:
+    def resolve_task(self, user_input: str, only_incomplete: bool = False, user_id: str = None,
+                     limit: int = 5) -> Dict:
         """
-        Find the actual task name from user's natural language.
+        Best task match and the closest alternatives, from one fetch and one scoring pass.
         
         Args:
             user_input: How user describes the task
             only_incomplete: If True, only search incomplete tasks (for mark complete)
                            If False, search ALL tasks (default)
             user_id: Firebase UID of the user
+            limit: Max suggestions to return
         
         Returns:
             {
-                'exact_name': 'Wake up at 5:45 AM',
-                'confidence': 0.85,
-                'id': 'task_123',
-                'folder': 'everyday_to_dos',
-                'completed': False
+                'match': resolve_task_name() result or None,
+                'suggestions': get_task_suggestions() result (best first)
             }
-            or None if no match
         """
         if not user_id:
             raise ValueError("user_id is required")
         
-        # Get all tasks for this user
-        tasks = self.client.get_all_tasks(user_id)
-        
-        # Filter to incomplete only if requested
-        if only_incomplete:
-            tasks = [t for t in tasks if not t.get('completed', False)]
+        entry = self._task_index(user_id)
+        with entry.lock:
+            tasks = self._task_candidates(entry.index, user_input, only_incomplete)
+        return self._resolve_task_in(tasks, user_input, limit)
+    
+    def resolve_many(self, descriptions: List[str], only_incomplete: bool = False, user_id: str = None,
+                     limit: int = 5) -> List[Dict]:
+        """
+        resolve_task() for several references ("laundry, dishes and vacuuming")
+        against one snapshot of the user's tasks: one data_version read and
+        index sync for the whole list instead of one per item.
         
-        if not tasks:
-            return None
+        Each task matches at most one description; when two descriptions pick
+        the same task, the later one takes its next best candidate.
         
-        # Find best match
-        best_match = self._fuzzy_match(
-            user_input,
-            tasks,
-            key_field='name'
-        )
+        Returns:
+            [{'description': ..., 'match': ..., 'suggestions': [...]}, ...] in input order
+        """
+        if not user_id:
+            raise ValueError("user_id is required")
         
-        return best_match
+        entry = self._task_index(user_id)
+        with entry.lock:
+            candidates = [self._task_candidates(entry.index, description, only_incomplete)
+                          for description in descriptions]
+
+        claimed = set()
+        results = []
+        for description, tasks in zip(descriptions, candidates):
+            resolution = self._resolve_task_in(tasks, description, limit, exclude=claimed)
+            if resolution['match']:
+                claimed.add(resolution['match']['id'])
+            results.append({'description': description, **resolution})
+        return results
     
-    def resolve_folder_name(self, user_input: str, user_id: str = None) -> Optional[Dict]:
+    def resolve_task_name(self, user_input: str, only_incomplete: bool = False, user_id: str = None) -> Optional[Dict]:
         """
-        Find the actual folder name from user's natural language.
+        Find the actual task name from user's natural language.
         
         Args:
-            user_input: How user describes the folder
+            user_input: How user describes the task
+            only_incomplete: If True, only search incomplete tasks (for mark complete)
+                           If False, search ALL tasks (default)
             user_id: Firebase UID of the user
         
         Returns:
             {
-                'exact_name': 'Health',
-                'confidence': 0.9,
-                'id': 'health',
-                'emoji': '💪'
+                'exact_name': 'Wake up at 5:45 AM',
+                'confidence': 0.85,
+                'id': 'task_123',
+                'folder': 'everyday_to_dos',
+                'completed': False
             }
             or None if no match
         """
+        return self.resolve_task(user_input, only_incomplete, user_id, limit=0)['match']
+    
+    def resolve_folder(self, user_input: str, user_id: str = None, limit: int = 5) -> Dict:
+        """
+        Best folder match and the closest alternatives, from one fetch and one scoring pass.
+        
+        Returns:
+            {
+                'match': resolve_folder_name() result or None,
+                'suggestions': get_folder_suggestions() result (best first)
+            }
+        """
         if not user_id:
             raise ValueError("user_id is required")
         
@@ -99,26 +200,196 @@ class IntentResolver:
                 })
         except Exception as e:
             print(f"Error fetching folders: {e}")
-            return None
+            return {'match': None, 'suggestions': []}
         
-        if not folders:
-            return None
+        ranked = self._rank(user_input, folders, key_field='name')
+        if RESOLVER_FOLDER_SEMANTICS and ranked and ranked[0][0] < SEMANTIC_SKIP_SCORE:
+            ranked = self._rank_folder_semantics(user_input, ranked, user_id)
         
-        # Find best match
-        best_match = self._fuzzy_match(
-            user_input,
-            folders,
-            key_field='name'
-        )
+        return {
+            'match': self._best_match(ranked, key_field='name'),
+            'suggestions': [{**folder, 'score': score} for score, folder in self._suggestions(ranked, limit)],
+        }
+    
+    def resolve_folder_name(self, user_input: str, user_id: str = None) -> Optional[Dict]:
+        """
+        Find the actual folder name from user's natural language.
+        
+        Args:
+            user_input: How user describes the folder
+            user_id: Firebase UID of the user
         
-        return best_match
+        Returns:
+            {
+                'exact_name': 'Health',
+                'confidence': 0.9,
+                'id': 'health',
+                'emoji': '💪'
+            }
+            or None if no match
+        """
+        return self.resolve_folder(user_input, user_id, limit=0)['match']
     
+    # ============================================
+    # TASK NAME INDEX
+    # ============================================
+
+    def _task_index(self, user_id: str) -> _UserTaskIndex:
+        """
+        The user's task index entry, brought up to date with their data_version.
+
+        Other threads may sync the same index at any time: read entry.index
+        only while holding entry.lock (copy out what you need, score after).
+        """
+        version = self.client.get_data_version(user_id)
+
+        with self._indexes_lock:
+            entry = self._task_indexes.get(user_id)
+            if entry is None or time.monotonic() - entry.loaded_at > RESOLVER_INDEX_TTL_SECONDS:
+                entry = _UserTaskIndex(self.STOP_WORDS)
+                self._task_indexes[user_id] = entry
+            self._task_indexes.move_to_end(user_id)
+            while len(self._task_indexes) > RESOLVER_INDEX_MAX_USERS:
+                self._task_indexes.popitem(last=False)
+
+        with entry.lock:
+            if entry.version != version:
+                # First call: every task; afterwards only what changed since the cursor
+                changes = self.client.get_task_changes(user_id, since=entry.cursor, fields="resolver")
+                if changes['full_resync']:
+                    # Cursor older than tombstone retention: rebuild from the full list
+                    entry.index = NameIndex(self.STOP_WORDS, phonetic=RESOLVER_PHONETIC_ENABLED)
+                for doc in changes['created'] + changes['updated']:
+                    task = Task.from_document(doc.id, doc.to_dict())
+                    entry.index.add(task.id, task.name, task)
+                for task_id in changes['deleted']:
+                    entry.index.remove(task_id)
+                entry.cursor = changes['next_cursor']
+                entry.version = version
+        return entry
+
+    def _resolve_task_in(self, tasks: List[Task], user_input: str, limit: int, exclude=()) -> Dict:
+        """resolve_task() over candidate tasks copied out of the index; tasks whose ids are in exclude can't match"""
+        ranked = self._rank(user_input, tasks, key_field='name')
+        match_ranked = [item for item in ranked if item[1].id not in exclude] if exclude else ranked
+
+        return {
+            'match': self._best_match(match_ranked, key_field='name'),
+            'suggestions': [
+                {
+                    'name': task.name,
+                    'folder': task.folder or '',
+                    'completed': task.completed,
+                    'score': score
+                }
+                for score, task in self._suggestions(ranked, limit)
+            ],
+        }
+
+    def _task_candidates(self, index: NameIndex, user_input: str, only_incomplete: bool = False) -> List[Task]:
+        """
+        Tasks worth scoring for user_input, in task-id order (the store's order,
+        so ties resolve as they always have). Small indexes return every task.
+        Call with the index's lock held; the returned list is the caller's own.
+        """
+        accept = (lambda task: not task.completed) if only_incomplete else None
+        if len(index) <= RESOLVER_SHORTLIST_MIN_TASKS:
+            tasks = [task for task in index.entries.values() if accept is None or accept(task)]
+        else:
+            tasks = [index.entries[task_id]
+                     for task_id in index.shortlist(user_input, RESOLVER_SHORTLIST_SIZE, accept)]
+        return sorted(tasks, key=lambda task: task.id)
+
     # Generic words that appear often and shouldn't drive matching
-    STOP_WORDS = {
+    STOP_WORDS = frozenset({
         'task', 'tasks', 'the', 'a', 'an', 'to', 'for', 'in', 'on', 'at',
         'my', 'me', 'i', 'do', 'it', 'is', 'of', 'and', 'or', 'with',
         'this', 'that', 'from', 'up', 'by', 'be', 'set', 'get', 'new',
-    }
+    })
+
+    # Minimum confidence for a match, and for a suggestion on the disambiguation list
+    MATCH_THRESHOLD = 0.4
+    SUGGESTION_THRESHOLD = 0.2
+
+    def _rank(self, user_input: str, candidates: List, key_field: str) -> List:
+        """
+        Score every candidate once → [(score, candidate)], best first.
+
+        Equal scores keep the candidates' order, so the first of several
+        equally good names wins.
+        """
+        user_lower = user_input.lower().strip()
+        user_words = set(user_lower.split())
+        # Content words = query words minus stop words
+        user_content_words = user_words - self.STOP_WORDS
+
+        ranked = []
+        for candidate in candidates:
+            candidate_text = (self._field(candidate, key_field) or '').lower()
+            ranked.append((self._score(user_lower, user_words, user_content_words, candidate_text), candidate))
+
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return ranked
+
+    def _score(self, user_lower: str, user_words: set, user_content_words: set, candidate_text: str) -> float:
+        """Core fuzzy matching algorithm: 0–1 confidence that candidate_text is what the user means"""
+        candidate_words = set(candidate_text.split())
+
+        # 1. Exact substring match (highest priority)
+        if user_lower in candidate_text:
+            return 0.95
+        # (whole words only: "work" isn't named by "workout stuff" or "homework")
+        if candidate_text and re.search(rf"(?<!\w){re.escape(candidate_text)}(?!\w)", user_lower):
+            return 0.90
+
+        # 2. Fuzzy string similarity (Levenshtein-based)
+        fuzzy_score = SequenceMatcher(None, user_lower, candidate_text).ratio()
+
+        # 3. Keyword overlap — weight content words higher than stop words
+        content_overlap = len(user_content_words & candidate_words)
+        all_overlap = len(user_words & candidate_words)
+        if content_overlap > 0:
+            # Content word matches scored against query size (not max)
+            keyword_score = (content_overlap / max(len(user_content_words), 1)) * 0.90
+        elif all_overlap > 0:
+            # Only stop-word overlap — much lower score
+            keyword_score = (all_overlap / max(len(user_words), len(candidate_words))) * 0.40
+        else:
+            keyword_score = 0.0
+
+        # 4. Partial word matching — only count content words, min 3 chars
+        partial_matches = sum(
+            1 for u_word in user_content_words
+            for c_word in candidate_words
+            if len(u_word) >= 3 and len(c_word) >= 3
+            and (u_word in c_word or c_word in u_word)
+        )
+        partial_score = partial_matches / max(len(user_content_words), 1) * 0.7 if user_content_words else 0.0
+
+        # 5. Sounds alike (speech-to-text misspellings) — strong matches only
+        phonetic_score = self._phonetic_score(user_lower, candidate_text)
+
+        # Take the best score
+        return max(fuzzy_score, keyword_score, partial_score, phonetic_score)
+
+    def _best_match(self, ranked: List, key_field: str, threshold: float = None) -> Optional[Dict]:
+        """The top-ranked candidate with its confidence, if above the match threshold"""
+        threshold = self.MATCH_THRESHOLD if threshold is None else threshold
+        if not ranked or ranked[0][0] < threshold or ranked[0][0] <= 0:
+            return None
+
+        best_score, best_candidate = ranked[0]
+        if isinstance(best_candidate, Task):
+            best_candidate = best_candidate.to_dict()
+        return {
+            **best_candidate,
+            'exact_name': best_candidate[key_field],
+            'confidence': best_score
+        }
+
+    def _suggestions(self, ranked: List, limit: int) -> List:
+        """Top candidates above the (low) suggestion threshold, for disambiguation"""
+        return [(score, candidate) for score, candidate in ranked[:limit] if score > self.SUGGESTION_THRESHOLD]
 
     def _fuzzy_match(
         self,
@@ -127,76 +398,74 @@ class IntentResolver:
         key_field: str,
         threshold: float = 0.4
     ) -> Optional[Dict]:
-        """
-        Core fuzzy matching algorithm.
+        """Best matching candidate with confidence score, or None below threshold"""
+        return self._best_match(self._rank(user_input, candidates, key_field), key_field, threshold)
 
-        Returns the best matching candidate with confidence score.
-        """
-        if not candidates:
-            return None
+    # ============================================
+    # FOLDER SEMANTICS
+    # ============================================
 
-        user_lower = user_input.lower().strip()
-        user_words = set(user_lower.split())
-        # Content words = query words minus stop words
-        user_content_words = user_words - self.STOP_WORDS
+    def _rank_folder_semantics(self, user_input: str, ranked: List, user_id: str) -> List:
+        """Re-rank folders by max(lexical score, semantic score)"""
+        words = topic_words(user_input)
+        if not words:
+            return ranked
+
+        try:
+            entry = self._task_index(user_id)
+            with entry.lock:
+                cooccurrence = self._folder_cooccurrence(words, entry.index)
+        except Exception as e:
+            print(f"Error loading tasks for folder semantics: {e}")
+            cooccurrence = {}
 
-        best_candidate = None
-        best_score = 0.0
+        rescored = []
+        for score, folder in ranked:
+            lexicon = self._lexicon_score(words, folder['name'])
+            learned = cooccurrence.get(folder['id'], 0.0)
+            semantic = min(max(lexicon, learned) + AGREEMENT_BONUS * min(lexicon, learned), SEMANTIC_MAX_SCORE)
+            rescored.append((max(score, semantic), folder))
+        rescored.sort(key=lambda item: item[0], reverse=True)
+        return rescored
 
-        for candidate in candidates:
-            candidate_text = candidate.get(key_field, '').lower()
-            candidate_words = set(candidate_text.split())
-
-            # Scoring algorithm
-            score = 0.0
-
-            # 1. Exact substring match (highest priority)
-            if user_lower in candidate_text:
-                score = 0.95
-            elif candidate_text in user_lower:
-                score = 0.90
-            else:
-                # 2. Fuzzy string similarity (Levenshtein-based)
-                fuzzy_score = SequenceMatcher(None, user_lower, candidate_text).ratio()
-
-                # 3. Keyword overlap — weight content words higher than stop words
-                content_overlap = len(user_content_words & candidate_words)
-                all_overlap = len(user_words & candidate_words)
-                if content_overlap > 0:
-                    # Content word matches scored against query size (not max)
-                    keyword_score = (content_overlap / max(len(user_content_words), 1)) * 0.90
-                elif all_overlap > 0:
-                    # Only stop-word overlap — much lower score
-                    keyword_score = (all_overlap / max(len(user_words), len(candidate_words))) * 0.40
-                else:
-                    keyword_score = 0.0
-
-                # 4. Partial word matching — only count content words, min 3 chars
-                partial_matches = sum(
-                    1 for u_word in user_content_words
-                    for c_word in candidate_words
-                    if len(u_word) >= 3 and len(c_word) >= 3
-                    and (u_word in c_word or c_word in u_word)
-                )
-                partial_score = partial_matches / max(len(user_content_words), 1) * 0.7 if user_content_words else 0.0
-
-                # Take the best score
-                score = max(fuzzy_score, keyword_score, partial_score)
-
-            # Update best match
-            if score > best_score:
-                best_score = score
-                best_candidate = candidate
-
-        # Only return if above threshold
-        if best_score >= threshold:
-            return {
-                **best_candidate,
-                'exact_name': best_candidate[key_field],
-                'confidence': best_score
-            }
+    @staticmethod
+    def _lexicon_score(words: List[str], folder_name: str) -> float:
+        """LEXICON_WEIGHT × share of topic words in one of the folder's categories"""
+        categories = folder_categories(folder_name)
+        if not categories:
+            return 0.0
+        covered = sum(1 for word in words if word_categories(word) & categories)
+        return LEXICON_WEIGHT * covered / len(words)
 
-        return None
+    @staticmethod
+    def _folder_cooccurrence(words: List[str], index: NameIndex) -> Dict[str, float]:
+        """
+        {folder_id: COOCCURRENCE_WEIGHT × average share of each topic word's tasks in that folder},
+        counting only words that appear in at least COOCCURRENCE_MIN_SUPPORT tasks
+        """
+        totals = {}
+        for word in words:
+            tasks = {task.id: task for form in word_forms(word) for task in index.with_word(form)}
+            if len(tasks) < COOCCURRENCE_MIN_SUPPORT:
+                continue
+            for task in tasks.values():
+                if task.folder:
+                    totals[task.folder] = totals.get(task.folder, 0.0) + 1.0 / len(tasks)
+        return {folder: COOCCURRENCE_WEIGHT * share / len(words) for folder, share in totals.items()}
+
+    def _phonetic_score(self, user_lower: str, candidate_text: str) -> float:
+        """PHONETIC_WEIGHT × phonetic similarity when it is at least PHONETIC_MIN_SIMILARITY, else 0"""
+        if not RESOLVER_PHONETIC_ENABLED:
+            return 0.0
+        similarity = phonetic_similarity(user_lower, candidate_text, self.STOP_WORDS)
+        return similarity * PHONETIC_WEIGHT if similarity >= PHONETIC_MIN_SIMILARITY else 0.0
+
+    @staticmethod
+    def _field(candidate, key_field: str):
+        """Read a field from a Task or a folder dict"""
+        if isinstance(candidate, Task):
+            return getattr(candidate, key_field)
+        return candidate.get(key_field)
     
     def get_task_suggestions(self, user_input: str, limit: int = 5, only_incomplete: bool = False, user_id: str = None) -> List[Dict]:
         """
@@ -207,66 +476,14 @@ class IntentResolver:
             limit: Max suggestions to return
             only_incomplete: If True, only suggest incomplete tasks
             user_id: Firebase UID of the user
-        """
-        if not user_id:
-            raise ValueError("user_id is required")
-        
-        tasks = self.client.get_all_tasks(user_id)
-        
-        # Filter if needed
-        if only_incomplete:
-            tasks = [t for t in tasks if not t.get('completed', False)]
         
-        user_lower = user_input.lower()
-        scored_tasks = []
-        
-        for task in tasks:
-            task_name = task.get('name', '').lower()
-            score = SequenceMatcher(None, user_lower, task_name).ratio()
-            
-            if score > 0.2:  # Low threshold for suggestions
-                scored_tasks.append({
-                    'name': task['name'],
-                    'folder': task.get('folder', ''),
-                    'completed': task.get('completed', False),
-                    'score': score
-                })
-        
-        # Sort by score and return top N
-        scored_tasks.sort(key=lambda x: x['score'], reverse=True)
-        return scored_tasks[:limit]
+        Use resolve_task() when the best match is needed too.
+        """
+        return self.resolve_task(user_input, only_incomplete, user_id, limit=limit)['suggestions']
     
     def get_folder_suggestions(self, user_input: str, limit: int = 5, user_id: str = None) -> List[Dict]:
-        """Get list of possible folder matches for disambiguation"""
-        if not user_id:
-            raise ValueError("user_id is required")
-        
-        folders = []
-        folder_docs = self.client._get_user_folders_ref(user_id).stream()
-        
-        for doc in folder_docs:
-            data = doc.to_dict()
-            folders.append({
-                'name': data['name'],
-                'emoji': data.get('emoji', ''),
-                'id': doc.id
-            })
-        
-        user_lower = user_input.lower()
-        scored_folders = []
-        
-        for folder in folders:
-            folder_name = folder['name'].lower()
-            score = SequenceMatcher(None, user_lower, folder_name).ratio()
-            
-            if score > 0.2:
-                scored_folders.append({
-                    **folder,
-                    'score': score
-                })
-        
-        scored_folders.sort(key=lambda x: x['score'], reverse=True)
-        return scored_folders[:limit]
+        """Get list of possible folder matches for disambiguation (see resolve_folder)"""
+        return self.resolve_folder(user_input, user_id, limit=limit)['suggestions']
 
 
 # ============================================
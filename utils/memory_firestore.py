@@ -0,0 +1,545 @@
+# utils/memory_firestore.py
+"""
+In-Memory Firestore Stand-in
+
+A process-local replacement for the Firestore client, covering the subset of
+the API VoiceLog uses:
+
+    db.collection(...).document(...).collection(...)
+    ref.get() / set(data, merge=) / update(data, option=) / delete(option=) / create(data)
+    query.where(field, op, value) / order_by(field, direction=) / select(fields)
+          / start_after(cursor) / limit(n) / stream() / get() / count().get()
+    db.batch() → set / update / delete / create / commit
+    db.get_all(refs)
+    db.write_option(last_update_time=) preconditions, snapshot.update_time
+    firestore.SERVER_TIMESTAMP, Increment, DELETE_FIELD, ArrayUnion, ArrayRemove
+
+RPC methods accept (and ignore) retry= / timeout= like the real client, so the
+ResilientFirestore wrapper (utils/firestore_resilience.py) works on either.
+
+Select it for the whole process with VOICELOG_STORAGE=memory (see
+utils.firebase_client.get_firestore_db), or inject one directly with
+use_firestore_db(MemoryFirestore()). Lets benchmarks, load tests and
+profiling run with synthetic users and no Firebase project.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+from google.api_core import exceptions as gexc
+from google.cloud.firestore_v1 import transforms
+
+DOCUMENT_ID = '__name__'
+ASCENDING = 'ASCENDING'
+DESCENDING = 'DESCENDING'
+
+
+def _copy(value):
+    """Copy nested dicts/lists so callers can't mutate stored documents"""
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+def _get_field(data: dict, field_path: str):
+    """Resolve a dotted field path; returns (found, value)"""
+    current = data
+    for part in field_path.split('.'):
+        if not isinstance(current, dict) or part not in current:
+            return False, None
+        current = current[part]
+    return True, current
+
+
+def _compare(left, right):
+    """Three-way compare; None when the values have incomparable types"""
+    try:
+        if left < right:
+            return -1
+        if left > right:
+            return 1
+        return 0
+    except TypeError:
+        return None
+
+
+class MemoryDocumentSnapshot:
+    def __init__(self, reference, data, read_time, fields=None, update_time=None):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self.read_time = read_time
+        self.update_time = update_time
+        self._data = data
+        self._fields = fields
+
+    def to_dict(self):
+        if self._data is None:
+            return None
+        if self._fields is None:
+            return _copy(self._data)
+
+        projected = {}
+        for field_path in self._fields:
+            found, value = _get_field(self._data, field_path)
+            if found:
+                projected[field_path] = _copy(value)
+        return projected
+
+    def get(self, field_path: str):
+        found, value = _get_field(self._data or {}, field_path)
+        if not found:
+            raise KeyError(field_path)
+        return _copy(value)
+
+
+class MemoryQuery:
+    def __init__(self, db, collection_path, filters=(), orders=(), projection=None,
+                 cursor=None, limit_count=None):
+        self._db = db
+        self._collection_path = collection_path
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._projection = projection
+        self._cursor = cursor
+        self._limit = limit_count
+
+    def _copy_with(self, **changes):
+        state = {
+            'filters': self._filters,
+            'orders': self._orders,
+            'projection': self._projection,
+            'cursor': self._cursor,
+            'limit_count': self._limit,
+        }
+        state.update(changes)
+        return MemoryQuery(self._db, self._collection_path, **state)
+
+    # ----- query builders -----
+
+    def where(self, field_path: str = None, op_string: str = None, value=None, filter=None):
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        if op_string not in _OPERATORS:
+            raise ValueError(f"Unsupported operator '{op_string}'")
+        return self._copy_with(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path: str, direction: str = ASCENDING):
+        return self._copy_with(orders=self._orders + ((field_path, direction),))
+
+    def select(self, field_paths):
+        return self._copy_with(projection=list(field_paths))
+
+    def start_after(self, document_fields_or_snapshot):
+        return self._copy_with(cursor=document_fields_or_snapshot)
+
+    def limit(self, count: int):
+        return self._copy_with(limit_count=count)
+
+    def count(self, alias: str = None):
+        return MemoryAggregationQuery(self, alias or 'count')
+
+    # ----- execution -----
+
+    def stream(self, transaction=None, retry=None, timeout=None):
+        return iter(self.get())
+
+    def get(self, transaction=None, retry=None, timeout=None):
+        with self._db._lock:
+            documents = list(self._db._collection(self._collection_path).items())
+            update_times = self._db._update_times.get(self._collection_path, {}).copy()
+            read_time = self._db._now()
+
+        rows = [
+            (doc_id, data) for doc_id, data in documents
+            if all(self._matches(doc_id, data, f) for f in self._filters)
+        ]
+
+        orders = self._effective_orders()
+        for field_path, direction in reversed(orders):
+            rows = [r for r in rows if self._value(r, field_path)[0]]
+            rows.sort(key=lambda r: _SortKey(self._value(r, field_path)[1]),
+                      reverse=direction == DESCENDING)
+
+        if self._cursor is not None:
+            rows = self._apply_cursor(rows, orders)
+
+        if self._limit is not None:
+            rows = rows[:self._limit]
+
+        return [
+            MemoryDocumentSnapshot(self._db._document_ref(self._collection_path, doc_id),
+                                   data, read_time, self._projection, update_times.get(doc_id))
+            for doc_id, data in rows
+        ]
+
+    def _effective_orders(self):
+        # Firestore always tie-breaks on document id
+        orders = list(self._orders)
+        if DOCUMENT_ID not in [field for field, _ in orders]:
+            orders.append((DOCUMENT_ID, orders[-1][1] if orders else ASCENDING))
+        return orders
+
+    @staticmethod
+    def _value(row, field_path):
+        doc_id, data = row
+        if field_path == DOCUMENT_ID:
+            return True, doc_id
+        return _get_field(data, field_path)
+
+    def _matches(self, doc_id, data, flt):
+        field_path, op_string, expected = flt
+        found, actual = self._value((doc_id, data), field_path)
+        if isinstance(expected, MemoryDocumentReference):
+            expected = expected.id
+        return _OPERATORS[op_string](found, actual, expected)
+
+    def _apply_cursor(self, rows, orders):
+        cursor = self._cursor
+        if isinstance(cursor, MemoryDocumentSnapshot):
+            cursor_values = [
+                cursor.id if field == DOCUMENT_ID else _get_field(cursor._data or {}, field)[1]
+                for field, _ in orders
+            ]
+        else:
+            cursor_values = []
+            for field, _ in orders:
+                if field not in cursor:
+                    break
+                value = cursor[field]
+                if field == DOCUMENT_ID and isinstance(value, MemoryDocumentReference):
+                    value = value.id
+                cursor_values.append(value)
+
+        def after_cursor(row):
+            for (field, direction), cursor_value in zip(orders, cursor_values):
+                cmp = _compare(self._value(row, field)[1], cursor_value)
+                if cmp is None or cmp == 0:
+                    continue
+                return cmp > 0 if direction == ASCENDING else cmp < 0
+            return False  # equal on every cursor field → not strictly after
+
+        return [row for row in rows if after_cursor(row)]
+
+
+class MemoryAggregationResult:
+    def __init__(self, alias, value, read_time):
+        self.alias = alias
+        self.value = value
+        self.read_time = read_time
+
+
+class MemoryAggregationQuery:
+    """query.count() — get() returns [[result]] like the real AggregationQuery"""
+
+    def __init__(self, query, alias):
+        self._query = query
+        self._alias = alias
+
+    def get(self, transaction=None, retry=None, timeout=None):
+        snapshots = self._query.get()
+        read_time = snapshots[0].read_time if snapshots else self._query._db._now()
+        return [[MemoryAggregationResult(self._alias, len(snapshots), read_time)]]
+
+
+class _SortKey:
+    """Total ordering over mixed types (None < numbers < strings < others)"""
+    __slots__ = ('value',)
+
+    _RANK = {type(None): 0, bool: 1, int: 2, float: 2, datetime: 3, str: 4}
+
+    def __init__(self, value):
+        self.value = value
+
+    def _rank(self):
+        return self._RANK.get(type(self.value), 5)
+
+    def __lt__(self, other):
+        if self._rank() != other._rank():
+            return self._rank() < other._rank()
+        cmp = _compare(self.value, other.value)
+        return cmp is not None and cmp < 0
+
+
+def _in(found, actual, expected):
+    return found and actual in expected
+
+
+_OPERATORS = {
+    '==': lambda found, actual, expected: found and actual == expected,
+    '!=': lambda found, actual, expected: found and actual is not None and actual != expected,
+    '<': lambda found, actual, expected: found and _compare(actual, expected) == -1,
+    '<=': lambda found, actual, expected: found and _compare(actual, expected) in (-1, 0),
+    '>': lambda found, actual, expected: found and _compare(actual, expected) == 1,
+    '>=': lambda found, actual, expected: found and _compare(actual, expected) in (0, 1),
+    'in': _in,
+    'not-in': lambda found, actual, expected: found and actual is not None and actual not in expected,
+    'array_contains': lambda found, actual, expected: found and isinstance(actual, list) and expected in actual,
+    'array_contains_any': lambda found, actual, expected: (
+        found and isinstance(actual, list) and any(v in actual for v in expected)
+    ),
+}
+
+
+class MemoryCollectionReference(MemoryQuery):
+    def __init__(self, db, path: tuple):
+        super().__init__(db, path)
+        self.id = path[-1]
+        self._path = path
+
+    @property
+    def parent(self):
+        if len(self._path) == 1:
+            return None
+        return self._db._document_ref(self._path[:-1], self._path[-1])
+
+    def document(self, document_id: str = None):
+        if document_id is None:
+            document_id = self._db._auto_id()
+        return self._db._document_ref(self._path, document_id)
+
+    def add(self, document_data: dict, document_id: str = None, retry=None, timeout=None):
+        ref = self.document(document_id)
+        return ref.set(document_data), ref
+
+    def list_documents(self, page_size=None, retry=None, timeout=None):
+        with self._db._lock:
+            ids = list(self._db._collection(self._path).keys())
+        return [self.document(doc_id) for doc_id in ids]
+
+
+class MemoryDocumentReference:
+    def __init__(self, db, collection_path: tuple, document_id: str):
+        self._db = db
+        self._collection_path = collection_path
+        self.id = document_id
+        self.path = "/".join(collection_path + (document_id,))
+
+    @property
+    def parent(self):
+        return MemoryCollectionReference(self._db, self._collection_path)
+
+    def collection(self, collection_id: str):
+        return MemoryCollectionReference(self._db, self._collection_path + (self.id, collection_id))
+
+    def get(self, field_paths=None, transaction=None, retry=None, timeout=None):
+        with self._db._lock:
+            data = self._db._collection(self._collection_path).get(self.id)
+            update_time = self._db._update_time(self)
+            read_time = self._db._now()
+        return MemoryDocumentSnapshot(self, data, read_time, field_paths, update_time)
+
+    def set(self, document_data: dict, merge: bool = False, retry=None, timeout=None):
+        batch = self._db.batch()
+        batch.set(self, document_data, merge=merge)
+        return batch.commit()[0]
+
+    def create(self, document_data: dict, retry=None, timeout=None):
+        batch = self._db.batch()
+        batch.create(self, document_data)
+        return batch.commit()[0]
+
+    def update(self, field_updates: dict, option=None, retry=None, timeout=None):
+        batch = self._db.batch()
+        batch.update(self, field_updates, option=option)
+        return batch.commit()[0]
+
+    def delete(self, option=None, retry=None, timeout=None):
+        batch = self._db.batch()
+        batch.delete(self, option=option)
+        batch.commit()
+
+    def __eq__(self, other):
+        return isinstance(other, MemoryDocumentReference) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+
+class MemoryWriteResult:
+    def __init__(self, update_time):
+        self.update_time = update_time
+
+
+class MemoryWriteOption:
+    """Precondition from db.write_option(): the document's update_time must still match"""
+
+    def __init__(self, last_update_time=None):
+        self.last_update_time = last_update_time
+
+
+class MemoryWriteBatch:
+    """Buffers writes and applies them atomically (one commit timestamp) on commit()"""
+
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def set(self, reference, document_data: dict, merge: bool = False):
+        self._writes.append(('set', reference, document_data, merge, None))
+        return self
+
+    def create(self, reference, document_data: dict):
+        self._writes.append(('create', reference, document_data, False, None))
+        return self
+
+    def update(self, reference, field_updates: dict, option=None):
+        self._writes.append(('update', reference, field_updates, False, option))
+        return self
+
+    def delete(self, reference, option=None):
+        self._writes.append(('delete', reference, None, False, option))
+        return self
+
+    def commit(self, retry=None, timeout=None):
+        with self._db._lock:
+            # Validate first so a failing write leaves nothing half-applied
+            for kind, ref, _, _, option in self._writes:
+                exists = ref.id in self._db._collection(ref._collection_path)
+                if kind == 'update' and not exists:
+                    raise NotFound(f"No document to update: {ref.path}")
+                if kind == 'create' and exists:
+                    raise gexc.AlreadyExists(f"Document already exists: {ref.path}")
+                if option is not None and option.last_update_time != self._db._update_time(ref):
+                    raise gexc.FailedPrecondition(f"Document changed since {option.last_update_time}: {ref.path}")
+
+            commit_time = self._db._now()
+            results = []
+            for kind, ref, data, merge, _ in self._writes:
+                collection = self._db._collection(ref._collection_path)
+                update_times = self._db._update_times.setdefault(ref._collection_path, {})
+                if kind == 'delete':
+                    collection.pop(ref.id, None)
+                    update_times.pop(ref.id, None)
+                elif kind in ('set', 'create') and not merge:
+                    collection[ref.id] = _apply_fields({}, data, commit_time, nested=True)
+                    update_times[ref.id] = commit_time
+                else:
+                    existing = _copy(collection.get(ref.id, {}))
+                    # update() treats keys as dotted field paths; set(merge=True) as nested maps
+                    collection[ref.id] = _apply_fields(existing, data, commit_time, nested=(kind == 'set'))
+                    update_times[ref.id] = commit_time
+                results.append(MemoryWriteResult(commit_time))
+            self._writes = []
+        return results
+
+
+class NotFound(gexc.NotFound):
+    """Raised by update() on a missing document (a google.api_core NotFound, like the real client)"""
+
+
+def _resolve(value, current, commit_time):
+    """Apply Firestore sentinels/transforms against the current field value"""
+    if value is transforms.SERVER_TIMESTAMP:
+        return commit_time
+    if isinstance(value, transforms.Increment):
+        base = current if isinstance(current, (int, float)) and not isinstance(current, bool) else 0
+        return base + value.value
+    if isinstance(value, transforms.ArrayUnion):
+        result = list(current) if isinstance(current, list) else []
+        result.extend(v for v in value.values if v not in result)
+        return result
+    if isinstance(value, transforms.ArrayRemove):
+        return [v for v in (current if isinstance(current, list) else []) if v not in value.values]
+    if isinstance(value, dict):
+        base = current if isinstance(current, dict) else {}
+        return {k: _resolve(v, base.get(k), commit_time) for k, v in value.items()
+                if v is not transforms.DELETE_FIELD}
+    if isinstance(value, list):
+        return [_resolve(v, None, commit_time) for v in value]
+    return value
+
+
+def _apply_fields(target: dict, data: dict, commit_time, nested: bool):
+    for key, value in data.items():
+        parts = [key] if nested else key.split('.')
+        parent = target
+        for part in parts[:-1]:
+            if not isinstance(parent.get(part), dict):
+                parent[part] = {}
+            parent = parent[part]
+        leaf = parts[-1]
+
+        if value is transforms.DELETE_FIELD:
+            parent.pop(leaf, None)
+        elif nested and isinstance(value, dict) and isinstance(parent.get(leaf), dict):
+            # set(merge=True): merge nested maps rather than replacing them
+            _apply_fields(parent[leaf], value, commit_time, nested=True)
+        else:
+            parent[leaf] = _resolve(value, parent.get(leaf), commit_time)
+    return target
+
+
+class MemoryFirestore:
+    """Drop-in Firestore client holding every document in process memory"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._collections = {}
+        self._update_times = {}
+        self._last_time = None
+        self._id_counter = 0
+
+    def collection(self, collection_id: str):
+        return MemoryCollectionReference(self, (collection_id,))
+
+    def document(self, document_path: str):
+        parts = tuple(document_path.split('/'))
+        return self._document_ref(parts[:-1], parts[-1])
+
+    def batch(self):
+        return MemoryWriteBatch(self)
+
+    @staticmethod
+    def write_option(last_update_time=None):
+        return MemoryWriteOption(last_update_time)
+
+    def get_all(self, references, field_paths=None, transaction=None, retry=None, timeout=None):
+        """Snapshots for several documents at one read time (missing ones with exists=False)"""
+        with self._lock:
+            read_time = self._now()
+            snapshots = [
+                MemoryDocumentSnapshot(ref, self._collection(ref._collection_path).get(ref.id), read_time, field_paths,
+                                       self._update_time(ref))
+                for ref in references
+            ]
+        return iter(snapshots)
+
+    def clear(self):
+        with self._lock:
+            self._collections.clear()
+            self._update_times.clear()
+
+    def document_count(self) -> int:
+        with self._lock:
+            return sum(len(docs) for docs in self._collections.values())
+
+    # ----- internals -----
+
+    def _collection(self, path: tuple) -> dict:
+        return self._collections.setdefault(path, {})
+
+    def _document_ref(self, collection_path: tuple, document_id: str):
+        return MemoryDocumentReference(self, collection_path, document_id)
+
+    def _update_time(self, ref):
+        return self._update_times.get(ref._collection_path, {}).get(ref.id)
+
+    def _now(self):
+        # Strictly increasing, like Firestore commit times — delta sync relies on it
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            if self._last_time is not None and now <= self._last_time:
+                now = self._last_time + timedelta(microseconds=1)
+            self._last_time = now
+            return now
+
+    def _auto_id(self) -> str:
+        with self._lock:
+            self._id_counter += 1
+            return f"mem{self._id_counter:017d}"
+
+    def __repr__(self):
+        return f"<MemoryFirestore collections={len(self._collections)}>"
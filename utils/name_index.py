@@ -0,0 +1,158 @@
+# utils/name_index.py
+"""
+Name Index for Fuzzy Lookups
+
+A character-trigram and word inverted index over task names, so the intent
+resolver scores a short list of plausible candidates instead of running
+SequenceMatcher against every task a user has ever created.
+
+    trigrams  "shoulder press" → {'  s', ' sh', 'sho', ..., 'ss '}  (padded per word, like pg_trgm)
+    words     "shoulder press" → {'shoulder', 'press'}  (+ {'~XLTR', '~PRS'} with phonetic=True)
+
+shortlist(query) ranks entries by shared trigrams (Dice coefficient) plus a
+bonus per shared content word and returns the top few ids; the caller scores
+those exactly. Entries are added / replaced / removed one at a time, so the
+index follows task writes without being rebuilt. Posting lists hold row
+numbers and a query is one np.bincount over the posting lists it touches.
+
+Benchmark: benchmarks/bench_intent_resolver.py
+"""
+
+from collections import defaultdict
+
+import numpy as np
+
+from utils.phonetic import phonetic_key
+
+
+def trigrams(text: str) -> set:
+    """Distinct padded character trigrams of each whitespace-separated word"""
+    grams = set()
+    for word in text.lower().split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NameIndex:
+    """Inverted index id → name, searchable by trigram and word overlap"""
+
+    # Weight of one shared (non-stop) word relative to the trigram similarity
+    WORD_BONUS = 0.25
+
+    def __init__(self, stop_words=(), phonetic: bool = False):
+        self.stop_words = frozenset(stop_words)
+        self.phonetic = phonetic
+        self.entries = {}                 # id → payload
+        self._rows = {}                   # id → row number (postings hold rows)
+        self._ids = []                    # row → id (None when free)
+        self._free_rows = []
+        self._indexed = {}                # id → (trigrams, words)
+        self._gram_count = np.zeros(0, dtype=np.int32)  # row → distinct trigrams
+        self._by_gram = defaultdict(set)  # trigram → rows
+        self._by_word = defaultdict(set)  # word → rows
+        self._arrays = {}                 # posting key → cached int array, dropped when it changes
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, entry_id):
+        return entry_id in self.entries
+
+    def _words(self, text: str) -> set:
+        """Content words of text, plus their phonetic keys ('~XLTR') when phonetic"""
+        words = set(text.lower().split()) - self.stop_words
+        if self.phonetic:
+            words |= {f"~{key}" for key in map(phonetic_key, words) if key}
+        return words
+
+    def with_word(self, word: str) -> list:
+        """Payloads of the entries whose name contains word (exact, lowercase)"""
+        return [self.entries[self._ids[row]] for row in self._by_word.get(word, ())]
+
+    def add(self, entry_id: str, name: str, payload=None):
+        """Index (or re-index) one entry under name"""
+        if entry_id in self._indexed:
+            self.remove(entry_id)
+        grams = trigrams(name or '')
+        words = self._words(name or '')
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._ids[row] = entry_id
+        else:
+            row = len(self._ids)
+            self._ids.append(entry_id)
+            if row >= len(self._gram_count):
+                self._gram_count = np.resize(self._gram_count, max(64, 2 * row))
+        self._gram_count[row] = len(grams)
+
+        self.entries[entry_id] = payload
+        self._rows[entry_id] = row
+        self._indexed[entry_id] = (grams, words)
+        self._post(row, grams, words, add=True)
+
+    def remove(self, entry_id: str):
+        indexed = self._indexed.pop(entry_id, None)
+        if indexed is None:
+            return
+        del self.entries[entry_id]
+        row = self._rows.pop(entry_id)
+        self._post(row, *indexed, add=False)
+        self._ids[row] = None
+        self._gram_count[row] = 0
+        self._free_rows.append(row)
+
+    def _post(self, row: int, grams, words, add: bool):
+        for postings, keys, kind in ((self._by_gram, grams, 'g'), (self._by_word, words, 'w')):
+            for key in keys:
+                self._arrays.pop((kind, key), None)
+                if add:
+                    postings[key].add(row)
+                else:
+                    postings[key].discard(row)
+                    if not postings[key]:
+                        del postings[key]
+
+    def _hits(self, postings, keys, kind: str) -> np.ndarray:
+        """Per-row count of keys whose posting list contains the row"""
+        arrays = []
+        for key in keys:
+            rows = postings.get(key)
+            if rows:
+                array = self._arrays.get((kind, key))
+                if array is None:
+                    array = self._arrays[(kind, key)] = np.fromiter(rows, dtype=np.int64, count=len(rows))
+                arrays.append(array)
+        if not arrays:
+            return np.zeros(len(self._ids), dtype=np.int64)
+        return np.bincount(np.concatenate(arrays), minlength=len(self._ids))
+
+    def shortlist(self, query: str, limit: int, accept=None) -> list:
+        """
+        Up to limit ids most similar to query, best first.
+
+        accept: optional predicate on the payload; rejected entries are skipped
+        (e.g. completed tasks when only incomplete ones may match).
+        """
+        query_grams = trigrams(query)
+        query_words = self._words(query)
+
+        shared = self._hits(self._by_gram, query_grams, 'g')
+        word_hits = self._hits(self._by_word, query_words, 'w')
+        candidates = np.flatnonzero(shared | word_hits)
+        if not len(candidates):
+            return []
+
+        grams = self._gram_count[candidates]
+        dice = np.where(grams > 0, 2.0 * shared[candidates] / (len(query_grams) + grams), 0.0)
+        scores = dice + self.WORD_BONUS * word_hits[candidates]
+
+        result = []
+        for row in candidates[np.argsort(-scores, kind='stable')]:
+            entry_id = self._ids[row]
+            if accept is None or accept(self.entries[entry_id]):
+                result.append(entry_id)
+                if len(result) == limit:
+                    break
+        return result
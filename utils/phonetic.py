@@ -0,0 +1,177 @@
+# utils/phonetic.py
+"""
+Phonetic Keys for Spoken Task References
+
+Task references come from speech-to-text, so the usual misses sound right but
+are spelled wrong: "shoulder presse", "cee the doctor", "by milk", "fone bill".
+Character similarity scores those poorly; their phonetic keys are identical.
+
+phonetic_key() is a compact Metaphone (the primary code of Double Metaphone
+for common English spellings): silent letters dropped, soft/hard c and g,
+ph/gh → F, sh/ch/tion → X, th → 0, vowels kept only as a leading 'A'.
+Number words are mapped to digits first, so "thirty" and "30" agree.
+
+    shoulder → XLTR     presse / press → PRS     cee / see / sea → S
+"""
+
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+VOWELS = frozenset("aeiou")
+FRONT_VOWELS = frozenset("eiy")
+
+# Silent first letter of these initial pairs
+_SILENT_INITIAL = ("kn", "gn", "pn", "wr", "ps")
+
+NUMBER_WORDS = {
+    "zero": "0", "one": "1", "two": "2", "three": "3", "four": "4", "five": "5", "six": "6",
+    "seven": "7", "eight": "8", "nine": "9", "ten": "10", "eleven": "11", "twelve": "12",
+    "thirteen": "13", "fourteen": "14", "fifteen": "15", "sixteen": "16", "seventeen": "17",
+    "eighteen": "18", "nineteen": "19", "twenty": "20", "thirty": "30", "forty": "40",
+    "fifty": "50", "sixty": "60", "seventy": "70", "eighty": "80", "ninety": "90", "hundred": "100",
+}
+
+_TOKEN = re.compile(r"[a-z]+|\d+")
+
+
+@lru_cache(maxsize=65536)
+def phonetic_key(word: str) -> str:
+    """Metaphone key of one word ('' for words with no consonant sound); digits pass through"""
+    w = word.lower()
+    w = NUMBER_WORDS.get(w, w)
+    if not w or w.isdigit():
+        return w
+    w = re.sub(r"[^a-z]", "", w)
+    if not w:
+        return ""
+
+    if w.startswith(_SILENT_INITIAL):
+        w = w[1:]
+    elif w[0] == "x":
+        w = "s" + w[1:]
+    elif w.startswith("wh"):
+        w = "w" + w[2:]
+
+    key = []
+    n = len(w)
+    i = 0
+    while i < n:
+        c = w[i]
+        prev = w[i - 1] if i else ""
+        nxt = w[i + 1] if i + 1 < n else ""
+        after = w[i + 2] if i + 2 < n else ""
+
+        if c == prev and c != "c":
+            i += 1
+            continue
+
+        if c in VOWELS:
+            if i == 0:
+                key.append("A")
+        elif c == "b":
+            if not (prev == "m" and i == n - 1):
+                key.append("P")
+        elif c == "c":
+            if nxt == "i" and after == "a" or nxt == "h":
+                key.append("K" if prev == "s" else "X")
+                i += 1 if nxt == "h" else 0
+            elif nxt in FRONT_VOWELS:
+                if prev != "s":
+                    key.append("S")
+            elif nxt == "k":
+                key.append("K")
+                i += 1
+            else:
+                key.append("K")
+        elif c == "d":
+            if nxt == "g" and after in FRONT_VOWELS:
+                key.append("J")
+                i += 2
+            else:
+                key.append("T")
+        elif c == "g":
+            if nxt == "h":
+                i += 1
+                if i + 1 >= n and w[i - 3:i - 1] in ("ou", "au"):  # rough, laugh
+                    key.append("F")
+                elif i + 1 < n and w[i + 1] in VOWELS:           # ghost
+                    key.append("K")
+                # otherwise silent: night, high
+            elif nxt == "n" and (i + 2 >= n or w[i + 2:] == "ed"):
+                pass                                              # sign, signed
+            elif nxt in FRONT_VOWELS and prev != "g":
+                key.append("J")
+            else:
+                key.append("K")
+        elif c == "h":
+            if (nxt in VOWELS or nxt == "y") and prev not in ("c", "g", "p", "s", "t"):
+                key.append("H")
+        elif c == "k":
+            if prev != "c":
+                key.append("K")
+        elif c == "p":
+            if nxt == "h":
+                key.append("F")
+                i += 1
+            else:
+                key.append("P")
+        elif c == "q":
+            key.append("K")
+        elif c == "s":
+            if nxt == "h" or (nxt == "i" and after in ("o", "a")):
+                key.append("X")
+                i += 1 if nxt == "h" else 0
+            else:
+                key.append("S")
+        elif c == "t":
+            if nxt == "i" and after in ("o", "a"):
+                key.append("X")
+            elif nxt == "h":
+                key.append("0")
+                i += 1
+            elif not (nxt == "c" and after == "h"):
+                key.append("T")
+        elif c == "v":
+            key.append("F")
+        elif c == "w" or c == "y":
+            # y after the first letter is a vowel ("buy" / "bye" / "by" → P)
+            if nxt in VOWELS and (c == "w" or i == 0):
+                key.append(c.upper())
+        elif c == "x":
+            key.append("KS")
+        elif c == "z":
+            key.append("S")
+        else:  # f j l m n r
+            key.append(c.upper())
+        i += 1
+
+    return "".join(key)
+
+
+@lru_cache(maxsize=65536)
+def phonetic_keys(text: str, stop_words: frozenset = frozenset()) -> tuple:
+    """Phonetic keys of the words in text (stop words and silent words skipped)"""
+    keys = []
+    for word in _TOKEN.findall(text.lower()):
+        if word in stop_words:
+            continue
+        key = phonetic_key(word)
+        if key:
+            keys.append(key)
+    return tuple(keys)
+
+
+def phonetic_similarity(query: str, candidate: str, stop_words: frozenset = frozenset()) -> float:
+    """
+    0–1: how much of query sounds like candidate — the larger of the share of
+    query words whose key (2+ sounds) occurs in candidate, and the
+    SequenceMatcher ratio of the two key strings
+    """
+    query_keys = phonetic_keys(query, stop_words)
+    candidate_keys = phonetic_keys(candidate, stop_words)
+    if not query_keys or not candidate_keys:
+        return 0.0
+    present = set(candidate_keys)
+    coverage = sum(1 for key in query_keys if len(key) >= 2 and key in present) / len(query_keys)
+    return max(coverage, SequenceMatcher(None, " ".join(query_keys), " ".join(candidate_keys)).ratio())
@@ -0,0 +1,548 @@
+# utils/postgres_task_repository.py
+"""
+PostgreSQL Task Repository
+
+Tasks in one table keyed by (user_id, id), with the indexes the hot paths
+need so filters, name lookups and counts run in SQL instead of as
+client-side scans:
+
+    (user_id, name_lower)              → find_by_name (resolver / mark complete / edit)
+    (user_id, folder)                  → folder contents, folder moves/deletes, folder counts
+    (user_id, completed, due_date)     → get_tasks_by_filter, overdue, completion counts
+    (user_id, is_high_priority, due_date) → get_tasks_by_filter on priority + due range
+    (user_id, completed_at)            → completion-time analytics
+    (user_id, change_xid)              → delta sync (/tasks/changes)
+
+Delta sync can't use updated_at as its cursor here: now() is the writing
+transaction's start time, so a long transaction can commit rows stamped
+before a cursor another client has already moved past. Every write instead
+records its transaction id (change_xid, xid8), and a sync reads under one
+snapshot and advances its cursor only to that snapshot's xmin — the oldest
+transaction still in flight. Anything committed later has an xid at or above
+the cursor, so the next sync sees it. (Rows from in-flight transactions that
+were already visible may be sent twice; applying a change twice is harmless.)
+
+Enable with VOICELOG_TASK_STORE=postgres. Connection string comes from
+TASKS_POSTGRES_URL, falling back to POSTGRES_URL / DATABASE_URL (the same
+database the LangGraph store uses). Folders, profiles and data versions stay
+in Firestore.
+"""
+
+import os
+import uuid
+import threading
+
+from firebase_admin import firestore
+from psycopg import sql
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+
+from utils.task_model import date_to_ordinal
+from utils.task_repository import TaskRepository, datetime_to_cursor, cursor_to_datetime
+from utils.task_rollups import public_rollups
+
+TASKS_TABLE = "voicelog_tasks"
+TOMBSTONES_TABLE = "voicelog_task_tombstones"
+
+# Task fields with their own column; anything else (priority_reason, ...) lives in `extra`
+TASK_COLUMNS = (
+    'name', 'folder', 'completed', 'recurrence', 'time', 'duration', 'due_date',
+    'is_high_priority', 'completed_day', 'created_at', 'completed_at', 'updated_at',
+)
+
+SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS {TASKS_TABLE} (
+    user_id          TEXT        NOT NULL,
+    id               TEXT        NOT NULL,
+    name             TEXT        NOT NULL DEFAULT '',
+    name_lower       TEXT        GENERATED ALWAYS AS (lower(name)) STORED,
+    folder           TEXT,
+    completed        BOOLEAN     NOT NULL DEFAULT FALSE,
+    recurrence       TEXT,
+    "time"           TEXT,
+    duration         TEXT,
+    due_date         TEXT,
+    is_high_priority BOOLEAN     NOT NULL DEFAULT FALSE,
+    completed_day    TEXT,
+    created_at       TIMESTAMPTZ,
+    completed_at     TIMESTAMPTZ,
+    updated_at       TIMESTAMPTZ,
+    extra            JSONB       NOT NULL DEFAULT '{{}}'::jsonb,
+    PRIMARY KEY (user_id, id)
+);
+CREATE INDEX IF NOT EXISTS {TASKS_TABLE}_name_lower_idx ON {TASKS_TABLE} (user_id, name_lower);
+CREATE INDEX IF NOT EXISTS {TASKS_TABLE}_folder_idx ON {TASKS_TABLE} (user_id, folder);
+CREATE INDEX IF NOT EXISTS {TASKS_TABLE}_completed_due_idx ON {TASKS_TABLE} (user_id, completed, due_date);
+CREATE INDEX IF NOT EXISTS {TASKS_TABLE}_priority_due_idx ON {TASKS_TABLE} (user_id, is_high_priority, due_date);
+CREATE INDEX IF NOT EXISTS {TASKS_TABLE}_completed_at_idx ON {TASKS_TABLE} (user_id, completed_at);
+CREATE INDEX IF NOT EXISTS {TASKS_TABLE}_updated_at_idx ON {TASKS_TABLE} (user_id, updated_at);
+
+CREATE TABLE IF NOT EXISTS {TOMBSTONES_TABLE} (
+    user_id    TEXT        NOT NULL,
+    task_id    TEXT        NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (user_id, task_id)
+);
+CREATE INDEX IF NOT EXISTS {TOMBSTONES_TABLE}_updated_at_idx ON {TOMBSTONES_TABLE} (user_id, updated_at);
+
+-- Transaction that last wrote the row (delta sync cursor, see module docstring)
+ALTER TABLE {TASKS_TABLE} ADD COLUMN IF NOT EXISTS change_xid xid8 NOT NULL DEFAULT pg_current_xact_id();
+ALTER TABLE {TOMBSTONES_TABLE} ADD COLUMN IF NOT EXISTS change_xid xid8 NOT NULL DEFAULT pg_current_xact_id();
+CREATE INDEX IF NOT EXISTS {TASKS_TABLE}_change_xid_idx ON {TASKS_TABLE} (user_id, change_xid);
+CREATE INDEX IF NOT EXISTS {TOMBSTONES_TABLE}_change_xid_idx ON {TOMBSTONES_TABLE} (user_id, change_xid);
+"""
+
+# Deletes and tombstones in one statement, so a crash can't leave one without the other
+_TOMBSTONE_CTE = sql.SQL(
+    "WITH gone AS (DELETE FROM {tasks} WHERE {where} RETURNING user_id, id) "
+    "INSERT INTO {tombstones} (user_id, task_id, deleted_at, updated_at) "
+    "SELECT user_id, id, now(), now() FROM gone "
+    "ON CONFLICT (user_id, task_id) DO UPDATE "
+    "SET deleted_at = EXCLUDED.deleted_at, updated_at = EXCLUDED.updated_at, change_xid = pg_current_xact_id()"
+)
+
+# Stamped on every UPDATE of a task row (INSERTs get it from the column default)
+_CHANGE_XID = sql.SQL("change_xid = pg_current_xact_id()")
+
+
+def _changes_cursor(read_time, xmin) -> str:
+    """'<microseconds>:<xmin>' — when the sync read ran, and its snapshot's oldest in-flight xid"""
+    return f"{datetime_to_cursor(read_time)}:{xmin}"
+
+
+def _parse_changes_cursor(cursor: str):
+    """(read time, xmin or None for a pre-xid timestamp-only cursor)"""
+    micros, _, xmin = cursor.partition(':')
+    if not xmin:
+        return cursor_to_datetime(micros), None
+    if not xmin.isdigit():
+        raise ValueError(f"Invalid sync cursor '{cursor}'")
+    return cursor_to_datetime(micros), int(xmin)
+
+
+class TaskRow:
+    """A task row shaped like a Firestore snapshot (.id / .to_dict())"""
+    __slots__ = ('id', '_data')
+
+    exists = True
+
+    def __init__(self, task_id: str, data: dict):
+        self.id = task_id
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+def _row_to_task(row: dict) -> TaskRow:
+    task_id = row.pop('id')
+    extra = row.pop('extra', None)
+    if extra:
+        row = {**extra, **row}
+    return TaskRow(task_id, row)
+
+
+def _value(value):
+    """SQL fragment for a write value; SERVER_TIMESTAMP becomes the transaction's now()"""
+    if value is firestore.SERVER_TIMESTAMP:
+        return sql.SQL("now()")
+    return sql.Literal(value)
+
+
+def _split_fields(data: dict):
+    """(column values, extra JSON values) for a task dict"""
+    columns = {k: v for k, v in data.items() if k in TASK_COLUMNS}
+    extra = {k: v for k, v in data.items() if k not in TASK_COLUMNS}
+    return columns, extra
+
+
+class PostgresTaskRepository(TaskRepository):
+    def __init__(self, pool: ConnectionPool, setup: bool = True):
+        self.pool = pool
+        if setup:
+            self.setup()
+
+    def setup(self):
+        """Create tables and indexes if missing (idempotent)"""
+        with self.pool.connection() as conn:
+            conn.execute(SCHEMA_SQL)
+
+    # ----- query building -----
+
+    def _select_list(self, fields: str):
+        from utils.firebase_client import TASK_FIELD_SETS
+
+        if fields not in TASK_FIELD_SETS:
+            raise ValueError(f"Unknown task field set '{fields}'. Use one of: {', '.join(TASK_FIELD_SETS)}")
+
+        field_paths = TASK_FIELD_SETS[fields]
+        if field_paths is None:
+            names = ('id',) + TASK_COLUMNS + ('extra',)
+        else:
+            names = ('id',) + tuple(f for f in field_paths if f in TASK_COLUMNS)
+        return sql.SQL(", ").join(sql.Identifier(n) for n in names)
+
+    def _where(self, user_id: str, folder: str = None, completed: bool = None, is_high_priority: bool = None,
+               due_before: str = None, due_after: str = None):
+        clauses = [sql.SQL("user_id = {}").format(user_id)]
+        for column, value in (('folder', folder), ('completed', completed), ('is_high_priority', is_high_priority)):
+            if value is not None:
+                clauses.append(sql.SQL("{} = {}").format(sql.Identifier(column), value))
+        if due_before is not None:
+            clauses.append(sql.SQL("due_date <> '' AND due_date <= {}").format(due_before))
+        if due_after is not None:
+            clauses.append(sql.SQL("due_date <> '' AND due_date >= {}").format(due_after))
+        return sql.SQL(" AND ").join(clauses)
+
+    def _fetch(self, query, params=None):
+        with self.pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(query, params)
+                return [_row_to_task(row) for row in cur.fetchall()]
+
+    def _execute(self, query, params=None) -> int:
+        with self.pool.connection() as conn:
+            cur = conn.execute(query, params)
+            return cur.rowcount
+
+    # ----- reads -----
+
+    def get(self, user_id: str, task_id: str):
+        rows = self._fetch(
+            sql.SQL("SELECT {} FROM {} WHERE user_id = %s AND id = %s").format(
+                self._select_list("full"), sql.Identifier(TASKS_TABLE)),
+            (user_id, task_id),
+        )
+        return rows[0] if rows else None
+
+    def get_many(self, user_id: str, task_ids) -> dict:
+        task_ids = list(dict.fromkeys(task_ids))
+        if not task_ids:
+            return {}
+        rows = self._fetch(
+            sql.SQL("SELECT {} FROM {} WHERE user_id = %s AND id = ANY(%s)").format(
+                self._select_list("full"), sql.Identifier(TASKS_TABLE)),
+            (user_id, task_ids),
+        )
+        return {row.id: row for row in rows}
+
+    def find_by_name(self, user_id: str, name: str, exact_only: bool = False):
+        exact_clause = sql.SQL(" AND name = %(name)s") if exact_only else sql.SQL("")
+        rows = self._fetch(
+            sql.SQL(
+                "SELECT {} FROM {} WHERE user_id = %(user_id)s AND name_lower = lower(%(name)s){} "
+                "ORDER BY (name = %(name)s) DESC, id LIMIT 1"
+            ).format(self._select_list("full"), sql.Identifier(TASKS_TABLE), exact_clause),
+            {'user_id': user_id, 'name': name},
+        )
+        return rows[0] if rows else None
+
+    def stream(self, user_id: str, fields: str = "full", folder: str = None, completed: bool = None,
+               is_high_priority: bool = None, due_before: str = None, due_after: str = None):
+        return iter(self._fetch(
+            sql.SQL("SELECT {} FROM {} WHERE {}").format(
+                self._select_list(fields), sql.Identifier(TASKS_TABLE),
+                self._where(user_id, folder, completed, is_high_priority, due_before, due_after)),
+        ))
+
+    def page(self, user_id: str, fields: str = "full", folder: str = None,
+             limit: int = None, start_after: str = None):
+        where = self._where(user_id, folder)
+        if start_after:
+            where = sql.SQL("{} AND id > {}").format(where, start_after)
+        query = sql.SQL("SELECT {} FROM {} WHERE {} ORDER BY id").format(
+            self._select_list(fields), sql.Identifier(TASKS_TABLE), where)
+        if limit is not None:
+            # Fetch one extra row to learn whether another page exists
+            query = sql.SQL("{} LIMIT {}").format(query, limit + 1)
+
+        rows = self._fetch(query)
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1].id
+        return rows, None
+
+    def cursor_time(self, cursor: str):
+        return _parse_changes_cursor(cursor)[0]
+
+    def changes(self, user_id: str, since: str = None, fields: str = "mobile") -> dict:
+        since_time, since_xmin = _parse_changes_cursor(since) if since else (None, None)
+
+        with self.pool.connection() as conn:
+            with conn.transaction():  # one snapshot for the horizon, tasks and tombstones
+                conn.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                xmin, read_time = conn.execute(
+                    "SELECT pg_snapshot_xmin(pg_current_snapshot())::text, clock_timestamp()").fetchone()
+
+                where = self._where(user_id)
+                tombstone_where = sql.SQL("user_id = {}").format(user_id)
+                if since_xmin is not None:
+                    changed = sql.SQL("change_xid >= {}::xid8").format(str(since_xmin))
+                else:
+                    # Timestamp-only cursor from before change_xid: answer it the old way once
+                    changed = sql.SQL("updated_at > {}").format(since_time)
+                if since is not None:
+                    where = sql.SQL("{} AND {}").format(where, changed)
+                    tombstone_where = sql.SQL("{} AND {}").format(tombstone_where, changed)
+
+                with conn.cursor(row_factory=dict_row) as cur:
+                    cur.execute(sql.SQL("SELECT {} FROM {} WHERE {}").format(
+                        self._select_list(fields), sql.Identifier(TASKS_TABLE), where))
+                    tasks = [_row_to_task(row) for row in cur.fetchall()]
+
+                deleted = []
+                if since is not None:
+                    deleted = [row[0] for row in conn.execute(sql.SQL("SELECT task_id FROM {} WHERE {}").format(
+                        sql.Identifier(TOMBSTONES_TABLE), tombstone_where)).fetchall()]
+
+        return {
+            'tasks': tasks,
+            'deleted': deleted,
+            'next_cursor': _changes_cursor(read_time, xmin),
+            'since_time': since_time,
+        }
+
+    def prune_tombstones(self, user_id: str, before) -> int:
+        return self._execute(
+            sql.SQL("DELETE FROM {} WHERE user_id = %s AND updated_at < %s").format(sql.Identifier(TOMBSTONES_TABLE)),
+            (user_id, before),
+        )
+
+    def query(self, user_id: str, fields: str = "full", completed: bool = None, is_high_priority: bool = None,
+              due_before: str = None, due_after: str = None, limit: int = None, start_after: list = None):
+        ranged = due_before is not None or due_after is not None
+        where = self._where(user_id, None, completed, is_high_priority, due_before, due_after)
+        order = ('due_date', 'id') if ranged else ('id',)
+        order_sql = sql.SQL(", ").join(sql.Identifier(c) for c in order)
+        if start_after:
+            where = sql.SQL("{} AND ({}) > ({})").format(
+                where, order_sql, sql.SQL(", ").join(sql.Literal(v) for v in start_after))
+
+        query = sql.SQL("SELECT {} FROM {} WHERE {} ORDER BY {}").format(
+            self._select_list(fields), sql.Identifier(TASKS_TABLE), where, order_sql)
+        if limit is not None:
+            query = sql.SQL("{} LIMIT {}").format(query, limit)
+        return self._fetch(query)
+
+    def count(self, user_id: str, folder: str = None, completed: bool = None, is_high_priority: bool = None,
+              due_before: str = None, due_after: str = None) -> int:
+        with self.pool.connection() as conn:
+            row = conn.execute(sql.SQL("SELECT count(*) FROM {} WHERE {}").format(
+                sql.Identifier(TASKS_TABLE),
+                self._where(user_id, folder, completed, is_high_priority, due_before, due_after))).fetchone()
+        return row[0]
+
+    def stats(self, user_id: str, today: str = None) -> dict:
+        # One pass over the user's rows (user_id prefix of every index); no counters to keep in sync
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                sql.SQL(
+                    "SELECT coalesce(folder, 'uncategorized'), count(*), "
+                    "count(*) FILTER (WHERE completed), "
+                    "count(*) FILTER (WHERE NOT completed AND is_high_priority), "
+                    "count(*) FILTER (WHERE NOT completed AND due_date <> '' AND due_date < %s) "
+                    "FROM {} WHERE user_id = %s GROUP BY 1"
+                ).format(sql.Identifier(TASKS_TABLE)),
+                (today or '', user_id),
+            ).fetchall()
+
+        result = {'total': 0, 'completed': 0, 'high_priority_pending': 0, 'folders': {}}
+        overdue = 0
+        for folder, total, done, high_priority, folder_overdue in rows:
+            result['total'] += total
+            result['completed'] += done
+            result['high_priority_pending'] += high_priority
+            result['folders'][folder] = {'total': total, 'completed': done}
+            overdue += folder_overdue
+        if today is not None:
+            result['overdue'] = overdue
+        return result
+
+    def rebuild_stats(self, user_id: str, today: str = None) -> dict:
+        # Computed on read; nothing stored to rebuild
+        return self.stats(user_id, today)
+
+    def rollups(self, user_id: str, tz_name: str = "UTC") -> dict:
+        # Same shape as the Firestore rollup document, grouped in SQL on read (user_id-prefixed indexes)
+        tasks = sql.Identifier(TASKS_TABLE)
+        has_due = sql.SQL("coalesce(btrim(due_date), '') <> ''")
+        doc = {'hour_counts': {}, 'hour_scores': {}, 'weekday_counts': {}, 'weekday_scores': {},
+               'completed_by_day': {}, 'created_by_day': {}, 'created_completed_by_day': {},
+               'pending_due': {}, 'pending_undated': {},
+               'folder_created_by_day': {}, 'folder_completed_by_day': {}, 'weekday_hour_counts': {}}
+
+        def add(key, bucket, n, group=None):
+            counts = doc[key] if group is None else doc[key].setdefault(group, {})
+            counts[bucket] = counts.get(bucket, 0) + n
+
+        with self.pool.connection() as conn:
+            (doc['tasks'], doc['completed'], doc['high_priority'], doc['high_priority_completed'],
+             duration_sum, doc['duration_count']) = conn.execute(
+                sql.SQL(
+                    "SELECT count(*), count(*) FILTER (WHERE completed), "
+                    "count(*) FILTER (WHERE is_high_priority), "
+                    "count(*) FILTER (WHERE completed AND is_high_priority), "
+                    "sum(extract(epoch FROM completed_at - created_at) / 3600) FILTER (WHERE completed), "
+                    "count(*) FILTER (WHERE completed AND completed_at IS NOT NULL AND created_at IS NOT NULL) "
+                    "FROM {} WHERE user_id = %s"
+                ).format(tasks),
+                (user_id,),
+            ).fetchone()
+            doc['duration_sum_hours'] = float(duration_sum or 0)
+
+            completions = conn.execute(
+                sql.SQL(
+                    "SELECT extract(hour FROM local)::int, extract(isodow FROM local)::int - 1, local::date, "
+                    "folder, count(*), sum(weight) FROM ("
+                    "SELECT completed_at AT TIME ZONE %s AS local, coalesce(folder, 'uncategorized') AS folder, "
+                    "CASE WHEN is_high_priority THEN 3 WHEN {} THEN 2 ELSE 1 END AS weight "
+                    "FROM {} WHERE user_id = %s AND completed AND completed_at IS NOT NULL"
+                    ") done GROUP BY 1, 2, 3, 4"
+                ).format(has_due, tasks),
+                (tz_name, user_id),
+            ).fetchall()
+            for hour, weekday, day, folder, n, score in completions:
+                add('hour_counts', str(hour), n)
+                add('hour_scores', str(hour), int(score))
+                add('weekday_counts', str(weekday), n)
+                add('weekday_scores', str(weekday), int(score))
+                add('weekday_hour_counts', str(hour), n, str(weekday))
+                add('completed_by_day', day.isoformat(), n)
+                add('folder_completed_by_day', day.isoformat(), n, folder)
+
+            created = conn.execute(
+                sql.SQL(
+                    "SELECT (created_at AT TIME ZONE %s)::date, coalesce(folder, 'uncategorized'), count(*), "
+                    "count(*) FILTER (WHERE completed), count(*) FILTER (WHERE NOT completed AND NOT {}) "
+                    "FROM {} WHERE user_id = %s AND created_at IS NOT NULL GROUP BY 1, 2"
+                ).format(has_due, tasks),
+                (tz_name, user_id),
+            ).fetchall()
+            for day, folder, n, done, undated in created:
+                add('created_by_day', day.isoformat(), n)
+                add('folder_created_by_day', day.isoformat(), n, folder)
+                add('created_completed_by_day', day.isoformat(), done)
+                add('pending_undated', day.isoformat(), undated)
+
+            pending = conn.execute(
+                sql.SQL(
+                    "SELECT btrim(due_date), count(*) FROM {} "
+                    "WHERE user_id = %s AND NOT completed AND btrim(due_date) ~ '^[0-9]{{4}}-[0-9]{{2}}-[0-9]{{2}}$' "
+                    "GROUP BY 1"
+                ).format(tasks),
+                (user_id,),
+            ).fetchall()
+            for due, n in pending:
+                # Shaped like a date but not necessarily one (2026-02-30)
+                if date_to_ordinal(due) is not None:
+                    add('pending_due', due, n)
+
+        return public_rollups(doc, tz_name)
+
+    def rebuild_rollups(self, user_id: str, tz_name: str = "UTC") -> dict:
+        # Computed on read; nothing stored to rebuild
+        return self.rollups(user_id, tz_name)
+
+    # ----- writes -----
+
+    def new_id(self, user_id: str) -> str:
+        # Same length/alphabet class as Firestore auto-ids
+        return uuid.uuid4().hex[:20]
+
+    def add(self, user_id: str, task_id: str, task_data: dict):
+        columns, extra = _split_fields(task_data)
+        names = ['user_id', 'id'] + list(columns) + ['extra']
+        values = [sql.Literal(user_id), sql.Literal(task_id)] + [_value(v) for v in columns.values()] \
+            + [sql.Literal(Jsonb(extra))]
+        self._execute(sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
+            sql.Identifier(TASKS_TABLE),
+            sql.SQL(", ").join(sql.Identifier(n) for n in names),
+            sql.SQL(", ").join(values),
+        ))
+
+    def update(self, user_id: str, task_id: str, updates: dict, before: dict = None):
+        columns, extra = _split_fields(updates)
+        assignments = [sql.SQL("{} = {}").format(sql.Identifier(k), _value(v)) for k, v in columns.items()]
+        if extra:
+            assignments.append(sql.SQL("extra = extra || {}").format(Jsonb(extra)))
+        if not assignments:
+            return
+        assignments.append(_CHANGE_XID)
+
+        # Values are inlined as literals, so no %s placeholders here ('%' in a task name would break them)
+        updated = self._execute(sql.SQL("UPDATE {} SET {} WHERE user_id = {} AND id = {}").format(
+            sql.Identifier(TASKS_TABLE), sql.SQL(", ").join(assignments), user_id, task_id))
+        if updated == 0:
+            raise KeyError(f"Task '{task_id}' not found for user {user_id}")
+
+    def delete(self, user_id: str, task_id: str, before: dict = None):
+        self._execute(_TOMBSTONE_CTE.format(
+            tasks=sql.Identifier(TASKS_TABLE), tombstones=sql.Identifier(TOMBSTONES_TABLE),
+            where=sql.SQL("user_id = {} AND id = {}").format(user_id, task_id)))
+
+    def update_many(self, user_id: str, task_ids, updates: dict, befores: dict = None) -> int:
+        task_ids = list(dict.fromkeys(task_ids))
+        columns, extra = _split_fields(updates)
+        assignments = [sql.SQL("{} = {}").format(sql.Identifier(k), _value(v)) for k, v in columns.items()]
+        if extra:
+            assignments.append(sql.SQL("extra = extra || {}").format(Jsonb(extra)))
+        if not assignments or not task_ids:
+            return 0
+        assignments.append(_CHANGE_XID)
+
+        return self._execute(sql.SQL("UPDATE {} SET {} WHERE user_id = {} AND id = ANY({})").format(
+            sql.Identifier(TASKS_TABLE), sql.SQL(", ").join(assignments), user_id, task_ids))
+
+    def delete_many(self, user_id: str, task_ids, befores: dict = None) -> int:
+        task_ids = list(dict.fromkeys(task_ids))
+        if not task_ids:
+            return 0
+        return self._execute(_TOMBSTONE_CTE.format(
+            tasks=sql.Identifier(TASKS_TABLE), tombstones=sql.Identifier(TOMBSTONES_TABLE),
+            where=sql.SQL("user_id = {} AND id = ANY({})").format(user_id, task_ids)))
+
+    def delete_folder_tasks(self, user_id: str, folder: str) -> int:
+        return self._execute(_TOMBSTONE_CTE.format(
+            tasks=sql.Identifier(TASKS_TABLE), tombstones=sql.Identifier(TOMBSTONES_TABLE),
+            where=sql.SQL("user_id = {} AND folder = {}").format(user_id, folder)))
+
+    def move_folder_tasks(self, user_id: str, old_folder: str, new_folder: str) -> int:
+        return self._execute(
+            sql.SQL("UPDATE {} SET folder = %s, updated_at = now(), change_xid = pg_current_xact_id() "
+                    "WHERE user_id = %s AND folder = %s").format(
+                sql.Identifier(TASKS_TABLE)),
+            (new_folder, user_id, old_folder),
+        )
+
+
+# ============================================
+# SHARED INSTANCE
+# ============================================
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_postgres_task_repository() -> PostgresTaskRepository:
+    """Process-wide repository over one connection pool (created on first use)"""
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                conninfo = os.getenv("TASKS_POSTGRES_URL") or os.getenv("POSTGRES_URL") or os.getenv("DATABASE_URL")
+                if not conninfo:
+                    raise RuntimeError("❌ VOICELOG_TASK_STORE=postgres needs TASKS_POSTGRES_URL or POSTGRES_URL")
+
+                print(f"🔧 Opening Postgres task store pool...")
+                pool = ConnectionPool(
+                    conninfo,
+                    min_size=1,
+                    max_size=int(os.getenv("TASKS_PG_POOL_MAX", "10")),
+                    kwargs={'autocommit': True, 'options': '-c timezone=UTC'},
+                    open=True,
+                )
+                _repository = PostgresTaskRepository(pool)
+                print(f"✅ Postgres task store ready")
+    return _repository
@@ -0,0 +1,189 @@
+# utils/task_frame.py
+"""
+Columnar Task Analytics
+
+TaskFrame turns a user's Task objects into NumPy columns once, so the analysis
+tools compute histograms, weighted scores, overdue masks and durations with
+vectorised operations instead of converting every task's timestamps in Python.
+
+Columns:
+    created_us / completed_us   int64 UTC epoch microseconds (valid where has_created / has_completed_at)
+    completed, high_priority    bool
+    has_due                     bool — any due date, including unparseable legacy text
+    due_ordinal                 int64 date ordinal (valid where due_valid)
+    folder_codes                int32 index into folder_names (-1 = no folder)
+
+Local time is derived in bulk: the timezone's UTC-offset transitions over the
+data's time span are found once (utc_offsets_us), then applied with
+searchsorted — one zoneinfo call per day of span instead of one per task.
+"""
+
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+US_PER_SECOND = 1_000_000
+US_PER_HOUR = 3_600 * US_PER_SECOND
+US_PER_DAY = 86_400 * US_PER_SECOND
+SECONDS_PER_DAY = 86_400
+
+# date(1970, 1, 1).toordinal(); 1970-01-01 was a Thursday (Monday = 0)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+EPOCH_WEEKDAY = 3
+
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Time-of-day buckets used by get_productivity_patterns, indexed by local hour
+TIME_BUCKETS = ["morning", "afternoon", "evening", "night"]
+HOUR_TO_BUCKET = np.array(
+    [3] * 5 + [0] * 7 + [1] * 5 + [2] * 4 + [3] * 3,  # 0-4 night, 5-11 morning, 12-16 afternoon, 17-20 evening, 21-23 night
+    dtype=np.int64,
+)
+
+
+def _offset_seconds(epoch_seconds: int, tz) -> int:
+    return int(datetime.fromtimestamp(epoch_seconds, tz).utcoffset().total_seconds())
+
+
+def utc_offsets_us(ts_us: np.ndarray, tz) -> np.ndarray:
+    """
+    UTC offset (microseconds) in effect at each timestamp.
+
+    Samples the offset once per day across [min, max] and binary-searches each
+    day where it changes down to the exact second of the transition, so DST
+    changes are applied exactly. Assumes at most one transition per day.
+    """
+    if ts_us.size == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    lo = int(ts_us.min() // US_PER_SECOND)
+    hi = int(ts_us.max() // US_PER_SECOND) + 1
+    start = lo - lo % SECONDS_PER_DAY
+
+    transitions = []
+    offsets = [_offset_seconds(start, tz)]
+    previous = start
+    for sample in range(start + SECONDS_PER_DAY, hi + SECONDS_PER_DAY, SECONDS_PER_DAY):
+        offset = _offset_seconds(sample, tz)
+        if offset != offsets[-1]:
+            # First second at which the new offset applies, within (previous, sample]
+            low, high = previous, sample
+            while high - low > 1:
+                mid = (low + high) // 2
+                if _offset_seconds(mid, tz) == offsets[-1]:
+                    low = mid
+                else:
+                    high = mid
+            transitions.append(high * US_PER_SECOND)
+            offsets.append(offset)
+        previous = sample
+
+    if not transitions:
+        return np.full(ts_us.shape, offsets[0] * US_PER_SECOND, dtype=np.int64)
+    index = np.searchsorted(np.array(transitions, dtype=np.int64), ts_us, side='right')
+    return np.array(offsets, dtype=np.int64)[index] * US_PER_SECOND
+
+
+class LocalTimes:
+    """Local calendar fields for one timestamp column (meaningless where valid is False)"""
+    __slots__ = ('day_ordinal', 'hour', 'weekday')
+
+    def __init__(self, ts_us: np.ndarray, valid: np.ndarray, tz):
+        # Missing timestamps are stored as 0; keep them out of the offset scan's time span
+        if not valid.all():
+            ts_us = np.where(valid, ts_us, ts_us[valid][0] if valid.any() else 0)
+        local_us = ts_us + utc_offsets_us(ts_us, tz)
+        days = local_us // US_PER_DAY
+        self.day_ordinal = days + EPOCH_ORDINAL
+        self.hour = (local_us - days * US_PER_DAY) // US_PER_HOUR
+        self.weekday = (days + EPOCH_WEEKDAY) % 7
+
+
+def _epoch_us(values, n: int):
+    """Optional float epoch seconds → (int64 µs, valid mask)"""
+    seconds = np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=n)
+    valid = ~np.isnan(seconds)
+    return np.where(valid, np.round(seconds * US_PER_SECOND), 0).astype(np.int64), valid
+
+
+class TaskFrame:
+    """A user's tasks as NumPy columns (row i is tasks[i])"""
+
+    def __init__(self, tasks):
+        self.tasks = tasks
+        n = len(tasks)
+        self.size = n
+
+        self.created_us, self.has_created = _epoch_us((t.created_ts for t in tasks), n)
+        self.completed_us, self.has_completed_at = _epoch_us((t.completed_ts for t in tasks), n)
+        self.completed = np.fromiter((bool(t.completed) for t in tasks), dtype=bool, count=n)
+        self.high_priority = np.fromiter((bool(t.is_high_priority) for t in tasks), dtype=bool, count=n)
+
+        due = np.fromiter((-1 if t.due_ordinal is None else t.due_ordinal for t in tasks), dtype=np.int64, count=n)
+        self.due_valid = due >= 0
+        self.due_ordinal = due
+        self.has_due = self.due_valid | np.fromiter((bool(t.due_text) for t in tasks), dtype=bool, count=n)
+
+        codes = {}
+        self.folder_codes = np.fromiter(
+            (-1 if t.folder is None else codes.setdefault(t.folder, len(codes)) for t in tasks),
+            dtype=np.int32, count=n,
+        )
+        self.folder_names = list(codes)
+
+    def __len__(self):
+        return self.size
+
+    # ----- local time -----
+
+    def created_local(self, tz) -> LocalTimes:
+        return LocalTimes(self.created_us, self.has_created, tz)
+
+    def completed_local(self, tz) -> LocalTimes:
+        return LocalTimes(self.completed_us, self.has_completed_at, tz)
+
+    # ----- derived columns -----
+
+    def weights(self) -> np.ndarray:
+        """Productivity weight per task: high priority = 3, has deadline = 2, regular = 1"""
+        return np.where(self.high_priority, 3, np.where(self.has_due, 2, 1)).astype(np.float64)
+
+    def completion_hours(self, mask: np.ndarray = None) -> np.ndarray:
+        """created → completed durations in hours, for rows in mask with both timestamps"""
+        both = self.has_created & self.has_completed_at
+        if mask is not None:
+            both &= mask
+        return (self.completed_us[both] - self.created_us[both]) / US_PER_HOUR
+
+    def overdue(self, today_ordinal: int) -> np.ndarray:
+        """Incomplete tasks whose (parseable) due date is before today"""
+        return ~self.completed & self.due_valid & (self.due_ordinal < today_ordinal)
+
+    def folder_counts(self, mask: np.ndarray = None) -> dict:
+        """{folder: task count} over the rows in mask (all rows if None)"""
+        codes = self.folder_codes if mask is None else self.folder_codes[mask]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.folder_names))
+        return {name: int(c) for name, c in zip(self.folder_names, counts) if c}
+
+    def select(self, mask: np.ndarray, order: np.ndarray = None, limit: int = None) -> np.ndarray:
+        """Row indices where mask is set, optionally reordered (order indexes the selection) and capped"""
+        index = np.flatnonzero(mask)
+        if order is not None:
+            index = index[order]
+        if limit is not None:
+            index = index[:limit]
+        return index
+
+
+def today_ordinal(tz) -> int:
+    return datetime.now(timezone.utc).astimezone(tz).date().toordinal()
+
+
+def peak(scores: np.ndarray):
+    """Index of the strictly highest score, or None on a tie / no data"""
+    if scores.size == 0 or not scores.any():
+        return None
+    top = int(np.argmax(scores))
+    if scores.size > 1 and np.partition(scores, -2)[-2] == scores[top]:
+        return None
+    return top
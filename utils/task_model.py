@@ -0,0 +1,149 @@
+# utils/task_model.py
+"""
+Compact Task Model
+
+One Task per task document, built once per fetch by FirebaseClient.get_task_models()
+(and MonitorAgent). Timestamps are kept as float epoch seconds (UTC) and the due
+date as a date ordinal, so analysis code compares numbers instead of re-parsing
+ISO strings for every task in every tool call.
+
+ISO strings only appear at the JSON boundary: Task.to_dict() produces exactly
+the dict FirebaseClient.get_all_tasks() has always returned.
+"""
+
+from datetime import date, datetime, timezone
+
+_DATE_FORMAT_LEN = len("YYYY-MM-DD")
+
+
+def to_epoch(value):
+    """Firestore Timestamp / datetime / ISO string → UTC epoch seconds (None if absent or unparseable)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    if hasattr(value, 'timestamp'):
+        return value.timestamp()
+    if isinstance(value, str) and value.strip():
+        try:
+            dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    return None
+
+
+def epoch_to_iso(ts):
+    """UTC epoch seconds → '2026-01-31T09:15:00.123456+00:00' (None passes through)"""
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+def date_to_ordinal(value):
+    """'YYYY-MM-DD' → date ordinal, None for anything else"""
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if len(value) != _DATE_FORMAT_LEN:
+        return None
+    try:
+        return date.fromisoformat(value).toordinal()
+    except ValueError:
+        return None
+
+
+def _legacy_due_text(value):
+    """due_date values that aren't plain dates, rendered the way _timestamp_to_iso always did"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value if value.strip() else None
+    ts = to_epoch(value)
+    return epoch_to_iso(ts)
+
+
+class Task:
+    """
+    A task document with parsed timestamps.
+
+    created_ts / completed_ts: UTC epoch seconds or None
+    due_ordinal: date.toordinal() of a 'YYYY-MM-DD' due date, or None
+    due_text: the raw due_date when it isn't a plain date (legacy data), else None
+    """
+
+    __slots__ = (
+        'id', 'name', 'folder', 'completed', 'is_high_priority',
+        'recurrence', 'time', 'duration',
+        'created_ts', 'completed_ts', 'due_ordinal', 'due_text',
+    )
+
+    def __init__(self, id, name=None, folder=None, completed=False, is_high_priority=False,
+                 recurrence=None, time=None, duration=None,
+                 created_ts=None, completed_ts=None, due_ordinal=None, due_text=None):
+        self.id = id
+        self.name = name
+        self.folder = folder
+        self.completed = completed
+        self.is_high_priority = is_high_priority
+        self.recurrence = recurrence
+        self.time = time
+        self.duration = duration
+        self.created_ts = created_ts
+        self.completed_ts = completed_ts
+        self.due_ordinal = due_ordinal
+        self.due_text = due_text
+
+    @classmethod
+    def from_document(cls, task_id: str, data: dict) -> "Task":
+        """Build from a task document's to_dict() (any TASK_FIELD_SETS projection)"""
+        due = data.get('due_date')
+        due_ordinal = date_to_ordinal(due)
+        return cls(
+            task_id,
+            name=data.get('name'),
+            folder=data.get('folder'),
+            completed=data.get('completed', False),
+            is_high_priority=data.get('is_high_priority', False),
+            recurrence=data.get('recurrence'),
+            time=data.get('time'),
+            duration=data.get('duration'),
+            created_ts=to_epoch(data.get('created_at')),
+            completed_ts=to_epoch(data.get('completed_at')),
+            due_ordinal=due_ordinal,
+            due_text=None if due_ordinal is not None else _legacy_due_text(due),
+        )
+
+    @property
+    def has_due_date(self) -> bool:
+        return self.due_ordinal is not None or bool(self.due_text)
+
+    @property
+    def due_date(self):
+        """Due date as stored ('YYYY-MM-DD', legacy text, or None)"""
+        if self.due_ordinal is not None:
+            return date.fromordinal(self.due_ordinal).isoformat()
+        return self.due_text
+
+    def to_dict(self) -> dict:
+        """JSON-ready dict with ISO UTC timestamps (the get_all_tasks() shape)"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'folder': self.folder,
+            'completed': self.completed,
+            'recurrence': self.recurrence,
+            'time': self.time,
+            'duration': self.duration,
+            'is_high_priority': self.is_high_priority,
+            'created_at': epoch_to_iso(self.created_ts),
+            'completed_at': epoch_to_iso(self.completed_ts),
+            'due_date': self.due_date,
+        }
+
+    def __repr__(self):
+        return f"Task({self.id!r}, {self.name!r}, folder={self.folder!r}, completed={self.completed})"
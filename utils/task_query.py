@@ -0,0 +1,162 @@
+# utils/task_query.py
+"""
+Task Filter Query Planner
+
+Turns get_tasks_by_filter arguments into a task store query plus whatever
+has to be checked in Python:
+
+    completed / is_high_priority   → equality filters in the store
+    due_before / due_after         → range on due_date in the store, ordered by (due_date, id)
+    overdue_only                   → completed == False and due_date <= yesterday
+    hour (local completion hour)   → client-side; depends on the user's timezone
+
+Results come back one page at a time in the store's order with an opaque
+cursor for the next page, so a long history is never downloaded in one go
+and nothing is cut off silently. On Firestore the combinations need the
+composite indexes in firestore.indexes.json.
+
+Due bounds are compared as strings in the store; rows are re-checked here
+with date_to_ordinal so legacy free-text due dates never match a date bound.
+(Store-side counts can still include date-shaped junk like '2026-02-30'.)
+"""
+
+import os
+import json
+import base64
+from datetime import date, datetime
+
+from utils.task_model import Task, date_to_ordinal
+
+# Rows examined per call before a short page is returned with a cursor (hour filter)
+TASK_QUERY_MAX_SCAN = int(os.getenv("TASK_QUERY_MAX_SCAN", "2000"))
+# Rows fetched per round trip while a client-side predicate is thinning the page
+TASK_QUERY_BATCH_SIZE = int(os.getenv("TASK_QUERY_BATCH_SIZE", "200"))
+
+# Bounds that keep empty and free-text due dates ('soon') out of due_date ranges
+DUE_DATE_MIN = "0000-01-01"
+DUE_DATE_MAX = "9999-12-31"
+
+
+def _iso_date(value):
+    """Normalised 'YYYY-MM-DD' for a valid date string, else None (invalid bounds are ignored)"""
+    ordinal = date_to_ordinal(value)
+    return date.fromordinal(ordinal).isoformat() if ordinal is not None else None
+
+
+class TaskQuery:
+    """One get_tasks_by_filter request, split into store filters and the client-side rest"""
+
+    def __init__(self, completed: bool = None, is_high_priority: bool = None, due_before: str = None,
+                 due_after: str = None, overdue_only: bool = False, hour: int = None, tz=None,
+                 today: int = None):
+        self.empty = False
+        due_before = _iso_date(due_before)
+        due_after = _iso_date(due_after)
+
+        if overdue_only:
+            if completed is True:
+                self.empty = True
+            completed = False
+            yesterday = date.fromordinal(today - 1).isoformat()
+            due_before = min(due_before, yesterday) if due_before else yesterday
+
+        if due_before or due_after:
+            due_after = due_after or DUE_DATE_MIN
+            due_before = due_before or DUE_DATE_MAX
+            if due_after > due_before:
+                self.empty = True
+
+        self.completed = completed
+        self.is_high_priority = is_high_priority
+        self.due_before = due_before
+        self.due_after = due_after
+        self.hour = hour
+        self.tz = tz
+
+        self.order = 'due' if due_after else 'id'
+        # Ordinal bounds for the re-check (DUE_DATE_MIN / MAX have none)
+        self._due_range = (date_to_ordinal(due_after), date_to_ordinal(due_before)) if due_after else None
+
+    @property
+    def store_filters(self) -> dict:
+        """Keyword filters for TaskRepository.query / count"""
+        return {
+            'completed': self.completed,
+            'is_high_priority': self.is_high_priority,
+            'due_before': self.due_before,
+            'due_after': self.due_after,
+        }
+
+    @property
+    def client_side(self) -> bool:
+        """Whether rows can be dropped after the store returns them (beyond legacy due strings)"""
+        return self.hour is not None
+
+    def order_key(self, task_id: str, data: dict) -> list:
+        return [data.get('due_date'), task_id] if self.order == 'due' else [task_id]
+
+    def matches(self, task: Task) -> bool:
+        if self._due_range is not None:
+            low, high = self._due_range
+            if task.due_ordinal is None or (low is not None and task.due_ordinal < low) \
+                    or (high is not None and task.due_ordinal > high):
+                return False
+        if self.hour is not None:
+            if task.completed_ts is None or datetime.fromtimestamp(task.completed_ts, self.tz).hour != self.hour:
+                return False
+        return True
+
+    # ----- cursors -----
+
+    def encode_cursor(self, key: list) -> str:
+        raw = json.dumps({'o': self.order, 'k': key}, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: str) -> list:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            key = payload['k']
+            valid = payload['o'] == self.order and isinstance(key, list) and len(key) == len(self.order_key('', {}))
+        except (ValueError, TypeError, KeyError):
+            valid = False
+        if not valid:
+            raise ValueError(f"Invalid cursor '{cursor}' for this filter")
+        return key
+
+    # ----- execution -----
+
+    def run(self, repository, user_id: str, fields: str = "analytics", limit: int = 15,
+            cursor: str = None, max_scan: int = None):
+        """
+        One page of matching tasks → (list of Task, next_cursor or None when done).
+
+        Fetches store pages until `limit` matches are found, the store runs
+        out, or max_scan rows were examined; in the last case the page may be
+        short and the cursor resumes after the last row examined.
+        """
+        if self.empty:
+            return [], None
+
+        max_scan = TASK_QUERY_MAX_SCAN if max_scan is None else max_scan
+        after = self.decode_cursor(cursor) if cursor else None
+        tasks, scanned = [], 0
+
+        while True:
+            wanted = limit - len(tasks) + 1  # one extra row tells whether another page exists
+            size = max(wanted, min(TASK_QUERY_BATCH_SIZE, max_scan - scanned)) if self.client_side else wanted
+            records = repository.query(user_id, fields, limit=size, start_after=after, **self.store_filters)
+
+            for record in records:
+                data = record.to_dict()
+                task = Task.from_document(record.id, data)
+                if self.matches(task):
+                    if len(tasks) == limit:
+                        return tasks, self.encode_cursor(after)
+                    tasks.append(task)
+                scanned += 1
+                after = self.order_key(record.id, data)
+
+            if len(records) < size:
+                return tasks, None
+            if scanned >= max_scan:
+                return tasks, self.encode_cursor(after)
@@ -0,0 +1,710 @@
+# utils/task_repository.py
+"""
+Task Storage Layer
+
+FirebaseClient keeps the user-facing behaviour (messages, duplicate checks,
+data versions, fuzzy folder matching) and delegates every read and write of
+task documents to a TaskRepository:
+
+    FirestoreTaskRepository  → users/{uid}/tasks + users/{uid}/task_tombstones (default)
+    PostgresTaskRepository   → voicelog_tasks + voicelog_task_tombstones
+                               (utils/postgres_task_repository.py, VOICELOG_TASK_STORE=postgres)
+
+Records returned by a repository look like Firestore snapshots: `.id` plus
+`.to_dict()`. Timestamps come back as datetimes, due_date as the stored
+"YYYY-MM-DD" string. Writes accept firestore.SERVER_TIMESTAMP for "now".
+
+Per-user task counters (stats()) answer "how many / which folder" questions
+without a scan. Firestore keeps them in users/{uid}/stats/tasks, updated in
+the same batch as every task write; Postgres answers them with one indexed
+GROUP BY. Analytics rollups (rollups(), see utils/task_rollups.py) follow the
+same pattern in users/{uid}/stats/analytics.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+from firebase_admin import firestore
+from google.api_core import exceptions as gexc
+
+from utils.task_rollups import (
+    ROLLUP_SCHEMA, ROLLUP_FIELDS, get_tz, rollup_delta, public_rollups, profile_timezone,
+)
+from utils.task_query import DUE_DATE_MIN
+
+# Firestore batch write limit
+BATCH_SIZE = 500
+
+# Bumped when the stats document layout changes; older documents get rebuilt
+TASK_STATS_SCHEMA = 1
+
+# Scans per rebuild before giving up on storing it (task writes kept landing mid-scan)
+REBUILD_ATTEMPTS = 3
+
+# Tombstones older than this are pruned (CleanupAgent); sync cursors older than
+# this can't be answered with a delta and get a full resync instead
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+
+# Allowance for app-server vs Firestore clock drift when flooring sync cursors
+CURSOR_CLOCK_SKEW = timedelta(minutes=5)
+
+
+# ============================================
+# DELTA SYNC CURSORS
+# ============================================
+# Firestore cursors are the integer number of microseconds since the epoch of
+# the newest updated_at the client has seen. Firestore timestamps are commit
+# times, microsecond-precise, so the round trip is exact. Postgres cursors add
+# a transaction horizon (see PostgresTaskRepository.changes).
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def datetime_to_cursor(dt: datetime) -> str:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return str((dt - _EPOCH) // timedelta(microseconds=1))
+
+
+def cursor_to_datetime(cursor: str) -> datetime:
+    try:
+        micros = int(cursor)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid sync cursor '{cursor}'")
+    if micros < 0:
+        raise ValueError(f"Invalid sync cursor '{cursor}'")
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+class TaskRepository:
+    """Storage interface for a user's tasks. Filters are AND-ed; None means "don't filter"."""
+
+    # ----- reads -----
+
+    def get(self, user_id: str, task_id: str):
+        """Task record by id, or None"""
+        raise NotImplementedError
+
+    def find_by_name(self, user_id: str, name: str, exact_only: bool = False):
+        """
+        Task record whose name equals `name`, or None.
+
+        Exact-case matches win; unless exact_only, falls back to a
+        case-insensitive match.
+        """
+        raise NotImplementedError
+
+    def stream(self, user_id: str, fields: str = "full", folder: str = None, completed: bool = None,
+               is_high_priority: bool = None, due_before: str = None, due_after: str = None):
+        """
+        Iterate task records restricted to the named field set (TASK_FIELD_SETS).
+
+        due_before / due_after are inclusive "YYYY-MM-DD" bounds on due_date;
+        tasks without a due date never match a due bound.
+        """
+        raise NotImplementedError
+
+    def page(self, user_id: str, fields: str = "full", folder: str = None,
+             limit: int = None, start_after: str = None):
+        """One page in task-id order → (records, next_cursor or None)"""
+        raise NotImplementedError
+
+    def changes(self, user_id: str, since: str = None, fields: str = "mobile") -> dict:
+        """
+        Tasks and tombstones touched after the sync cursor `since` (None = everything).
+
+        Returns {'tasks': [records], 'deleted': [task ids], 'next_cursor': str,
+                 'since_time': when the `since` cursor was issued (None for a full sync)}.
+        Raises ValueError for a cursor this store didn't issue.
+        """
+        raise NotImplementedError
+
+    def cursor_time(self, cursor: str) -> datetime:
+        """When a sync cursor was issued (UTC); ValueError if it isn't one of ours"""
+        return cursor_to_datetime(cursor)
+
+    def prune_tombstones(self, user_id: str, before: datetime) -> int:
+        """Drop tombstones last touched before `before`; returns how many"""
+        raise NotImplementedError
+
+    def query(self, user_id: str, fields: str = "full", completed: bool = None, is_high_priority: bool = None,
+              due_before: str = None, due_after: str = None, limit: int = None, start_after: list = None):
+        """
+        Filtered tasks in a stable order for cursor pagination (utils/task_query.py):
+        (due_date, id) when a due bound is given, else id. start_after is the
+        order key of the last record already seen. Due bounds compare as
+        strings here; the caller re-checks them. Returns up to limit records.
+        """
+        raise NotImplementedError
+
+    def count(self, user_id: str, folder: str = None, completed: bool = None, is_high_priority: bool = None,
+              due_before: str = None, due_after: str = None) -> int:
+        raise NotImplementedError
+
+    def stats(self, user_id: str, today: str = None) -> dict:
+        """
+        Task counters for a user:
+
+            {
+                'total': 42, 'completed': 30, 'high_priority_pending': 2,
+                'folders': {'work': {'total': 20, 'completed': 15}, ...},
+                'overdue': 3,   # only when today ("YYYY-MM-DD", user's local date) is given
+            }
+        """
+        raise NotImplementedError
+
+    def rebuild_stats(self, user_id: str, today: str = None) -> dict:
+        """Recompute the counters from the tasks themselves; returns stats()"""
+        raise NotImplementedError
+
+    def rollups(self, user_id: str, tz_name: str = "UTC") -> dict:
+        """
+        Analytics rollups bucketed in tz_name (see utils/task_rollups.py):
+
+            {
+                'timezone': 'America/Los_Angeles', 'tasks': 42, 'completed': 30,
+                'high_priority': 5, 'high_priority_completed': 4,
+                'hour_counts': [24 ints], 'hour_scores': [24 ints],     # by local completion hour
+                'weekday_counts': [7 ints], 'weekday_scores': [7 ints], # Monday = 0
+                'weekday_hour_counts': [7 lists of 24 ints],             # heatmap
+                'duration_sum_hours': 512.5, 'duration_count': 29,
+                'created_by_day': {'2026-01-31': 3, ...},               # local dates
+                'created_completed_by_day': {...}, 'completed_by_day': {...},
+                'pending_due': {'2026-02-03': 1, ...},                  # incomplete, by due date
+                'pending_undated': {'2026-01-20': 2, ...},              # incomplete, no due date, by created day
+                'folder_created_by_day': {'work': {'2026-01-31': 2, ...}, ...},
+                'folder_completed_by_day': {'work': {...}, ...},
+            }
+        """
+        raise NotImplementedError
+
+    def rebuild_rollups(self, user_id: str, tz_name: str = "UTC") -> dict:
+        """Recompute the rollups from the tasks themselves; returns rollups()"""
+        raise NotImplementedError
+
+    # ----- writes -----
+
+    def new_id(self, user_id: str) -> str:
+        raise NotImplementedError
+
+    def add(self, user_id: str, task_id: str, task_data: dict):
+        raise NotImplementedError
+
+    def update(self, user_id: str, task_id: str, updates: dict, before: dict = None):
+        """
+        Apply field updates. `before` is the task's current data when the
+        caller already has it (saves a read when counters must be adjusted).
+        """
+        raise NotImplementedError
+
+    def delete(self, user_id: str, task_id: str, before: dict = None):
+        """Delete a task and leave a tombstone so delta sync can report it"""
+        raise NotImplementedError
+
+    def delete_folder_tasks(self, user_id: str, folder: str) -> int:
+        """Delete (and tombstone) every task in a folder; returns how many"""
+        raise NotImplementedError
+
+    def get_many(self, user_id: str, task_ids) -> dict:
+        """{task_id: record} for the ids that exist, in one round trip"""
+        raise NotImplementedError
+
+    def update_many(self, user_id: str, task_ids, updates: dict, befores: dict = None) -> int:
+        """
+        Apply the same field updates to several tasks in one write (chunked
+        at the batch limit); befores maps task_id → current data when the
+        caller already has it. Returns how many tasks were updated.
+        """
+        raise NotImplementedError
+
+    def delete_many(self, user_id: str, task_ids, befores: dict = None) -> int:
+        """Delete (and tombstone) several tasks in one write; returns how many"""
+        raise NotImplementedError
+
+    def move_folder_tasks(self, user_id: str, old_folder: str, new_folder: str) -> int:
+        """Re-point every task in old_folder at new_folder; returns how many"""
+        raise NotImplementedError
+
+
+def _due_in_range(data: dict, due_before: str = None, due_after: str = None) -> bool:
+    """Python twin of the SQL due_date bounds (plain string comparison on ISO dates)"""
+    if due_before is None and due_after is None:
+        return True
+    due = data.get('due_date')
+    if not isinstance(due, str) or not due:
+        return False
+    if due_before is not None and due > due_before:
+        return False
+    if due_after is not None and due < due_after:
+        return False
+    return True
+
+
+# Task fields that feed the counters
+STATS_FIELDS = ('folder', 'completed', 'is_high_priority', 'due_date')
+
+
+def _stats_contribution(data: dict) -> dict:
+    """What one task adds to the counters, keyed by field path tuples"""
+    if data is None:
+        return {}
+
+    folder = data.get('folder') or 'uncategorized'
+    completed = 1 if data.get('completed') else 0
+    contribution = {
+        ('total',): 1,
+        ('completed',): completed,
+        ('folders', folder, 'total'): 1,
+        ('folders', folder, 'completed'): completed,
+    }
+    if not completed:
+        if data.get('is_high_priority'):
+            contribution[('high_priority_pending',)] = 1
+        due = data.get('due_date')
+        if isinstance(due, str) and due:
+            # Incomplete tasks per due date; overdue = sum of dates before today
+            contribution[('pending_due', due)] = 1
+    return contribution
+
+
+def _stats_delta(before: dict = None, after: dict = None, delta: dict = None) -> dict:
+    """Accumulate after − before into delta (zero entries dropped)"""
+    delta = {} if delta is None else delta
+    for path, value in _stats_contribution(after).items():
+        delta[path] = delta.get(path, 0) + value
+    for path, value in _stats_contribution(before).items():
+        delta[path] = delta.get(path, 0) - value
+    return {path: value for path, value in delta.items() if value}
+
+
+def _nest(flat: dict, leaf=lambda v: v) -> dict:
+    nested = {}
+    for path, value in flat.items():
+        node = nested
+        for part in path[:-1]:
+            node = node.setdefault(part, {})
+        node[path[-1]] = leaf(value)
+    return nested
+
+
+def _public_stats(doc: dict, today: str = None) -> dict:
+    """Stats document → the stats() shape (empty folders dropped, overdue derived)"""
+    result = {
+        'total': doc.get('total', 0),
+        'completed': doc.get('completed', 0),
+        'high_priority_pending': doc.get('high_priority_pending', 0),
+        'folders': {
+            folder: {'total': counts.get('total', 0), 'completed': counts.get('completed', 0)}
+            for folder, counts in (doc.get('folders') or {}).items()
+            if counts.get('total', 0) > 0
+        },
+    }
+    if today is not None:
+        result['overdue'] = sum(n for due, n in (doc.get('pending_due') or {}).items() if due < today and n > 0)
+    return result
+
+
+class FirestoreTaskRepository(TaskRepository):
+    """Tasks under users/{uid}/tasks, deletions tombstoned under users/{uid}/task_tombstones"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def _tasks_ref(self, user_id: str):
+        return self.db.collection('users').document(user_id).collection('tasks')
+
+    def _tombstones_ref(self, user_id: str):
+        return self.db.collection('users').document(user_id).collection('task_tombstones')
+
+    def _stats_ref(self, user_id: str):
+        return self.db.collection('users').document(user_id).collection('stats').document('tasks')
+
+    def _stage_stats(self, batch, user_id: str, delta: dict):
+        """Add the counter increments for a write to the same batch"""
+        if not delta:
+            return
+        update = _nest(delta, leaf=firestore.Increment)
+        update['updated_at'] = firestore.SERVER_TIMESTAMP
+        batch.set(self._stats_ref(user_id), update, merge=True)
+
+    def _rollups_ref(self, user_id: str):
+        return self.db.collection('users').document(user_id).collection('stats').document('analytics')
+
+    def _stage_rollups(self, batch, user_id: str, pairs):
+        """
+        Add the rollup increments for (before, after) task data pairs to the same batch.
+
+        Buckets by the writer's view of the profile timezone and stamps it, so
+        a reader in another timezone rebuilds instead of trusting the buckets.
+        """
+        tz_name = profile_timezone(self.db, user_id)
+        tz, now = get_tz(tz_name), datetime.now(timezone.utc)
+        delta = {}
+        for before, after in pairs:
+            delta = rollup_delta(before, after, tz, now, delta)
+        if not delta:
+            return
+        update = _nest(delta, leaf=firestore.Increment)
+        update['timezone'] = tz_name
+        update['updated_at'] = firestore.SERVER_TIMESTAMP
+        batch.set(self._rollups_ref(user_id), update, merge=True)
+
+    def _query(self, user_id: str, fields: str = "full", folder: str = None, completed: bool = None,
+               is_high_priority: bool = None, extra_fields: tuple = ()):
+        """Tasks query with the named projection; equality filters run server-side"""
+        from utils.firebase_client import TASK_FIELD_SETS
+
+        if fields not in TASK_FIELD_SETS:
+            raise ValueError(f"Unknown task field set '{fields}'. Use one of: {', '.join(TASK_FIELD_SETS)}")
+
+        query = self._tasks_ref(user_id)
+        if folder is not None:
+            query = query.where('folder', '==', folder)
+        if completed is not None:
+            query = query.where('completed', '==', completed)
+        if is_high_priority is not None:
+            query = query.where('is_high_priority', '==', is_high_priority)
+
+        field_paths = TASK_FIELD_SETS[fields]
+        if field_paths is not None:
+            query = query.select(list(field_paths) + [f for f in extra_fields if f not in field_paths])
+
+        return query
+
+    def _due_range(self, query, due_before: str = None, due_after: str = None):
+        """Range filter on due_date (served by the composite indexes in firestore.indexes.json)"""
+        if due_before is None and due_after is None:
+            return query
+        # '' sorts before every date; None is a different type and never matches a string range
+        query = query.where('due_date', '>=', max(due_after or '', DUE_DATE_MIN))
+        if due_before is not None:
+            query = query.where('due_date', '<=', due_before)
+        return query
+
+    # ----- reads -----
+
+    def get(self, user_id: str, task_id: str):
+        snapshot = self._tasks_ref(user_id).document(task_id).get()
+        return snapshot if snapshot.exists else None
+
+    def get_many(self, user_id: str, task_ids) -> dict:
+        refs = [self._tasks_ref(user_id).document(task_id) for task_id in dict.fromkeys(task_ids)]
+        if not refs:
+            return {}
+        return {snapshot.id: snapshot for snapshot in self.db.get_all(refs) if snapshot.exists}
+
+    def find_by_name(self, user_id: str, name: str, exact_only: bool = False):
+        exact = list(self._tasks_ref(user_id).where('name', '==', name).limit(1).stream())
+        if exact:
+            return exact[0]
+        if exact_only:
+            return None
+
+        # Firestore can't compare case-insensitively: scan names only, then fetch the hit
+        name_lower = name.lower()
+        for task in self._query(user_id, fields="name+completed").stream():
+            if (task.to_dict().get('name') or '').lower() == name_lower:
+                return self.get(user_id, task.id)
+        return None
+
+    def stream(self, user_id: str, fields: str = "full", folder: str = None, completed: bool = None,
+               is_high_priority: bool = None, due_before: str = None, due_after: str = None):
+        if due_before is None and due_after is None:
+            return self._query(user_id, fields, folder, completed, is_high_priority).stream()
+
+        query = self._query(user_id, fields, folder, completed, is_high_priority, extra_fields=('due_date',))
+        query = self._due_range(query, due_before, due_after)
+        # Same string comparison as the store; only drops what Firestore's type ordering lets through
+        return (task for task in query.stream() if _due_in_range(task.to_dict(), due_before, due_after))
+
+    def page(self, user_id: str, fields: str = "full", folder: str = None,
+             limit: int = None, start_after: str = None):
+        query = self._query(user_id, fields, folder).order_by('__name__')
+        if start_after:
+            query = query.start_after({'__name__': start_after})
+        if limit is not None:
+            # Fetch one extra row to learn whether another page exists
+            query = query.limit(limit + 1)
+
+        docs = list(query.stream())
+        if limit is not None and len(docs) > limit:
+            docs = docs[:limit]
+            return docs, docs[-1].id
+        return docs, None
+
+    def changes(self, user_id: str, since: str = None, fields: str = "mobile") -> dict:
+        since_time = cursor_to_datetime(since) if since else None
+        # Queries see every commit up to the read, so anything missed is stamped after it (less clock
+        # skew). Flooring the cursor there keeps an idle account's cursor inside tombstone retention.
+        latest = datetime.now(timezone.utc) - CURSOR_CLOCK_SKEW
+        if since_time is not None and since_time > latest:
+            latest = since_time
+
+        query = self._query(user_id, fields)
+        if since_time is not None:
+            query = query.where('updated_at', '>', since_time)
+        tasks = list(query.stream())
+        for task in tasks:
+            task_updated = task.to_dict().get('updated_at')
+            if isinstance(task_updated, datetime) and task_updated > latest:
+                latest = task_updated
+
+        deleted = []
+        if since_time is not None:
+            for tombstone in self._tombstones_ref(user_id).where('updated_at', '>', since_time).stream():
+                deleted.append(tombstone.id)
+                deleted_at = tombstone.to_dict().get('updated_at')
+                if isinstance(deleted_at, datetime) and deleted_at > latest:
+                    latest = deleted_at
+
+        return {
+            'tasks': tasks,
+            'deleted': deleted,
+            'next_cursor': datetime_to_cursor(latest),
+            'since_time': since_time,
+        }
+
+    def prune_tombstones(self, user_id: str, before: datetime) -> int:
+        old = list(self._tombstones_ref(user_id).where('updated_at', '<', before).select([]).stream())
+        for start in range(0, len(old), BATCH_SIZE):
+            batch = self.db.batch()
+            for tombstone in old[start:start + BATCH_SIZE]:
+                batch.delete(tombstone.reference)
+            batch.commit()
+        return len(old)
+
+    def query(self, user_id: str, fields: str = "full", completed: bool = None, is_high_priority: bool = None,
+              due_before: str = None, due_after: str = None, limit: int = None, start_after: list = None):
+        ranged = due_before is not None or due_after is not None
+        query = self._query(user_id, fields, completed=completed, is_high_priority=is_high_priority,
+                            extra_fields=('due_date',) if ranged else ())
+        query = self._due_range(query, due_before, due_after)
+
+        order = ('due_date', '__name__') if ranged else ('__name__',)
+        for field in order:
+            query = query.order_by(field)
+        if start_after:
+            query = query.start_after(dict(zip(order, start_after)))
+        if limit is not None:
+            query = query.limit(limit)
+        return list(query.stream())
+
+    def count(self, user_id: str, folder: str = None, completed: bool = None, is_high_priority: bool = None,
+              due_before: str = None, due_after: str = None) -> int:
+        # Aggregation query: billed per 1000 index entries, no documents downloaded
+        query = self._query(user_id, folder=folder, completed=completed, is_high_priority=is_high_priority)
+        result = self._due_range(query, due_before, due_after).count().get()
+        return int(result[0][0].value)
+
+    def stats(self, user_id: str, today: str = None) -> dict:
+        snapshot = self._stats_ref(user_id).get()
+        doc = snapshot.to_dict() if snapshot.exists else None
+
+        # Missing or written before counters existed (increments only) → build from the tasks once
+        if not doc or doc.get('schema') != TASK_STATS_SCHEMA:
+            return self.rebuild_stats(user_id, today)
+        return _public_stats(doc, today)
+
+    def rebuild_stats(self, user_id: str, today: str = None) -> dict:
+        def scan():
+            delta = {}
+            for task in self._tasks_ref(user_id).select(list(STATS_FIELDS)).stream():
+                delta = _stats_delta(None, task.to_dict(), delta)
+            doc = _nest(delta)
+            doc['schema'] = TASK_STATS_SCHEMA
+            return doc
+
+        return _public_stats(self._replace_if_unchanged(self._stats_ref(user_id), scan), today)
+
+    def _replace_if_unchanged(self, ref, scan) -> dict:
+        """
+        Replace a counters document with scan(), unless a task write lands meanwhile.
+
+        Every task write stages its Increments on the counters document in the
+        same batch, so its update_time read before the scan tells whether the
+        scan missed anything. The replace carries that as a precondition; if it
+        fails the scan is redone. Returns the scanned document, stored or not.
+        """
+        for _ in range(REBUILD_ATTEMPTS):
+            snapshot = ref.get()
+            doc = scan()
+            doc.update({'rebuilt_at': firestore.SERVER_TIMESTAMP, 'updated_at': firestore.SERVER_TIMESTAMP})
+            try:
+                if snapshot.exists:
+                    # update() with whole top-level maps; fields the scan no longer produces are dropped
+                    stale = {field: firestore.DELETE_FIELD for field in snapshot.to_dict() if field not in doc}
+                    ref.update({**doc, **stale},
+                               option=self.db.write_option(last_update_time=snapshot.update_time))
+                else:
+                    ref.create(doc)
+                return doc
+            except (gexc.FailedPrecondition, gexc.Conflict, gexc.NotFound):
+                continue
+
+        # Still contended: answer from the last scan and leave the rebuild to a later read
+        return doc
+
+    def rollups(self, user_id: str, tz_name: str = "UTC") -> dict:
+        snapshot = self._rollups_ref(user_id).get()
+        doc = snapshot.to_dict() if snapshot.exists else None
+
+        if doc and doc.get('schema') == ROLLUP_SCHEMA and doc.get('timezone') == tz_name:
+            return public_rollups(doc, tz_name)
+
+        # Missing, older layout or bucketed in another timezone → build from the tasks.
+        # Only store it when writers bucket by the same timezone, or their increments would mix in.
+        if tz_name == profile_timezone(self.db, user_id):
+            return self.rebuild_rollups(user_id, tz_name)
+        return public_rollups(self._scan_rollups(user_id, tz_name), tz_name)
+
+    def _scan_rollups(self, user_id: str, tz_name: str) -> dict:
+        tz, now = get_tz(tz_name), datetime.now(timezone.utc)
+        delta = {}
+        for task in self._tasks_ref(user_id).select(list(ROLLUP_FIELDS)).stream():
+            delta = rollup_delta(None, task.to_dict(), tz, now, delta)
+        return _nest(delta)
+
+    def rebuild_rollups(self, user_id: str, tz_name: str = "UTC") -> dict:
+        def scan():
+            doc = self._scan_rollups(user_id, tz_name)
+            doc.update({'schema': ROLLUP_SCHEMA, 'timezone': tz_name})
+            return doc
+
+        return public_rollups(self._replace_if_unchanged(self._rollups_ref(user_id), scan), tz_name)
+
+    # ----- writes -----
+
+    def new_id(self, user_id: str) -> str:
+        return self._tasks_ref(user_id).document().id
+
+    def add(self, user_id: str, task_id: str, task_data: dict):
+        batch = self.db.batch()
+        batch.set(self._tasks_ref(user_id).document(task_id), task_data)
+        self._stage_stats(batch, user_id, _stats_delta(None, task_data))
+        self._stage_rollups(batch, user_id, [(None, task_data)])
+        batch.commit()
+
+    def update(self, user_id: str, task_id: str, updates: dict, before: dict = None):
+        batch = self.db.batch()
+        batch.update(self._tasks_ref(user_id).document(task_id), updates)
+
+        touches_stats = any(field in updates for field in STATS_FIELDS)
+        touches_rollups = any(field in updates for field in ROLLUP_FIELDS)
+        if touches_stats or touches_rollups:
+            if before is None:
+                current = self.get(user_id, task_id)
+                before = current.to_dict() if current is not None else None
+            if before is not None:
+                after = {**before, **updates}
+                if touches_stats:
+                    self._stage_stats(batch, user_id, _stats_delta(before, after))
+                if touches_rollups:
+                    self._stage_rollups(batch, user_id, [(before, after)])
+
+        batch.commit()
+
+    def _tombstone(self, batch, user_id: str, task_id: str):
+        batch.delete(self._tasks_ref(user_id).document(task_id))
+        batch.set(self._tombstones_ref(user_id).document(task_id), {
+            'task_id': task_id,
+            'deleted_at': firestore.SERVER_TIMESTAMP,
+            'updated_at': firestore.SERVER_TIMESTAMP,
+        })
+
+    def delete(self, user_id: str, task_id: str, before: dict = None):
+        if before is None:
+            current = self.get(user_id, task_id)
+            before = current.to_dict() if current is not None else None
+
+        batch = self.db.batch()
+        self._tombstone(batch, user_id, task_id)
+        self._stage_stats(batch, user_id, _stats_delta(before, None))
+        self._stage_rollups(batch, user_id, [(before, None)])
+        batch.commit()
+
+    def _befores(self, user_id: str, task_ids, befores: dict = None) -> dict:
+        """befores filled in (one get_all) for the ids the caller didn't supply; missing tasks dropped"""
+        befores = dict(befores or {})
+        unknown = [task_id for task_id in task_ids if task_id not in befores]
+        befores.update({task_id: task.to_dict() for task_id, task in self.get_many(user_id, unknown).items()})
+        return {task_id: befores[task_id] for task_id in dict.fromkeys(task_ids) if task_id in befores}
+
+    def update_many(self, user_id: str, task_ids, updates: dict, befores: dict = None) -> int:
+        befores = self._befores(user_id, task_ids, befores)
+        ids = list(befores)
+
+        # One write per task, plus one each for the counters and rollups
+        step = BATCH_SIZE - 2
+        for start in range(0, len(ids), step):
+            batch = self.db.batch()
+            delta, pairs = {}, []
+            for task_id in ids[start:start + step]:
+                batch.update(self._tasks_ref(user_id).document(task_id), updates)
+                before = befores[task_id]
+                after = {**before, **updates}
+                delta = _stats_delta(before, after, delta)
+                pairs.append((before, after))
+            self._stage_stats(batch, user_id, delta)
+            self._stage_rollups(batch, user_id, pairs)
+            batch.commit()
+        return len(ids)
+
+    def delete_many(self, user_id: str, task_ids, befores: dict = None) -> int:
+        befores = self._befores(user_id, task_ids, befores)
+        ids = list(befores)
+
+        # Two writes (delete + tombstone) per task, plus one each for the counters and rollups
+        step = (BATCH_SIZE - 2) // 2
+        for start in range(0, len(ids), step):
+            batch = self.db.batch()
+            delta = {}
+            chunk = ids[start:start + step]
+            for task_id in chunk:
+                self._tombstone(batch, user_id, task_id)
+                delta = _stats_delta(befores[task_id], None, delta)
+            self._stage_stats(batch, user_id, delta)
+            self._stage_rollups(batch, user_id, [(befores[task_id], None) for task_id in chunk])
+            batch.commit()
+        return len(ids)
+
+    def _folder_tasks(self, user_id: str, folder: str):
+        fields = list(STATS_FIELDS) + [f for f in ROLLUP_FIELDS if f not in STATS_FIELDS]
+        return list(self._tasks_ref(user_id).where('folder', '==', folder).select(fields).stream())
+
+    def delete_folder_tasks(self, user_id: str, folder: str) -> int:
+        tasks = self._folder_tasks(user_id, folder)
+
+        # Two writes (delete + tombstone) per task, plus one each for the counters and rollups
+        step = (BATCH_SIZE - 2) // 2
+        for start in range(0, len(tasks), step):
+            batch = self.db.batch()
+            delta = {}
+            chunk = tasks[start:start + step]
+            for task in chunk:
+                self._tombstone(batch, user_id, task.id)
+                delta = _stats_delta(task.to_dict(), None, delta)
+            self._stage_stats(batch, user_id, delta)
+            self._stage_rollups(batch, user_id, [(task.to_dict(), None) for task in chunk])
+            batch.commit()
+        return len(tasks)
+
+    def move_folder_tasks(self, user_id: str, old_folder: str, new_folder: str) -> int:
+        tasks = self._folder_tasks(user_id, old_folder)
+
+        # One write per task, plus one each for the counters and rollups
+        step = BATCH_SIZE - 2
+        for start in range(0, len(tasks), step):
+            batch = self.db.batch()
+            delta, moves = {}, []
+            for task in tasks[start:start + step]:
+                batch.update(self._tasks_ref(user_id).document(task.id), {
+                    'folder': new_folder,
+                    'updated_at': firestore.SERVER_TIMESTAMP,
+                })
+                before = task.to_dict()
+                delta = _stats_delta(before, {**before, 'folder': new_folder}, delta)
+                moves.append((before, {**before, 'folder': new_folder}))
+            self._stage_stats(batch, user_id, delta)
+            self._stage_rollups(batch, user_id, moves)
+            batch.commit()
+        return len(tasks)
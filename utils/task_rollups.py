@@ -0,0 +1,235 @@
+# utils/task_rollups.py
+"""
+Per-User Analytics Rollups
+
+Aggregates the analysis tools need most often, kept per user and bucketed in
+the user's timezone:
+
+    completions by local hour / weekday (counts and priority-weighted scores),
+    and by weekday × hour (heatmap)
+    tasks created / completed per local day (and how many of a day's new tasks are done)
+    tasks created / completed per folder per local day
+    running sum + count of created → completed durations
+    pending tasks per due date, and undated pending tasks per creation day
+
+FirestoreTaskRepository stores them in users/{uid}/stats/analytics and applies
+the change of every task write as Increments in the same batch (the same way
+as the stats/tasks counters). PostgresTaskRepository computes them with
+GROUP BY queries on read.
+
+The writer buckets by the timezone in the user's profile and stamps it on the
+document. A read for another timezone (or an older schema) is computed from
+the tasks, and stored only when it is the profile timezone; changing the
+timezone discards the stored rollups. Drift from clock skew or writers still
+caching the old timezone is repaired with:
+
+    python -m utils.task_rollups <user_id> [<user_id> ...]
+    python -m utils.task_rollups --all
+"""
+
+import os
+import sys
+import time
+import threading
+from datetime import datetime, timezone
+
+from firebase_admin import firestore
+
+from utils.task_model import Task
+
+# Bumped when the rollup document layout changes; older documents get rebuilt
+ROLLUP_SCHEMA = 3
+
+# Task fields that feed the rollups
+ROLLUP_FIELDS = ('folder', 'completed', 'is_high_priority', 'due_date', 'created_at', 'completed_at')
+
+# How long a writer trusts its cached copy of a user's profile timezone
+ROLLUP_TZ_TTL_SECONDS = int(os.getenv("ROLLUP_TZ_TTL_SECONDS", "300"))
+
+
+def get_tz(tz_name: str):
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(tz_name)
+    except Exception:
+        import pytz
+        return pytz.timezone(tz_name)
+
+
+def task_weight(task: Task) -> int:
+    """Productivity weight: high priority = 3, has deadline = 2, regular = 1"""
+    if task.is_high_priority:
+        return 3
+    if task.has_due_date:
+        return 2
+    return 1
+
+
+def _resolve_server_timestamps(data: dict, now: datetime) -> dict:
+    """SERVER_TIMESTAMP isn't known until commit; the writer's clock stands in for it"""
+    if not any(value is firestore.SERVER_TIMESTAMP for value in data.values()):
+        return data
+    return {k: (now if v is firestore.SERVER_TIMESTAMP else v) for k, v in data.items()}
+
+
+def rollup_contribution(data: dict, tz, now: datetime = None) -> dict:
+    """What one task adds to the rollups, keyed by field path tuples"""
+    if data is None:
+        return {}
+
+    task = Task.from_document(None, _resolve_server_timestamps(data, now or datetime.now(timezone.utc)))
+    completed = 1 if task.completed else 0
+    high_priority = 1 if task.is_high_priority else 0
+    folder = task.folder or 'uncategorized'
+    contribution = {
+        ('tasks',): 1,
+        ('completed',): completed,
+        ('high_priority',): high_priority,
+        ('high_priority_completed',): high_priority * completed,
+    }
+
+    created_day = None
+    if task.created_ts is not None:
+        created_day = datetime.fromtimestamp(task.created_ts, tz).date().isoformat()
+        contribution[('created_by_day', created_day)] = 1
+        contribution[('created_completed_by_day', created_day)] = completed
+        contribution[('folder_created_by_day', folder, created_day)] = 1
+
+    if completed and task.completed_ts is not None:
+        local = datetime.fromtimestamp(task.completed_ts, tz)
+        weight = task_weight(task)
+        hour, weekday = str(local.hour), str(local.weekday())
+        contribution[('hour_counts', hour)] = 1
+        contribution[('hour_scores', hour)] = weight
+        contribution[('weekday_counts', weekday)] = 1
+        contribution[('weekday_scores', weekday)] = weight
+        contribution[('weekday_hour_counts', weekday, hour)] = 1
+        contribution[('completed_by_day', local.date().isoformat())] = 1
+        contribution[('folder_completed_by_day', folder, local.date().isoformat())] = 1
+        if task.created_ts is not None:
+            contribution[('duration_sum_hours',)] = (task.completed_ts - task.created_ts) / 3600
+            contribution[('duration_count',)] = 1
+
+    if not completed:
+        if task.due_ordinal is not None:
+            contribution[('pending_due', task.due_date)] = 1
+        elif not task.has_due_date and created_day is not None:
+            contribution[('pending_undated', created_day)] = 1
+
+    return contribution
+
+
+def rollup_delta(before: dict = None, after: dict = None, tz=None, now: datetime = None,
+                 delta: dict = None) -> dict:
+    """Accumulate after − before into delta (zero entries dropped)"""
+    delta = {} if delta is None else delta
+    for path, value in rollup_contribution(after, tz, now).items():
+        delta[path] = delta.get(path, 0) + value
+    for path, value in rollup_contribution(before, tz, now).items():
+        delta[path] = delta.get(path, 0) - value
+    return {path: value for path, value in delta.items() if value}
+
+
+def _int_list(counts: dict, size: int) -> list:
+    counts = counts or {}
+    return [counts.get(str(i), 0) for i in range(size)]
+
+
+def public_rollups(doc: dict, tz_name: str) -> dict:
+    """Rollup document → the rollups() shape (empty days dropped, lists indexed by hour / weekday)"""
+    def days(by_day):
+        return {day: n for day, n in sorted((by_day or {}).items()) if n > 0}
+
+    def folder_days(key):
+        by_folder = {folder: days(by_day) for folder, by_day in (doc.get(key) or {}).items()}
+        return {folder: by_day for folder, by_day in sorted(by_folder.items()) if by_day}
+
+    return {
+        'timezone': tz_name,
+        'tasks': doc.get('tasks', 0),
+        'completed': doc.get('completed', 0),
+        'high_priority': doc.get('high_priority', 0),
+        'high_priority_completed': doc.get('high_priority_completed', 0),
+        'hour_counts': _int_list(doc.get('hour_counts'), 24),
+        'hour_scores': _int_list(doc.get('hour_scores'), 24),
+        'weekday_counts': _int_list(doc.get('weekday_counts'), 7),
+        'weekday_scores': _int_list(doc.get('weekday_scores'), 7),
+        'weekday_hour_counts': [_int_list(hours, 24) for hours in _int_list(doc.get('weekday_hour_counts'), 7)],
+        'duration_sum_hours': doc.get('duration_sum_hours', 0),
+        'duration_count': doc.get('duration_count', 0),
+        'created_by_day': days(doc.get('created_by_day')),
+        'created_completed_by_day': days(doc.get('created_completed_by_day')),
+        'completed_by_day': days(doc.get('completed_by_day')),
+        'pending_due': days(doc.get('pending_due')),
+        'pending_undated': days(doc.get('pending_undated')),
+        'folder_created_by_day': folder_days('folder_created_by_day'),
+        'folder_completed_by_day': folder_days('folder_completed_by_day'),
+    }
+
+
+# ============================================
+# WRITER TIMEZONE CACHE
+# ============================================
+
+_tz_cache = {}
+_tz_cache_lock = threading.Lock()
+
+
+def profile_timezone(db, user_id: str) -> str:
+    """The user's profile timezone (UTC if unset), cached for ROLLUP_TZ_TTL_SECONDS"""
+    now = time.monotonic()
+    cached = _tz_cache.get(user_id)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    snapshot = db.collection('users').document(user_id).collection('profile').document('settings').get()
+    tz_name = (snapshot.to_dict() or {}).get('timezone') or 'UTC' if snapshot.exists else 'UTC'
+    with _tz_cache_lock:
+        _tz_cache[user_id] = (tz_name, now + ROLLUP_TZ_TTL_SECONDS)
+    return tz_name
+
+
+def forget_profile_timezone(user_id: str):
+    """Drop the cached timezone (call after the user changes it)"""
+    with _tz_cache_lock:
+        _tz_cache.pop(user_id, None)
+
+
+def discard_rollups(db, user_id: str):
+    """
+    Timezone changed: drop the stored rollups (bucketed by the old one) and
+    the cached timezone, so the next read rebuilds in the new timezone.
+    """
+    forget_profile_timezone(user_id)
+    db.collection('users').document(user_id).collection('stats').document('analytics').delete()
+
+
+# ============================================
+# REBUILD COMMAND
+# ============================================
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print("Usage: python -m utils.task_rollups <user_id> [<user_id> ...] | --all")
+        sys.exit(1)
+
+    from utils.firebase_client import get_firebase_client
+    client = get_firebase_client()
+
+    if args == ["--all"]:
+        user_ids = [doc.id for doc in client.db.collection('users').list_documents()]
+    else:
+        user_ids = args
+
+    for user_id in user_ids:
+        tz_name = profile_timezone(client.db, user_id)
+        start = time.perf_counter()
+        stats = client.tasks.rebuild_stats(user_id)
+        rollups = client.tasks.rebuild_rollups(user_id, tz_name)
+        print(f"🔁 {user_id}: {stats['total']} tasks, {rollups['completed']} completed "
+              f"({tz_name}) rebuilt in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
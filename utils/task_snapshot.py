@@ -0,0 +1,153 @@
+# utils/task_snapshot.py
+"""
+Request-Scoped Task Snapshot
+
+One analysis question ("how am I doing this week and what am I avoiding?")
+makes the analysis agent call several tools. Inside a task_snapshot_scope()
+(opened by analysis_node around the agent run) those tools share:
+
+    • one TaskSnapshot per (user, timezone) — the user's tasks fetched once, on
+      first use, as a read-only TaskFrame with the derived columns every tool
+      needs already computed (local completion hour / weekday / day, local
+      created day, weights, due-date ordinals)
+    • one reference time (request_now), so "today" means the same date in the
+      analysis tools and the date tools even if the run straddles midnight
+
+The snapshot also carries the per-task features the background jobs work
+from — age, days overdue / until due, staleness, priority — so MonitorAgent,
+CleanupAgent and the analysis tools share one definition of each, and a
+monitor + cleanup run in one scope fetches the user's tasks once.
+
+Outside a scope each call loads a fresh snapshot and uses the current time,
+so tools behave the same when invoked on their own.
+"""
+
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+
+from utils.task_frame import TaskFrame, US_PER_HOUR
+from utils.task_model import Task
+from utils.task_rollups import get_tz
+
+
+class TaskSnapshot:
+    """
+    A user's tasks at one point in time, bucketed in one timezone.
+
+    Treat as immutable: the tasks are a tuple and every NumPy column is
+    flagged read-only, so tools running in parallel can't disturb each other.
+    """
+
+    def __init__(self, user_id: str, tz_name: str, tasks, now: datetime):
+        self.user_id = user_id
+        self.tz_name = tz_name
+        self.tz = get_tz(tz_name)
+        self.now = now.astimezone(self.tz)
+        self.today = self.now.date().toordinal()
+
+        self.frame = TaskFrame(tuple(tasks))
+        self.tasks = self.frame.tasks
+
+        # Derived columns shared by the tools
+        completed_local = self.frame.completed_local(self.tz)
+        self.completed_hour = completed_local.hour
+        self.completed_weekday = completed_local.weekday
+        self.completed_day = completed_local.day_ordinal
+        self.created_day = self.frame.created_local(self.tz).day_ordinal
+        self.weights = self.frame.weights()
+
+        # Per-task features (ages valid where frame.has_created, due columns where frame.due_valid)
+        self.pending = ~self.frame.completed
+        self.high_priority = self.frame.high_priority
+        self.age_days = self.today - self.created_day                     # local calendar days
+        self.age_hours = (int(self.now.timestamp() * 1_000_000) - self.frame.created_us) / US_PER_HOUR
+        self.days_until_due = self.frame.due_ordinal - self.today
+        self.overdue = self.frame.overdue(self.today)
+        self.days_overdue = np.where(self.overdue, -self.days_until_due, 0)
+
+        for column in (*vars(self.frame).values(), *vars(self).values()):
+            if hasattr(column, 'flags'):
+                column.flags.writeable = False
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __repr__(self):
+        return f"TaskSnapshot({self.user_id!r}, {self.tz_name!r}, {len(self)} tasks)"
+
+    def stale(self, min_days: int) -> np.ndarray:
+        """Pending tasks without a due date created at least min_days local days ago"""
+        return self.pending & ~self.frame.has_due & self.frame.has_created & (self.age_days >= min_days)
+
+    def untouched(self, min_hours: float) -> np.ndarray:
+        """Pending tasks created at least min_hours ago"""
+        return self.pending & self.frame.has_created & (self.age_hours >= min_hours)
+
+
+def load_task_snapshot(user_id: str, tz_name: str, now: datetime = None, repository=None) -> TaskSnapshot:
+    """Fetch a user's tasks (analytics fields) and build a snapshot"""
+    start = time.perf_counter()
+    if repository is not None:
+        tasks = [Task.from_document(task.id, task.to_dict())
+                 for task in repository.stream(user_id, fields="analytics")]
+    else:
+        from utils.firebase_client import get_firebase_client
+        tasks = get_firebase_client().get_task_models(user_id, fields="analytics")
+    snapshot = TaskSnapshot(user_id, tz_name, tasks, now or datetime.now(timezone.utc))
+    print(f"📸 Task snapshot for {user_id[:10]}...: {len(snapshot)} tasks "
+          f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+    return snapshot
+
+
+# ============================================
+# REQUEST SCOPE
+# ============================================
+
+class _SnapshotScope:
+    def __init__(self):
+        self.now = datetime.now(timezone.utc)
+        self.snapshots = {}
+        # Tools of one agent step run on a thread pool (context copied, scope shared)
+        self.lock = threading.Lock()
+
+
+_scope = contextvars.ContextVar("task_snapshot_scope", default=None)
+
+
+@contextmanager
+def task_snapshot_scope():
+    """Share one task snapshot and one reference time between the tools run inside"""
+    token = _scope.set(_SnapshotScope())
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def get_task_snapshot(user_id: str, tz_name: str, repository=None) -> TaskSnapshot:
+    """
+    The scope's snapshot for this user and timezone (loaded on first use), else a fresh one.
+
+    repository: TaskRepository to load from (default: the shared FirebaseClient's)
+    """
+    scope = _scope.get()
+    if scope is None:
+        return load_task_snapshot(user_id, tz_name, repository=repository)
+
+    with scope.lock:
+        key = (user_id, tz_name)
+        if key not in scope.snapshots:
+            scope.snapshots[key] = load_task_snapshot(user_id, tz_name, scope.now, repository)
+        return scope.snapshots[key]
+
+
+def request_now(tz=None) -> datetime:
+    """The scope's reference time (current time outside a scope), in tz if given"""
+    scope = _scope.get()
+    now = scope.now if scope is not None else datetime.now(timezone.utc)
+    return now.astimezone(tz) if tz is not None else now
@@ -0,0 +1,128 @@
+# utils/task_windows.py
+"""
+Windowed Task Analytics
+
+Completion rates, period-over-period comparisons, streaks and per-folder
+trends computed from the per-day counters in the analytics rollups
+(FirebaseClient.get_task_rollups). The counters are updated with each task
+write, so answering "am I doing better than last month?" never scans tasks:
+cost is bounded by the days in the window, not the number of tasks.
+
+Windows are inclusive [start, end] ranges of the user's local dates, given
+as date ordinals.
+"""
+
+from datetime import date
+
+
+def _iso(ordinal: int) -> str:
+    return date.fromordinal(ordinal).isoformat()
+
+
+def _sum_days(by_day: dict, start: int, end: int) -> int:
+    """Sum of a {'YYYY-MM-DD': n} counter over [start, end]"""
+    if end < start:
+        return 0
+    # Walk whichever is shorter: the window or the recorded days
+    if end - start + 1 <= len(by_day):
+        return sum(by_day.get(_iso(day), 0) for day in range(start, end + 1))
+    first, last = _iso(start), _iso(end)
+    return sum(n for day, n in by_day.items() if first <= day <= last)
+
+
+def window_summary(rollups: dict, start: int, end: int) -> dict:
+    """Creation / completion counts and completion rate for one window"""
+    created = _sum_days(rollups['created_by_day'], start, end)
+    created_completed = _sum_days(rollups['created_completed_by_day'], start, end)
+    completed = _sum_days(rollups['completed_by_day'], start, end)
+    days = end - start + 1
+    return {
+        'start': _iso(start),
+        'end': _iso(end),
+        'days': days,
+        'tasks_created': created,
+        'tasks_completed': completed,
+        # Share of the window's new tasks that are done by now
+        'completion_rate': round(created_completed / created * 100, 1) if created else None,
+        'completed_per_day': round(completed / days, 2) if days > 0 else None,
+    }
+
+
+def _change(current, previous):
+    if current is None or previous is None:
+        return None
+    return round(current - previous, 2)
+
+
+def compare_windows(rollups: dict, start: int, end: int) -> dict:
+    """The window [start, end] against the equally long window right before it"""
+    length = end - start + 1
+    current = window_summary(rollups, start, end)
+    previous = window_summary(rollups, start - length, start - 1)
+    return {
+        'current': current,
+        'previous': previous,
+        'change': {
+            'tasks_completed': current['tasks_completed'] - previous['tasks_completed'],
+            'tasks_created': current['tasks_created'] - previous['tasks_created'],
+            'completion_rate': _change(current['completion_rate'], previous['completion_rate']),
+            'completed_per_day': _change(current['completed_per_day'], previous['completed_per_day']),
+        },
+    }
+
+
+def streaks(rollups: dict, today: int) -> dict:
+    """
+    Consecutive local days with at least one completion.
+
+    The current streak is still alive when today has no completion yet but
+    yesterday did.
+    """
+    completed_days = sorted(
+        date.fromisoformat(day).toordinal() for day, n in rollups['completed_by_day'].items() if n > 0
+    )
+    if not completed_days:
+        return {'current_streak_days': 0, 'longest_streak_days': 0, 'longest_streak_end': None,
+                'last_completion_day': None}
+
+    longest, longest_end, run = 1, completed_days[0], 1
+    for previous, day in zip(completed_days, completed_days[1:]):
+        run = run + 1 if day == previous + 1 else 1
+        if run > longest:
+            longest, longest_end = run, day
+
+    done = set(completed_days)
+    cursor = today if today in done else today - 1
+    current = 0
+    while cursor in done:
+        current += 1
+        cursor -= 1
+
+    return {
+        'current_streak_days': current,
+        'longest_streak_days': longest,
+        'longest_streak_end': _iso(longest_end),
+        'last_completion_day': _iso(completed_days[-1]),
+    }
+
+
+def folder_trends(rollups: dict, start: int, end: int, limit: int = 10) -> list:
+    """Per-folder completions in [start, end] vs the window before, most active first"""
+    length = end - start + 1
+    trends = []
+    for folder in set(rollups['folder_completed_by_day']) | set(rollups['folder_created_by_day']):
+        completed_by_day = rollups['folder_completed_by_day'].get(folder, {})
+        created_by_day = rollups['folder_created_by_day'].get(folder, {})
+        current = _sum_days(completed_by_day, start, end)
+        previous = _sum_days(completed_by_day, start - length, start - 1)
+        created = _sum_days(created_by_day, start, end)
+        if current or previous or created:
+            trends.append({
+                'folder': folder,
+                'completed': current,
+                'completed_previous': previous,
+                'change': current - previous,
+                'created': created,
+            })
+    trends.sort(key=lambda t: (-t['completed'], -t['created'], t['folder']))
+    return trends[:limit]
@@ -1,35 +1,19 @@
 # backend/utils/user_profile.py
 
-import firebase_admin
-from firebase_admin import credentials, firestore
-import os
+from firebase_admin import firestore
+from utils.firebase_client import get_firestore_db
+from utils.task_rollups import discard_rollups
 
 class UserProfile:
     """Manages user profile and settings including timezone"""
     
-    def __init__(self):
-        if not firebase_admin._apps:
-            import json
-            import tempfile
-            
-            if os.getenv('FIREBASE_CREDENTIALS_JSON'):
-                # Running on Render - credentials in environment variable
-                creds_json = json.loads(os.getenv('FIREBASE_CREDENTIALS_JSON'))
-                temp_creds = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
-                json.dump(creds_json, temp_creds)
-                temp_creds.close()
-                firebase_cred_path = temp_creds.name
-            else:
-                # Running locally - use file path
-                firebase_cred_path = os.path.join(
-                    os.path.dirname(os.path.dirname(__file__)),
-                    "firebase-credentials.json"
-                )
-            
-            cred = credentials.Certificate(firebase_cred_path)
-            firebase_admin.initialize_app(cred)
-        
-        self.db = firestore.client()
+    def __init__(self, db=None):
+        self._db = db
+    
+    @property
+    def db(self):
+        """Injected client, else the process-wide one (resolved per call so backend swaps apply)"""
+        return self._db if self._db is not None else get_firestore_db()
     
     def _get_profile_ref(self, user_id: str):
         """Get reference to user's profile document"""
@@ -60,6 +44,7 @@ class UserProfile:
         try:
             profile_ref = self._get_profile_ref(user_id)
             profile_doc = profile_ref.get()
+            previous = profile_doc.to_dict().get('timezone', 'UTC') if profile_doc.exists else 'UTC'
             
             if profile_doc.exists:
                 profile_ref.update({
@@ -72,7 +57,10 @@ class UserProfile:
                     'created_at': firestore.SERVER_TIMESTAMP,
                     'updated_at': firestore.SERVER_TIMESTAMP
                 })
-            
+
+            # Task writes bucket analytics rollups by this timezone
+            if timezone != previous:
+                discard_rollups(self.db, user_id)
             print(f"✅ Timezone set to {timezone} for {user_id[:10]}...")
         except Exception as e:
             print(f"❌ Error setting timezone: {e}")
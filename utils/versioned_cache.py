@@ -0,0 +1,67 @@
+# utils/versioned_cache.py
+"""
+Per-Process Cache Keyed by Data Version
+
+Values derived from a user's tasks (analytics payloads, answers) stay valid
+until the user's data_version changes (FirebaseClient.bump_data_version runs
+on every task / folder write). Entries store the version they were computed
+at; a lookup with a newer version is a miss and the entry is replaced.
+
+Callers put anything else the value depends on in the key — timezone, local
+date (so "today"-relative numbers roll over at midnight), arguments.
+
+Bounded LRU with a TTL as a backstop for writes that bypass the version
+(direct console edits, other services). Each gunicorn worker has its own
+cache; a miss only costs the recomputation.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+
+class VersionedCache:
+    def __init__(self, name: str, max_entries: int = 2048, ttl_seconds: float = 3600):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key → (version, expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        """Cached value for key at this data version, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version or entry[1] <= time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, version, compute):
+        """(value, hit) — compute() runs on a miss and its result is stored"""
+        value = self.get(key, version)
+        if value is not None:
+            return value, True
+        value = compute()
+        self.put(key, version, value)
+        return value, False
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else None,
+        }